@@ -81,11 +81,12 @@ async def main() -> None:
     )
 
     logger.info("Search query:")
-    for q in book_msp.serach_query:
+    for q in result.queries:
         logger.info(q)
 
     logger.info("Books:")
-    logger.info(result)
+    logger.info(result.result)
+    await book_msp.aclose()
 
 
 if __name__ == "__main__":
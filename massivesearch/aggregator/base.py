@@ -2,6 +2,7 @@
 
 from abc import abstractmethod
 from asyncio import Task
+from collections.abc import AsyncIterator
 from typing import Generic, TypeVar
 
 from pydantic import BaseModel, ConfigDict
@@ -25,3 +26,26 @@ class BaseAggregator(BaseModel, Generic[SearchResT, AggResT]):
         tasks: MassiveSearchTasks[SearchResT],
     ) -> AggResT:
         """Aggregate the search results."""
+
+    async def aggregate_stream(
+        self,
+        tasks: MassiveSearchTasks[SearchResT],
+    ) -> AsyncIterator[AggResT]:
+        """Aggregate the search results, yielding partial results as they arrive.
+
+        The default yields the result of `aggregate` once. Aggregators that can
+        emit results before every sub-query finishes override this.
+        """
+        yield await self.aggregate(tasks)
+
+    def matches_nothing(self, results: list[SearchResT]) -> bool | None:
+        """Return whether a sub-query with these search results matches nothing.
+
+        Aggregators that skip the remaining searches of such a sub-query
+        return a bool, and the pipe then runs the searches of a sub-query in
+        stages of increasing cost, skipping the costlier ones once the cheaper
+        ones rule it out. The default returns None and every search starts at
+        once.
+        """
+        del results
+        return None
@@ -1,74 +1,343 @@
 """Aggregator for pandas DataFrames."""
 
 import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator
+from typing import Literal
 
+import numpy as np
 import pandas as pd
+from pydantic import Field
 
 from massivesearch.aggregator import BaseAggregator
 from massivesearch.aggregator.base import MassiveSearchTasks
+from massivesearch.ext.pandas.bitmap import RowBitmap
+from massivesearch.ext.pandas.csv_index import load_csv_records, read_csv_rows
+from massivesearch.ext.pandas.source import (
+    FileFormat,
+    infer_file_format,
+    is_compressed,
+    load_dataset,
+)
+from massivesearch.ext.pandas.types import PandasSearchResult
+
+
+def _intersect(
+    left: PandasSearchResult,
+    right: PandasSearchResult,
+) -> PandasSearchResult:
+    """Return the rows matched by both search results."""
+    if isinstance(left, RowBitmap):
+        if not isinstance(right, RowBitmap):
+            right = RowBitmap.from_index(left.labels, right)
+        return left & right
+    if isinstance(right, RowBitmap):
+        return RowBitmap.from_index(right.labels, left) & right
+    return left.intersection(right)
+
+
+def _union(
+    left: PandasSearchResult,
+    right: PandasSearchResult,
+) -> PandasSearchResult:
+    """Return the rows matched by either search result."""
+    if isinstance(left, RowBitmap):
+        if not isinstance(right, RowBitmap):
+            right = RowBitmap.from_index(left.labels, right)
+        return left | right
+    if isinstance(right, RowBitmap):
+        return RowBitmap.from_index(right.labels, left) | right
+    return left.union(right)
+
+
+def _references(
+    tasks: MassiveSearchTasks[PandasSearchResult],
+) -> Counter[asyncio.Task[PandasSearchResult]]:
+    """Count the sub-queries that use each search."""
+    return Counter(
+        task
+        for single_search_task in tasks
+        for task in set(single_search_task.values())
+    )
+
+
+def _labels(result: PandasSearchResult) -> pd.Index:
+    """Return the labels of the rows matched by a search result."""
+    return result.to_index() if isinstance(result, RowBitmap) else result
+
+
+def _grow(mask: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Return the row mask, doubled until it covers the given positions."""
+    size = int(positions.max()) + 1 if len(positions) else 0
+    if size <= len(mask):
+        return mask
+    grown = np.zeros(max(size, 2 * len(mask)), dtype=bool)
+    grown[: len(mask)] = mask
+    return grown
 
 
 class PandasAggregator(BaseAggregator):
-    """Aggregator class."""
+    """Aggregator class.
+
+    Search results can be `pd.Index` or `RowBitmap`. Bitmaps are combined
+    with vectorized AND/OR, and row labels are only materialized once the
+    final set of rows is known. Only then are the matching rows fetched, and
+    nothing is read when no row matches.
+
+    With `top_k`, rows are ranked by the scores of the search results and
+    only the K best rows are fetched, best first with their scores in
+    `score_column`, which must not clash with a data column. Scores of the
+    searches of a sub-query and of the matched sub-queries are combined with
+    `fusion`: their sum, their maximum, or reciprocal rank fusion. Searches
+    and sub-queries without scores do not change the ranking, and ties go to
+    the lowest row.
+    """
 
     file_path: str
+    file_format: FileFormat | None = None
+    columns: list[str] | None = Field(
+        default=None,
+        description="Columns of the result, all columns when unset.",
+    )
+    row_fetch: Literal["cache", "offsets"] = Field(
+        default="cache",
+        description=(
+            "Fetch matching rows from the cached dataset, or parse only those "
+            "rows of a CSV file through a byte offset index. Offsets suit "
+            "large CSV files the aggregator would otherwise load whole; "
+            "column dtypes are then inferred from the fetched rows. "
+            "Compressed CSV files, and files with quotes inside unquoted "
+            "fields, are always fetched from the cache."
+        ),
+    )
+    top_k: int | None = Field(
+        default=None,
+        gt=0,
+        description="Return only the K best scored rows, all rows when unset.",
+    )
+    score_column: str = Field(
+        default="score",
+        description="Name of the score column added with `top_k`.",
+    )
+    fusion: Literal["sum", "max", "rrf"] = Field(
+        default="sum",
+        description="How scores of ANDed searches and ORed sub-queries combine.",
+    )
+    rrf_k: int = Field(
+        default=60,
+        gt=0,
+        description="Rank offset of reciprocal rank fusion.",
+    )
+    staged_search: bool = Field(
+        default=False,
+        description=(
+            "Start the costlier searches of a sub-query only once the cheaper "
+            "ones leave a matching row, instead of starting every search at once."
+        ),
+    )
 
     async def aggregate(
         self,
-        tasks: MassiveSearchTasks[pd.Index],
+        tasks: MassiveSearchTasks[PandasSearchResult],
     ) -> pd.DataFrame:
         """Aggregate the search results."""
-        all_common_indices = await self._process_search_tasks(tasks)
-
-        book_df = pd.read_csv(self.file_path)
-        if not all_common_indices:
+        results = await self._process_search_tasks(tasks)
+        matched = [
+            (single_search_task, common_indices)
+            for single_search_task, common_indices in zip(tasks, results, strict=True)
+            if len(common_indices) > 0
+        ]
+        if not matched:
             return pd.DataFrame()
 
-        final_indices = self._merge_indices(all_common_indices)
+        final_indices = self._merge_indices([common for _, common in matched])
+        if final_indices.empty:
+            return pd.DataFrame()
+        if self.top_k is None:
+            return self.fetch_rows(final_indices)
 
-        if not final_indices.empty:
-            return book_df.loc[final_indices]
-        return pd.DataFrame()
+        subquery_scores = []
+        for single_search_task, common_indices in matched:
+            search_scores = self._search_scores(single_search_task)
+            if search_scores:
+                subquery_scores.append(
+                    self._fuse(search_scores, _labels(common_indices)),
+                )
+        best = self._top_k(
+            self._fuse(subquery_scores, final_indices.sort_values()),
+            self.top_k,
+        )
+        rows = self.fetch_rows(best.index)
+        if self.score_column in rows.columns:
+            msg = (
+                f"Data already has a '{self.score_column}' column. "
+                "Set score_column to another name."
+            )
+            raise ValueError(msg)
+        return rows.assign(**{self.score_column: best.to_numpy()})
 
-    async def _process_search_tasks(
+    async def aggregate_stream(
         self,
-        tasks: MassiveSearchTasks[pd.Index],
-    ) -> list[pd.Index]:
-        """Process search tasks and return common indices for each task."""
-        all_common_indices: list[pd.Index] = []
+        tasks: MassiveSearchTasks[PandasSearchResult],
+    ) -> AsyncIterator[pd.DataFrame]:
+        """Yield the rows of each sub-query as soon as it finishes.
 
-        for single_search_task in tasks:
-            keys = list(single_search_task.keys())
-            task_values = list(single_search_task.values())
-            results = await asyncio.gather(*task_values)
+        Rows already yielded for an earlier sub-query are dropped, so every
+        row is yielded once and sub-queries without new rows yield nothing.
+        Yielded rows are tracked with a mask over row positions.
+        Ranking needs every score, so with `top_k` the ranked rows are
+        yielded once all sub-queries finish.
+        """
+        if self.top_k is not None:
+            yield await self.aggregate(tasks)
+            return
 
-            result_dict = dict(zip(keys, results, strict=False))
-            common_indices = self._find_common_indices(list(result_dict.values()))
+        references = _references(tasks)
+        sub_queries = [
+            asyncio.ensure_future(
+                self._process_single_search_task(single_search_task, references),
+            )
+            for single_search_task in tasks
+        ]
+        emitted = np.zeros(0, dtype=bool)
+        try:
+            for next_result in asyncio.as_completed(sub_queries):
+                labels = _labels(await next_result)
+                positions = labels.to_numpy(dtype=np.intp)
+                emitted = _grow(emitted, positions)
+                new_labels = labels[~emitted[positions]]
+                if new_labels.empty:
+                    continue
+                emitted[positions] = True
+                yield self.fetch_rows(new_labels)
+        finally:
+            for sub_query in sub_queries:
+                sub_query.cancel()
 
-            if len(common_indices) > 0:
-                all_common_indices.append(common_indices)
+    def fetch_rows(self, row_ids: pd.Index) -> pd.DataFrame:
+        """Return the rows with the given row positions."""
+        file_format = self.file_format or infer_file_format(self.file_path)
+        if (
+            self.row_fetch == "offsets"
+            and file_format == "csv"
+            and not is_compressed(self.file_path)
+            and load_csv_records(self.file_path) is not None
+        ):
+            return read_csv_rows(self.file_path, row_ids.to_numpy(), self.columns)
+        data = load_dataset(self.file_path, self.columns, file_format=file_format)
+        return data.loc[row_ids]
 
-        return all_common_indices
+    async def _process_search_tasks(
+        self,
+        tasks: MassiveSearchTasks[PandasSearchResult],
+    ) -> list[PandasSearchResult]:
+        """Process search tasks and return common indices for each task, in order."""
+        references = _references(tasks)
+        return await asyncio.gather(
+            *(
+                self._process_single_search_task(single_search_task, references)
+                for single_search_task in tasks
+            ),
+        )
 
-    def _find_common_indices(self, partial_results: list) -> pd.Index:
-        """Find common indices by intersecting all partial results."""
-        if not partial_results:
-            return pd.Index([])
+    async def _process_single_search_task(
+        self,
+        single_search_task: dict[str, asyncio.Task[PandasSearchResult]],
+        references: Counter[asyncio.Task[PandasSearchResult]],
+    ) -> PandasSearchResult:
+        """Intersect the results of a sub-query as its searches finish.
 
-        common_indices = partial_results[0]
+        Once the intersection is empty the sub-query cannot match anything, so
+        its remaining searches are cancelled unless another sub-query still
+        needs them.
+        """
+        task_values = set(single_search_task.values())
+        common_indices: PandasSearchResult | None = None
+        try:
+            for next_result in asyncio.as_completed(task_values):
+                result = await next_result
+                common_indices = (
+                    result
+                    if common_indices is None
+                    else _intersect(common_indices, result)
+                )
+                if len(common_indices) == 0:
+                    break
+        finally:
+            for task in task_values:
+                references[task] -= 1
+                if references[task] == 0 and not task.done():
+                    task.cancel()
 
-        for partial_result in partial_results[1:]:
-            common_indices = common_indices.intersection(partial_result)
+        return common_indices if common_indices is not None else pd.Index([])
 
-        return common_indices
+    def matches_nothing(self, results: list[PandasSearchResult]) -> bool | None:
+        """Return whether the intersection of the search results is empty.
 
-    def _merge_indices(self, indices_list: list[pd.Index]) -> pd.Index:
-        """Merge multiple indices using union operation."""
+        Without `staged_search`, return None so every search starts at once.
+        """
+        if not self.staged_search:
+            return None
+        if not results:
+            return False
+        common_indices = results[0]
+        for result in results[1:]:
+            common_indices = _intersect(common_indices, result)
+        return len(common_indices) == 0
+
+    def _merge_indices(self, indices_list: list[PandasSearchResult]) -> pd.Index:
+        """Merge multiple search results and return the matching row labels."""
         if not indices_list:
             return pd.Index([])
 
         final_indices = indices_list[0]
         for idx in indices_list[1:]:
-            final_indices = final_indices.union(idx)
+            final_indices = _union(final_indices, idx)
 
+        if isinstance(final_indices, RowBitmap):
+            return final_indices.to_index()
         return final_indices
+
+    def _search_scores(
+        self,
+        single_search_task: dict[str, asyncio.Task[PandasSearchResult]],
+    ) -> list[pd.Series]:
+        """Return the scores of the scored search results of a sub-query."""
+        scores = []
+        for task in set(single_search_task.values()):
+            result = task.result()
+            if isinstance(result, RowBitmap):
+                result_scores = result.to_scores()
+                if result_scores is not None:
+                    scores.append(result_scores)
+        return scores
+
+    def _fuse(self, scores: list[pd.Series], labels: pd.Index) -> pd.Series:
+        """Combine rankings of rows into one score for each of the labels."""
+        if self.fusion == "rrf":
+            scores = [
+                1 / (self.rrf_k + score.rank(method="min", ascending=False))
+                for score in scores
+            ]
+        combine = np.maximum if self.fusion == "max" else np.add
+        fused = np.zeros(len(labels))
+        for score in scores:
+            fused = combine(fused, score.reindex(labels, fill_value=0.0).to_numpy())
+        return pd.Series(fused, index=labels)
+
+    @staticmethod
+    def _top_k(scores: pd.Series, top_k: int) -> pd.Series:
+        """Return the K best scores, best first and ties in label order.
+
+        The K-th best score is found by partitioning, so only the rows above
+        it and the first rows tied with it are sorted.
+        """
+        values = scores.to_numpy()
+        if len(values) <= top_k:
+            best = np.arange(len(values))
+        else:
+            threshold = np.partition(values, len(values) - top_k)[len(values) - top_k]
+            above = np.flatnonzero(values > threshold)
+            tied = np.flatnonzero(values == threshold)[: top_k - len(above)]
+            best = np.concatenate([above, tied])
+        return scores.iloc[best[np.lexsort((best, -values[best]))]]
@@ -0,0 +1,127 @@
+"""Bitmap search results for pandas search engines."""
+
+from typing import Self
+
+import numpy as np
+import pandas as pd
+
+
+class RowBitmap:
+    """Set of matching rows stored as a boolean mask over row positions.
+
+    AND and OR of bitmaps over the same frame are single vectorized NumPy
+    operations, and row labels are only materialized by `to_index`. Bitmaps
+    are immutable; operators return new bitmaps.
+
+    Ranking search engines attach relevance `scores` over all rows, only
+    meaningful where the mask is set. AND and OR add the scores of both
+    operands.
+    """
+
+    __slots__ = ("_count", "labels", "mask", "scores")
+
+    def __init__(
+        self,
+        labels: pd.Index,
+        mask: np.ndarray,
+        scores: np.ndarray | None = None,
+    ) -> None:
+        """Initialize the bitmap from the frame labels, a row mask and scores."""
+        if len(mask) != len(labels):
+            msg = "Mask length must match the number of rows."
+            raise ValueError(msg)
+        if scores is not None and len(scores) != len(labels):
+            msg = "Scores length must match the number of rows."
+            raise ValueError(msg)
+        self.labels = labels
+        self.mask = np.asarray(mask, dtype=bool)
+        self.scores = scores
+        self._count: int | None = None
+
+    @classmethod
+    def full(cls, labels: pd.Index) -> Self:
+        """Return a bitmap matching every row."""
+        return cls(labels, np.ones(len(labels), dtype=bool))
+
+    @classmethod
+    def empty(cls, labels: pd.Index) -> Self:
+        """Return a bitmap matching no rows."""
+        return cls(labels, np.zeros(len(labels), dtype=bool))
+
+    @classmethod
+    def from_positions(cls, labels: pd.Index, positions: np.ndarray) -> Self:
+        """Return a bitmap matching the rows at the given positions."""
+        mask = np.zeros(len(labels), dtype=bool)
+        mask[positions] = True
+        return cls(labels, mask)
+
+    @classmethod
+    def from_index(cls, labels: pd.Index, index: pd.Index) -> Self:
+        """Return a bitmap matching the rows with the given labels."""
+        return cls(labels, labels.isin(index))
+
+    def _check_compatible(self, other: "RowBitmap") -> None:
+        """Check both bitmaps cover the same rows."""
+        if len(self.mask) != len(other.mask):
+            msg = "Cannot combine bitmaps over different numbers of rows."
+            raise ValueError(msg)
+
+    def _combined_scores(self, other: "RowBitmap") -> np.ndarray | None:
+        """Return the sum of the scores of both bitmaps."""
+        if self.scores is None:
+            return other.scores
+        if other.scores is None:
+            return self.scores
+        return self.scores + other.scores
+
+    def __and__(self, other: "RowBitmap") -> "RowBitmap":
+        """Return the rows matched by both bitmaps."""
+        self._check_compatible(other)
+        return RowBitmap(
+            self.labels,
+            self.mask & other.mask,
+            self._combined_scores(other),
+        )
+
+    def __or__(self, other: "RowBitmap") -> "RowBitmap":
+        """Return the rows matched by either bitmap."""
+        self._check_compatible(other)
+        return RowBitmap(
+            self.labels,
+            self.mask | other.mask,
+            self._combined_scores(other),
+        )
+
+    def __invert__(self) -> "RowBitmap":
+        """Return the rows not matched by the bitmap."""
+        return RowBitmap(self.labels, ~self.mask)
+
+    def __len__(self) -> int:
+        """Return the number of matching rows."""
+        if self._count is None:
+            self._count = int(np.count_nonzero(self.mask))
+        return self._count
+
+    def __repr__(self) -> str:
+        """Return the representation of the bitmap."""
+        return f"RowBitmap({len(self)} of {len(self.mask)} rows)"
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory used by the mask and scores."""
+        scores_nbytes = self.scores.nbytes if self.scores is not None else 0
+        return self.mask.nbytes + scores_nbytes
+
+    def positions(self) -> np.ndarray:
+        """Return the positions of the matching rows."""
+        return np.flatnonzero(self.mask)
+
+    def to_index(self) -> pd.Index:
+        """Return the labels of the matching rows."""
+        return self.labels[self.mask]
+
+    def to_scores(self) -> pd.Series | None:
+        """Return the scores of the matching rows indexed by label."""
+        if self.scores is None:
+            return None
+        return pd.Series(self.scores[self.mask], index=self.to_index())
@@ -2,9 +2,9 @@
 
 from typing import Self
 
-import pandas as pd
 from pydantic import BaseModel, Field, model_validator
 
+from massivesearch.ext.pandas.bitmap import RowBitmap
 from massivesearch.ext.pandas.types import (
     PandasBaseSearchEngineMixin,
 )
@@ -39,17 +39,30 @@ class PandasBoolSearchEngineArguments(BaseModel):
 class BoolSearchEngine(PandasBaseSearchEngineMixin, BaseSearchEngine):
     """Boolean search engine."""
 
+    default_dtype = "bool"
+
+    def search_cost(self) -> float:
+        """Return the estimated relative cost of a search."""
+        return 0.1
+
     async def search(
         self,
         arguments: PandasBoolSearchEngineArguments,
-    ) -> pd.Index:
+    ) -> RowBitmap:
         """Search for boolean values."""
+        return await self.run_blocking(self.search_blocking, arguments)
+
+    def search_blocking(
+        self,
+        arguments: PandasBoolSearchEngineArguments,
+    ) -> RowBitmap:
+        """Search for boolean values on the calling thread."""
         data = self.load_df()
-        data_series = data[self.column_name]
+        data_series = data[self.column_name].to_numpy(dtype=bool)
         if arguments.select_true and arguments.select_false:
-            return data.index
+            return RowBitmap.full(data.index)
         if arguments.select_true:
-            return data.index[data_series]
+            return RowBitmap(data.index, data_series)
         if arguments.select_false:
-            return data.index[~data_series]
-        return data.index[False]
+            return RowBitmap(data.index, ~data_series)
+        return RowBitmap.empty(data.index)
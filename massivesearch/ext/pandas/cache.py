@@ -0,0 +1,131 @@
+"""Process-wide dataset cache for pandas search engines."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+type DataVersion = tuple[int, int]
+
+
+def data_version(file_path: str) -> DataVersion:
+    """Return the version token (mtime in ns, size in bytes) of a file.
+
+    For a directory, such as a columnar store, the token of its manifest is
+    used.
+    """
+    path = Path(file_path)
+    if path.is_dir():
+        path /= "manifest.json"
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+@dataclass
+class _CacheEntry:
+    version: DataVersion
+    data: pd.DataFrame
+    nbytes: int
+
+
+class DatasetCache:
+    """LRU cache of loaded DataFrames shared by engines and aggregators.
+
+    Entries are keyed by the resolved file path plus a loader variant, and are
+    reloaded when the file's mtime or size changes. Once the total memory of
+    cached frames exceeds `max_bytes`, the least recently used entries are
+    evicted. Cached frames are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Initialize the dataset cache."""
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, Hashable], _CacheEntry] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple[str, Hashable], threading.Lock] = {}
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the memory used by the cached frames."""
+        return self._total_bytes
+
+    def get(
+        self,
+        file_path: str,
+        variant: Hashable,
+        loader: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Return the cached frame for the file, loading it when stale or missing.
+
+        `variant` distinguishes different loads of the same file, for example
+        different column projections. Concurrent callers asking for the same
+        entry wait for a single load instead of parsing the file twice.
+        """
+        key = (str(Path(file_path).resolve()), variant)
+        version = data_version(file_path)
+
+        data = self._lookup(key, version)
+        if data is not None:
+            return data
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            data = self._lookup(key, version)
+            if data is not None:
+                return data
+            data = loader()
+            self.misses += 1
+            self._store(key, _CacheEntry(version, data, _frame_nbytes(data)))
+            return data
+
+    def clear(self) -> None:
+        """Remove all cached frames."""
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+            self._total_bytes = 0
+
+    def _lookup(
+        self,
+        key: tuple[str, Hashable],
+        version: DataVersion,
+    ) -> pd.DataFrame | None:
+        """Return a fresh cached frame and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.data
+
+    def _store(self, key: tuple[str, Hashable], entry: _CacheEntry) -> None:
+        """Insert an entry and evict least recently used entries over budget."""
+        with self._lock:
+            stale = self._entries.pop(key, None)
+            if stale is not None:
+                self._total_bytes -= stale.nbytes
+            if entry.nbytes > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._total_bytes += entry.nbytes
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.nbytes
+
+
+def _frame_nbytes(data: pd.DataFrame) -> int:
+    """Return the deep memory usage of a frame."""
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+
+dataset_cache = DatasetCache()
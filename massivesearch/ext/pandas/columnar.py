@@ -0,0 +1,188 @@
+"""Memory-mapped columnar store for pandas search engines.
+
+A store is a directory with a `manifest.json` and one set of `.npy` files per
+column. Numeric and boolean columns are plain arrays. Text columns are a
+UTF-8 byte blob, int64 offsets and a validity mask. Columns are loaded with
+`mmap_mode="r"`, so every process reading a store shares one page-cached copy
+and nothing is parsed at start-up. Text columns are zero-copy when pyarrow
+is installed and decoded into Python strings otherwise.
+
+Convert a CSV file with:
+
+    python -m massivesearch.ext.pandas.columnar books.csv books.columns
+"""
+
+import argparse
+import json
+import shutil
+import uuid
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = "manifest.json"
+STORE_FORMAT_VERSION = 1
+
+type StringStorage = Literal["python", "pyarrow"]
+
+
+def is_columnar_store(path: str) -> bool:
+    """Return whether the path is a columnar store directory."""
+    return (Path(path) / MANIFEST_NAME).is_file()
+
+
+def _column_files(index: int) -> dict[str, str]:
+    """Return the file names of the arrays of a column."""
+    return {
+        "values": f"{index}.values.npy",
+        "offsets": f"{index}.offsets.npy",
+        "valid": f"{index}.valid.npy",
+    }
+
+
+def _write_column(directory: Path, index: int, series: pd.Series) -> dict:
+    """Write a column and return its manifest entry."""
+    files = _column_files(index)
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        np.save(directory / files["values"], series.to_numpy())
+        return {"name": series.name, "kind": "numeric", "files": files}
+
+    valid = series.notna().to_numpy(dtype=bool)
+    encoded = [str(value).encode() for value in series[valid]]
+    lengths = np.zeros(len(series), dtype=np.int64)
+    lengths[valid] = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.zeros(len(series) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    np.save(directory / files["values"], np.frombuffer(b"".join(encoded), np.uint8))
+    np.save(directory / files["offsets"], offsets)
+    np.save(directory / files["valid"], valid)
+    return {"name": series.name, "kind": "string", "files": files}
+
+
+def write_columnar_store(data: pd.DataFrame, path: str) -> None:
+    """Write a frame as a columnar store, replacing any existing store.
+
+    The store is written next to the target and moved into place, so readers
+    never see a partially written store. An existing store is renamed aside
+    first and removed only once the new one is in place, and is restored if
+    the move fails.
+    """
+    target = Path(path)
+    temp = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+    old = temp.with_name(f"{temp.name}.old")
+    temp.mkdir(parents=True)
+    try:
+        columns = [
+            _write_column(temp, index, data[name])
+            for index, name in enumerate(data.columns)
+        ]
+        manifest = {
+            "format_version": STORE_FORMAT_VERSION,
+            "num_rows": len(data),
+            "columns": columns,
+        }
+        (temp / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+        if target.exists():
+            target.rename(old)
+        try:
+            temp.rename(target)
+        except OSError:
+            if old.exists():
+                old.rename(target)
+            raise
+    finally:
+        for leftover in (temp, old):
+            if leftover.exists():
+                shutil.rmtree(leftover)
+
+
+def convert_csv(csv_path: str, path: str) -> None:
+    """Convert a CSV file into a columnar store."""
+    write_columnar_store(pd.read_csv(csv_path), path)
+
+
+def _string_dtype(storage: StringStorage) -> "pd.StringDtype[StringStorage]":
+    """Return the string dtype of a storage, missing values being NaN if possible.
+
+    pandas before 2.3 has no `na_value` and its string dtypes use `pd.NA`.
+    """
+    try:
+        return pd.StringDtype(storage, na_value=np.nan)
+    except TypeError:
+        return pd.StringDtype(storage)
+
+
+def _read_string_column(directory: Path, entry: dict, num_rows: int) -> pd.Series:
+    """Read a text column, zero-copy when pyarrow is available."""
+    files = entry["files"]
+    values = np.load(directory / files["values"], mmap_mode="r")
+    offsets = np.load(directory / files["offsets"], mmap_mode="r")
+    valid = np.load(directory / files["valid"])
+
+    try:
+        import pyarrow as pa  # type: ignore[import-untyped]  # noqa: PLC0415
+    except ImportError:
+        blob = values.tobytes()
+        strings = np.full(num_rows, np.nan, dtype=object)
+        for i in np.flatnonzero(valid):
+            strings[i] = blob[offsets[i] : offsets[i + 1]].decode()
+        return pd.Series(strings, name=entry["name"], dtype=_string_dtype("python"))
+
+    array = pa.LargeStringArray.from_buffers(
+        num_rows,
+        pa.py_buffer(offsets),
+        pa.py_buffer(values),
+        pa.py_buffer(np.packbits(valid, bitorder="little")),
+        null_count=int(num_rows - np.count_nonzero(valid)),
+    )
+    return pd.Series(
+        pd.array(array, dtype=_string_dtype("pyarrow")),
+        name=entry["name"],
+    )
+
+
+def read_columnar_store(
+    path: str,
+    columns: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """Read columns of a columnar store into a frame indexed by row position."""
+    directory = Path(path)
+    manifest = json.loads((directory / MANIFEST_NAME).read_text())
+    if manifest["format_version"] != STORE_FORMAT_VERSION:
+        msg = f"Unsupported columnar store format {manifest['format_version']}."
+        raise ValueError(msg)
+
+    entries = {entry["name"]: entry for entry in manifest["columns"]}
+    names = list(columns) if columns is not None else list(entries)
+    missing = [name for name in names if name not in entries]
+    if missing:
+        msg = f"Columns {missing} are not in the columnar store '{path}'."
+        raise ValueError(msg)
+
+    data: dict[str, np.ndarray | pd.Series] = {}
+    for name in names:
+        entry = entries[name]
+        if entry["kind"] == "numeric":
+            data[name] = np.asarray(
+                np.load(directory / entry["files"]["values"], mmap_mode="r"),
+            )
+        else:
+            data[name] = _read_string_column(directory, entry, manifest["num_rows"])
+    return pd.DataFrame(data, index=pd.RangeIndex(manifest["num_rows"]), copy=False)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Convert a CSV file into a columnar store from the command line."""
+    parser = argparse.ArgumentParser(description=convert_csv.__doc__)
+    parser.add_argument("csv_path")
+    parser.add_argument("store_path")
+    arguments = parser.parse_args(argv)
+    convert_csv(arguments.csv_path, arguments.store_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Byte offset index of CSV records for fetching single rows."""
+
+import io
+import mmap
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from massivesearch.ext.pandas.cache import dataset_cache
+
+_SCAN_CHUNK_BYTES = 64 * 1024**2
+_QUOTE = ord('"')
+_NEWLINE = ord("\n")
+_CARRIAGE_RETURN = ord("\r")
+_FIELD_BOUNDS = np.array([ord(","), _QUOTE, _NEWLINE, _CARRIAGE_RETURN], np.uint8)
+_UNINDEXABLE = pd.DataFrame()
+
+
+class UnindexableCsvError(ValueError):
+    """CSV file whose records cannot be found from its quote characters."""
+
+
+def _quotes_at_field_bounds(
+    data: np.ndarray,
+    positions: np.ndarray,
+    opening: np.ndarray,
+) -> bool:
+    """Return whether every quote opens at a field start or closes at a field end.
+
+    A quote elsewhere is a literal character of an unquoted field, like in
+    `15" laptop`, which `pd.read_csv` accepts but the quote parity misreads.
+    """
+    before = data[np.maximum(positions - 1, 0)]
+    after = data[np.minimum(positions + 1, len(data) - 1)]
+    opens = (positions == 0) | np.isin(before, _FIELD_BOUNDS)
+    closes = (positions == len(data) - 1) | np.isin(after, _FIELD_BOUNDS)
+    return bool(np.all(np.where(opening, opens, closes)))
+
+
+def _record_bounds(data: np.ndarray) -> tuple[np.ndarray, np.ndarray] | None:
+    """Return the start and end offsets of the records in the CSV bytes.
+
+    Return None when a quote is not at a field bound.
+    """
+    chunks: list[np.ndarray] = []
+    parity = 0
+    for start in range(0, len(data), _SCAN_CHUNK_BYTES):
+        chunk = data[start : start + _SCAN_CHUNK_BYTES]
+        is_quote = chunk == _QUOTE
+        quotes = np.cumsum(is_quote) + parity
+        if not _quotes_at_field_bounds(
+            data,
+            np.flatnonzero(is_quote) + start,
+            quotes[is_quote] % 2 == 1,
+        ):
+            return None
+        newlines = np.flatnonzero((chunk == _NEWLINE) & (quotes % 2 == 0))
+        chunks.append(newlines + start + 1)
+        parity = int(quotes[-1]) % 2
+    ends = np.concatenate([*chunks, np.empty(0, dtype=np.int64)])
+    if len(ends) == 0 or ends[-1] != len(data):
+        ends = np.append(ends, len(data))
+    return np.r_[0, ends[:-1]], ends
+
+
+def scan_csv_records(file_path: str) -> pd.DataFrame:
+    """Return the start and end byte offsets of every non-blank CSV record.
+
+    A newline ends a record only outside a quoted field. Quoted fields are
+    tracked by the parity of the running count of quote characters, which
+    also holds for escaped `""` quotes. Blank lines are dropped like
+    `pd.read_csv` does, and the header is the first record. Raise
+    `UnindexableCsvError` when a quote is not at a field bound, since the
+    parity then no longer tells quoted newlines apart.
+    """
+    if Path(file_path).stat().st_size == 0:
+        return pd.DataFrame({"start": [], "end": []}, dtype=np.int64)
+
+    with (
+        Path(file_path).open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+    ):
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        bounds = _record_bounds(data)
+        if bounds is not None:
+            starts, ends = bounds
+            last = data[np.maximum(ends - 1, 0)]
+            before_last = data[np.maximum(ends - 2, 0)]
+        del data
+    if bounds is None:
+        msg = f"The CSV file '{file_path}' has quotes inside unquoted fields."
+        raise UnindexableCsvError(msg)
+    lengths = ends - starts
+    has_newline = (lengths > 0) & (last == _NEWLINE)
+    has_carriage_return = (
+        has_newline & (lengths > 1) & (before_last == _CARRIAGE_RETURN)
+    )
+    blank = lengths - has_newline - has_carriage_return == 0
+    return pd.DataFrame({"start": starts[~blank], "end": ends[~blank]})
+
+
+def _scan_or_unindexable(file_path: str) -> pd.DataFrame:
+    """Return the record offsets, or the unindexable marker frame."""
+    try:
+        return scan_csv_records(file_path)
+    except UnindexableCsvError:
+        return _UNINDEXABLE
+
+
+def load_csv_records(file_path: str) -> pd.DataFrame | None:
+    """Return the record offsets of a CSV file from the shared dataset cache.
+
+    Return None when the file cannot be indexed, which is cached as well.
+    """
+    records = dataset_cache.get(
+        file_path,
+        ("csv_records",),
+        lambda: _scan_or_unindexable(file_path),
+    )
+    return None if records is _UNINDEXABLE else records
+
+
+def read_csv_rows(
+    file_path: str,
+    positions: np.ndarray | Sequence[int],
+    columns: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """Read the data rows at the given positions of a CSV file.
+
+    Only the header and the requested records are parsed. The returned frame
+    is indexed by row position, like a full `pd.read_csv`. Column dtypes are
+    inferred from the fetched rows only. Raise `UnindexableCsvError` when the
+    records of the file cannot be found.
+    """
+    records = load_csv_records(file_path)
+    if records is None:
+        msg = f"The CSV file '{file_path}' has quotes inside unquoted fields."
+        raise UnindexableCsvError(msg)
+    starts = records["start"].to_numpy()
+    ends = records["end"].to_numpy()
+    rows = np.asarray(positions, dtype=np.int64)
+
+    with (
+        Path(file_path).open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+    ):
+        lines = [
+            buffer[start:end].rstrip(b"\r\n") + b"\n"
+            for start, end in zip(
+                starts[np.r_[0, rows + 1]],
+                ends[np.r_[0, rows + 1]],
+                strict=True,
+            )
+        ]
+    data = pd.read_csv(
+        io.BytesIO(b"".join(lines)),
+        usecols=list(columns) if columns is not None else None,
+    )
+    data.index = pd.Index(rows)
+    return data
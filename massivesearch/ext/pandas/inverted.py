@@ -0,0 +1,86 @@
+"""Inverted index text search engine for Pandas."""
+
+import re
+
+import numpy as np
+
+from massivesearch.ext.pandas.bitmap import RowBitmap
+from massivesearch.ext.pandas.normalize import PandasTextNormalizeMixin
+from massivesearch.ext.pandas.postings import PandasPostingsIndexMixin, Postings
+from massivesearch.ext.pandas.scoring import bm25
+from massivesearch.ext.pandas.text import PandasTextSearchEngineArguments
+from massivesearch.search_engine.base import BaseSearchEngine
+
+WORD_PATTERN = r"\w+"
+
+_token_regex = re.compile(WORD_PATTERN)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split normalized text into word tokens."""
+    return _token_regex.findall(text)
+
+
+class PandasInvertedIndexSearchEngine(
+    PandasPostingsIndexMixin,
+    PandasTextNormalizeMixin,
+    BaseSearchEngine,
+):
+    """Text search engine backed by an inverted index of word tokens.
+
+    A row matches a keyword when it contains every word token of the keyword,
+    and matches the search when it matches any keyword. A keyword without
+    word tokens, like "!!", matches no rows. Matches are scored
+    with BM25, summed over the tokens of every matched keyword.
+    """
+
+    def search_cost(self) -> float:
+        """Return the estimated relative cost of a search."""
+        return 0.1
+
+    def build_postings(self) -> Postings:
+        """Build the inverted index from the data file."""
+        column = self.load_normalized().reset_index(drop=True)
+        row_terms = column.str.findall(WORD_PATTERN)
+        return Postings.build(row_terms, len(column))
+
+    async def search(
+        self,
+        arguments: PandasTextSearchEngineArguments,
+    ) -> RowBitmap:
+        """Search for keywords."""
+        return await self.run_blocking(self.search_blocking, arguments)
+
+    def search_blocking(
+        self,
+        arguments: PandasTextSearchEngineArguments,
+    ) -> RowBitmap:
+        """Search for keywords on the calling thread."""
+        labels = self.load_df().index
+        postings = self.load_postings()
+        if not arguments.keywords:
+            return RowBitmap.full(labels)
+
+        row_lengths = postings.row_lengths
+        if row_lengths is None:
+            msg = "Postings were built without row lengths."
+            raise ValueError(msg)
+
+        mask = np.zeros(postings.n_rows, dtype=bool)
+        scores = np.zeros(postings.n_rows)
+        average_length = row_lengths.mean() if postings.n_rows else 0.0
+        for keyword in arguments.keywords:
+            tokens = list(dict.fromkeys(tokenize(self.normalize(keyword))))
+            if not tokens:
+                continue
+            rows = postings.intersect(tokens)
+            mask[rows] = True
+            for token in tokens:
+                scores[rows] += bm25(
+                    postings.term_frequencies(token, rows),
+                    row_lengths[rows],
+                    average_length,
+                    len(postings.lookup(token)),
+                    postings.n_rows,
+                )
+        return RowBitmap(labels, mask, scores)
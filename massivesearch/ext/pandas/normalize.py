@@ -0,0 +1,98 @@
+"""Text normalization shared by pandas text search engines."""
+
+import sys
+import unicodedata
+from functools import cache
+from importlib.util import find_spec
+
+import pandas as pd
+from pydantic import Field
+
+from massivesearch.ext.pandas.cache import dataset_cache
+from massivesearch.ext.pandas.types import PandasBaseSearchEngineMixin
+
+NORMALIZED_DTYPE = pd.StringDtype("pyarrow" if find_spec("pyarrow") else "python")
+
+
+@cache
+def _combining_marks() -> dict[int, None]:
+    """Return a translation table deleting every combining mark."""
+    return {
+        code_point: None
+        for code_point in range(sys.maxunicode + 1)
+        if unicodedata.combining(chr(code_point))
+    }
+
+
+def normalize_text(text: str, *, casefold: bool, strip_accents: bool) -> str:
+    """Normalize a single string the same way columns are normalized."""
+    if strip_accents:
+        text = unicodedata.normalize("NFKD", text).translate(_combining_marks())
+    return text.casefold() if casefold else text.lower()
+
+
+def normalize_series(
+    series: pd.Series,
+    *,
+    casefold: bool,
+    strip_accents: bool,
+) -> pd.Series:
+    """Normalize a text column into a compact string dtype.
+
+    Every distinct value goes through `normalize_text`, so the column and the
+    keywords are always normalized alike. Arrow's lowercasing would differ
+    from Python's, e.g. on a final sigma or a dotted capital I.
+    """
+    series = series.astype(NORMALIZED_DTYPE)
+    normalized = {
+        value: normalize_text(value, casefold=casefold, strip_accents=strip_accents)
+        for value in series.dropna().unique()
+    }
+    return series.map(normalized, na_action="ignore").astype(NORMALIZED_DTYPE)
+
+
+class PandasTextNormalizeMixin(PandasBaseSearchEngineMixin):
+    """Pandas search engine matching text case-insensitively.
+
+    The normalized column is computed once per data version and shared
+    through the dataset cache by every engine with the same options.
+    """
+
+    casefold: bool = Field(
+        default=False,
+        description="Use Unicode casefolding instead of lowercasing.",
+    )
+    strip_accents: bool = Field(
+        default=False,
+        description="Remove accents, so 'cafe' matches 'café'.",
+    )
+
+    def normalize(self, text: str) -> str:
+        """Normalize a keyword like the column."""
+        return normalize_text(
+            text,
+            casefold=self.casefold,
+            strip_accents=self.strip_accents,
+        )
+
+    def load_normalized(self) -> pd.Series:
+        """Return the normalized column, indexed like `load_df`."""
+        variant = (
+            "normalized",
+            tuple(self.load_columns()),
+            tuple(sorted(self.load_dtypes().items())),
+            self.file_format,
+            self.column_name,
+            self.casefold,
+            self.strip_accents,
+        )
+        data = dataset_cache.get(
+            self.file_path,
+            variant,
+            lambda: normalize_series(
+                self.load_df()[self.column_name],
+                casefold=self.casefold,
+                strip_accents=self.strip_accents,
+            ).to_frame(),
+        )
+        return data[self.column_name]
@@ -2,14 +2,23 @@
 
 from typing import Self
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field, model_validator
 
+from massivesearch.ext.pandas.bitmap import RowBitmap
+from massivesearch.ext.pandas.source import (
+    RowGroupStats,
+    parquet_row_groups,
+    read_parquet_row_groups,
+)
 from massivesearch.ext.pandas.types import (
     PandasBaseSearchEngineMixin,
 )
 from massivesearch.search_engine.base import BaseSearchEngine
 
+_MASK_BLOCK_ROWS = 65_536
+
 
 class NumberRange(BaseModel):
     """Number range."""
@@ -45,40 +54,155 @@ class PandasNumberSearchEngineArguments(BaseModel):
     )
 
 
+def _overlaps(row_group: RowGroupStats, number_range: NumberRange) -> bool:
+    """Return whether a row group may contain values in the range."""
+    if row_group.min is None or row_group.max is None:
+        return True
+    return (
+        number_range.start_number is None or number_range.start_number <= row_group.max
+    ) and (number_range.end_number is None or number_range.end_number >= row_group.min)
+
+
+def range_masks(
+    values: pd.Series,
+    range_sets: list[list[NumberRange]],
+) -> list[np.ndarray]:
+    """Return the mask of values inside any range, for each list of ranges.
+
+    All masks are computed in one pass over the values: each block of rows is
+    compared against every range while it is in cache, with preallocated
+    buffers. Missing values never match, and an empty list of ranges matches
+    every row.
+    """
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in "iuf":
+        array = values.to_numpy()
+    else:
+        array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    bounds = [
+        [
+            (
+                -np.inf if r.start_number is None else r.start_number,
+                np.inf if r.end_number is None else r.end_number,
+            )
+            for r in ranges
+        ]
+        for ranges in range_sets
+    ]
+    masks = [np.ones(len(array), dtype=bool) for _ in range_sets]
+    block_size = min(_MASK_BLOCK_ROWS, len(array))
+    lower = np.empty(block_size, dtype=bool)
+    upper = np.empty(block_size, dtype=bool)
+    for start in range(0, len(array), _MASK_BLOCK_ROWS):
+        block = array[start : start + _MASK_BLOCK_ROWS]
+        size = len(block)
+        for mask, ranges in zip(masks, bounds, strict=True):
+            if not ranges:
+                continue
+            out = mask[start : start + size]
+            out[:] = False
+            for start_number, end_number in ranges:
+                np.greater_equal(block, start_number, out=lower[:size])
+                np.less_equal(block, end_number, out=upper[:size])
+                np.logical_and(lower[:size], upper[:size], out=lower[:size])
+                np.logical_or(out, lower[:size], out=out)
+    return masks
+
+
 class PandasNumberSearchEngine(PandasBaseSearchEngineMixin, BaseSearchEngine):
-    """Number search engine."""
+    """Number search engine.
+
+    With `row_group_pruning` on a Parquet file, the engine reads only the row
+    groups whose statistics overlap a range instead of loading the column.
+    """
+
+    row_group_pruning: bool = Field(
+        default=False,
+        description="Skip Parquet row groups whose statistics miss every range.",
+    )
+
+    def search_cost(self) -> float:
+        """Return the estimated relative cost of a search."""
+        return 0.5
 
     async def search(
         self,
         arguments: PandasNumberSearchEngineArguments,
-    ) -> pd.Index:
+    ) -> RowBitmap:
         """Search for numbers."""
+        return await self.run_blocking(self.search_blocking, arguments)
+
+    async def search_many(
+        self,
+        arguments: list[PandasNumberSearchEngineArguments],
+    ) -> list[RowBitmap]:
+        """Search for numbers with many argument sets in one pass."""
+        return await self.run_blocking(self.search_many_blocking, arguments)
+
+    def search_blocking(
+        self,
+        arguments: PandasNumberSearchEngineArguments,
+    ) -> RowBitmap:
+        """Search for numbers on the calling thread."""
+        if (
+            arguments.number_ranges
+            and self.row_group_pruning
+            and self.resolved_file_format() == "parquet"
+        ):
+            return self.search_row_groups(arguments)
+
         data = self.load_df()
 
         if len(arguments.number_ranges) == 0:
-            return data.index
-
-        data_series = data[self.column_name]
-        masks = []
-
-        for number_range in arguments.number_ranges:
-            start_number = number_range.start_number
-            end_number = number_range.end_number
-            if start_number is not None and end_number is not None:
-                current_mask = (data_series >= start_number) & (
-                    data_series <= end_number
-                )
-            elif start_number is not None:
-                current_mask = data_series >= start_number
-            elif end_number is not None:
-                current_mask = data_series <= end_number
-            else:
-                continue
-            masks.append(current_mask)
-
-        if not masks:
-            return data.index
-        combined_mask = masks[0]
-        for mask in masks[1:]:
-            combined_mask |= mask
-        return data.index[combined_mask]
+            return RowBitmap.full(data.index)
+
+        return RowBitmap(
+            data.index,
+            range_masks(data[self.column_name], [arguments.number_ranges])[0],
+        )
+
+    def search_many_blocking(
+        self,
+        arguments: list[PandasNumberSearchEngineArguments],
+    ) -> list[RowBitmap]:
+        """Search for numbers with many argument sets on the calling thread.
+
+        The column is loaded once and scanned once for all argument sets.
+        """
+        if self.row_group_pruning and self.resolved_file_format() == "parquet":
+            return [self.search_blocking(argument) for argument in arguments]
+
+        data = self.load_df()
+        masks = range_masks(
+            data[self.column_name],
+            [argument.number_ranges for argument in arguments],
+        )
+        return [RowBitmap(data.index, mask) for mask in masks]
+
+    def search_row_groups(
+        self,
+        arguments: PandasNumberSearchEngineArguments,
+    ) -> RowBitmap:
+        """Search only the Parquet row groups that may match a range."""
+        row_groups = parquet_row_groups(self.file_path, self.column_name)
+        labels = pd.RangeIndex(sum(row_group.num_rows for row_group in row_groups))
+        selected = [
+            row_group
+            for row_group in row_groups
+            if any(_overlaps(row_group, r) for r in arguments.number_ranges)
+        ]
+        if not selected:
+            return RowBitmap.empty(labels)
+
+        values = read_parquet_row_groups(
+            self.file_path,
+            self.column_name,
+            [row_group.index for row_group in selected],
+        )
+        positions = np.concatenate(
+            [
+                np.arange(row_group.first_row, row_group.first_row + row_group.num_rows)
+                for row_group in selected
+            ],
+        )
+        mask = range_masks(values, [arguments.number_ranges])[0]
+        return RowBitmap.from_positions(labels, positions[mask])
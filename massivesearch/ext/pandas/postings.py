@@ -0,0 +1,272 @@
+"""Posting lists shared by the index-backed pandas search engines."""
+
+import itertools
+import json
+import os
+import sys
+import threading
+from abc import abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Self
+
+import numpy as np
+import pandas as pd
+from pydantic import Field, PrivateAttr
+
+from massivesearch.ext.pandas.types import PandasBaseSearchEngineMixin
+
+POSTINGS_FORMAT_VERSION = 3
+
+
+def sorted_unique_pairs(
+    keys: np.ndarray,
+    positions: np.ndarray,
+    *,
+    return_counts: bool = False,
+) -> tuple[np.ndarray, ...]:
+    """Sort (key, position) pairs by key and drop duplicates.
+
+    Pairs must be ordered by position, so a stable sort by key keeps the
+    positions of every key sorted. With `return_counts`, the number of
+    occurrences of every unique pair is returned as well.
+    """
+    order = np.argsort(keys, kind="stable")
+    keys, positions = keys[order], positions[order]
+    keep = np.ones(len(keys), dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]) | (positions[1:] != positions[:-1])
+    if not return_counts:
+        return keys[keep], positions[keep]
+    counts = np.diff(np.append(np.flatnonzero(keep), len(keys)))
+    return keys[keep], positions[keep], counts
+
+
+def _encode_terms(terms: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the UTF-8 bytes of string terms and the offset of each term."""
+    encoded = [term.encode() for term in terms]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(term) for term in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_terms(blob: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Return the string terms stored by `_encode_terms`."""
+    data = blob.tobytes()
+    terms = np.empty(len(offsets) - 1, dtype=object)
+    terms[:] = [data[start:end].decode() for start, end in itertools.pairwise(offsets)]
+    return terms
+
+
+@dataclass(frozen=True)
+class Postings:
+    """Sorted row positions of every term, stored as a compressed sparse row.
+
+    The rows of `terms[i]` are `rows[offsets[i]:offsets[i + 1]]`, sorted and
+    unique. `terms` is sorted, so lookups are a binary search. String terms
+    are an object array, since a fixed-width string array would pad every
+    term to the longest one.
+
+    Postings built with frequencies also keep how often each term occurs in
+    each of its rows, aligned with `rows`, and the number of terms of every
+    row, for relevance scoring.
+    """
+
+    terms: np.ndarray
+    offsets: np.ndarray
+    rows: np.ndarray
+    n_rows: int
+    frequencies: np.ndarray | None = None
+    row_lengths: np.ndarray | None = None
+
+    @classmethod
+    def build(cls, row_terms: pd.Series, n_rows: int) -> Self:
+        """Build postings from a series of term lists indexed by row position.
+
+        The series index must be ascending, so a stable sort by term keeps the
+        rows of every term sorted.
+        """
+        exploded = row_terms.explode().dropna()
+        positions = exploded.index.to_numpy(dtype=np.int64)
+        term_ids, terms = pd.factorize(exploded.to_numpy(dtype=object), sort=True)
+        postings = cls.from_pairs(term_ids, positions, n_rows, frequencies=True)
+        return replace(postings, terms=np.asarray(terms, dtype=object)[postings.terms])
+
+    @classmethod
+    def from_pairs(
+        cls,
+        keys: np.ndarray,
+        positions: np.ndarray,
+        n_rows: int,
+        *,
+        frequencies: bool = False,
+    ) -> Self:
+        """Build postings from (term key, row position) pairs.
+
+        Pairs must be ordered by row position; duplicates are dropped, and
+        counted as term frequencies when `frequencies` is set.
+        """
+        row_lengths = np.bincount(positions, minlength=n_rows) if frequencies else None
+        keys, positions, counts = sorted_unique_pairs(
+            keys,
+            positions,
+            return_counts=True,
+        )
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])[: len(keys)]
+        offsets = np.append(starts, len(keys)).astype(np.int64)
+        row_dtype = np.int32 if n_rows <= np.iinfo(np.int32).max else np.int64
+        return cls(
+            terms=keys[starts],
+            offsets=offsets,
+            rows=positions.astype(row_dtype),
+            n_rows=n_rows,
+            frequencies=counts.astype(np.int32) if frequencies else None,
+            row_lengths=(
+                row_lengths.astype(np.int32) if row_lengths is not None else None
+            ),
+        )
+
+    def _term_slice(self, term: str | int) -> slice:
+        """Return the slice of `rows` holding the rows of the term."""
+        i = int(np.searchsorted(self.terms, term))
+        if i == len(self.terms) or self.terms[i] != term:
+            return slice(0, 0)
+        return slice(self.offsets[i], self.offsets[i + 1])
+
+    def lookup(self, term: str | int) -> np.ndarray:
+        """Return the sorted row positions containing the term."""
+        return self.rows[self._term_slice(term)]
+
+    def term_frequencies(self, term: str | int, rows: np.ndarray) -> np.ndarray:
+        """Return how often the term occurs in the given rows, which contain it."""
+        if self.frequencies is None:
+            msg = "Postings were built without term frequencies."
+            raise ValueError(msg)
+        term_slice = self._term_slice(term)
+        found = np.searchsorted(self.rows[term_slice], rows)
+        return self.frequencies[term_slice][found]
+
+    def intersect(self, terms: Iterable[str | int]) -> np.ndarray:
+        """Return the sorted row positions containing every term."""
+        postings = sorted((self.lookup(term) for term in terms), key=len)
+        if not postings:
+            return np.arange(self.n_rows)
+        rows = postings[0]
+        for other in postings[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def nbytes(self) -> int:
+        """Return the memory used by the postings."""
+        arrays = (
+            self.terms,
+            self.offsets,
+            self.rows,
+            self.frequencies,
+            self.row_lengths,
+        )
+        nbytes = sum(array.nbytes for array in arrays if array is not None)
+        if self.terms.dtype == object:
+            nbytes += sum(map(sys.getsizeof, self.terms))
+        return nbytes
+
+    def save(self, path: str, version: object) -> None:
+        """Save the postings with the data version they were built from."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        arrays: dict[str, np.ndarray] = {
+            "offsets": self.offsets,
+            "rows": self.rows,
+            "n_rows": np.array(self.n_rows, dtype=np.int64),
+            "version": np.array(json.dumps(version)),
+        }
+        if self.terms.dtype == object:
+            arrays["term_bytes"], arrays["term_offsets"] = _encode_terms(self.terms)
+        else:
+            arrays["terms"] = self.terms
+        arrays |= {
+            name: array
+            for name, array in (
+                ("frequencies", self.frequencies),
+                ("row_lengths", self.row_lengths),
+            )
+            if array is not None
+        }
+        with temp.open("wb") as f:
+            np.savez(f, allow_pickle=False, **arrays)
+        temp.replace(target)
+
+    @classmethod
+    def load(cls, path: str, version: object) -> Self | None:
+        """Load saved postings, or None when missing or built from other data."""
+        if not Path(path).exists():
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            if str(data["version"]) != json.dumps(version):
+                return None
+            terms = (
+                data["terms"]
+                if "terms" in data
+                else _decode_terms(data["term_bytes"], data["term_offsets"])
+            )
+            return cls(
+                terms=terms,
+                offsets=data["offsets"],
+                rows=data["rows"],
+                n_rows=int(data["n_rows"]),
+                frequencies=data.get("frequencies"),
+                row_lengths=data.get("row_lengths"),
+            )
+
+
+class PandasPostingsIndexMixin(PandasBaseSearchEngineMixin):
+    """Pandas search engine backed by postings built from its column.
+
+    The postings are built once per data version and saved to `index_path`
+    when set, so later processes load them instead of rebuilding.
+    """
+
+    index_path: str | None = Field(
+        default=None,
+        description="File the index is saved to and loaded from.",
+    )
+
+    _postings: Postings | None = PrivateAttr(default=None)
+    _postings_version: list | None = PrivateAttr(default=None)
+    _postings_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def prepare(self) -> None:
+        """Build or load the postings."""
+        self.load_postings()
+
+    def postings_version(self) -> list:
+        """Return the version token the postings are built and saved with."""
+        return [
+            *self.data_version(),
+            POSTINGS_FORMAT_VERSION,
+            type(self).__name__,
+            self.model_dump_json(exclude={"index_path"}),
+        ]
+
+    def load_postings(self) -> Postings:
+        """Return the postings, building them when missing or stale."""
+        version = self.postings_version()
+        with self._postings_lock:
+            if self._postings is None or self._postings_version != version:
+                postings = None
+                if self.index_path is not None:
+                    postings = Postings.load(self.index_path, version)
+                if postings is None:
+                    postings = self.build_postings()
+                    if self.index_path is not None:
+                        postings.save(self.index_path, version)
+                self._postings = postings
+                self._postings_version = version
+            return self._postings
+
+    @abstractmethod
+    def build_postings(self) -> Postings:
+        """Build the postings from the data file."""
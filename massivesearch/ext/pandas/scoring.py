@@ -0,0 +1,24 @@
+"""BM25 relevance scoring for pandas text search engines."""
+
+import numpy as np
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def bm25(
+    frequencies: np.ndarray,
+    lengths: np.ndarray,
+    average_length: float,
+    document_frequency: int,
+    n_rows: int,
+) -> np.ndarray:
+    """Return the BM25 score of one term in the rows containing it.
+
+    `frequencies` and `lengths` are the term count and the length of each of
+    those rows, and `document_frequency` is the number of rows with the term.
+    """
+    idf = np.log1p((n_rows - document_frequency + 0.5) / (document_frequency + 0.5))
+    relative_length = lengths / average_length if average_length else 1.0
+    saturation = BM25_K1 * (1 - BM25_B + BM25_B * relative_length)
+    return idf * frequencies * (BM25_K1 + 1) / (frequencies + saturation)
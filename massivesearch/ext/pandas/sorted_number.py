@@ -0,0 +1,137 @@
+"""Sorted-array number search engine for Pandas."""
+
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+from pydantic import PrivateAttr, field_validator
+
+from massivesearch.ext.pandas.bitmap import RowBitmap
+from massivesearch.ext.pandas.cache import DataVersion
+from massivesearch.ext.pandas.number import (
+    NumberRange,
+    PandasNumberSearchEngine,
+    PandasNumberSearchEngineArguments,
+)
+
+
+@dataclass(frozen=True)
+class SortedColumn:
+    """Non-null values of a column in ascending order with their row positions."""
+
+    values: np.ndarray
+    positions: np.ndarray
+    version: DataVersion
+
+
+def merge_ranges(number_ranges: list[NumberRange]) -> list[tuple[float, float]]:
+    """Return the union of the ranges as sorted, disjoint inclusive bounds."""
+    bounds = sorted(
+        (
+            -np.inf if number_range.start_number is None else number_range.start_number,
+            np.inf if number_range.end_number is None else number_range.end_number,
+        )
+        for number_range in number_ranges
+    )
+    merged: list[tuple[float, float]] = []
+    for start, end in bounds:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class PandasSortedNumberSearchEngine(PandasNumberSearchEngine):
+    """Number search engine answering ranges by binary search.
+
+    The column is sorted once per data version, then each merged range is
+    two `np.searchsorted` calls plus the matching positions. Results match
+    `PandasNumberSearchEngine`. The whole column is sorted, so Parquet row
+    group pruning is not supported.
+    """
+
+    _sorted: SortedColumn | None = PrivateAttr(default=None)
+    _sorted_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @field_validator("row_group_pruning")
+    @classmethod
+    def row_group_pruning_validate(cls, value: bool) -> bool:  # noqa: FBT001
+        """Reject row group pruning, which the sorted column cannot use."""
+        if value:
+            msg = "row_group_pruning is not supported by the sorted number engine."
+            raise ValueError(msg)
+        return value
+
+    def search_cost(self) -> float:
+        """Return the estimated relative cost of a search."""
+        return 0.05
+
+    def prepare(self) -> None:
+        """Sort the column."""
+        self.load_sorted()
+
+    def load_sorted(self) -> SortedColumn:
+        """Return the sorted column, sorting it when missing or stale."""
+        version = self.data_version()
+        with self._sorted_lock:
+            if self._sorted is None or self._sorted.version != version:
+                data = self.load_df()
+                values = data[self.column_name].to_numpy(
+                    dtype=np.float64,
+                    na_value=np.nan,
+                )
+                positions = np.flatnonzero(~np.isnan(values))
+                values = values[positions]
+                order = np.argsort(values, kind="stable")
+                self._sorted = SortedColumn(
+                    values=values[order],
+                    positions=positions[order],
+                    version=version,
+                )
+            return self._sorted
+
+    def search_blocking(
+        self,
+        arguments: PandasNumberSearchEngineArguments,
+    ) -> RowBitmap:
+        """Search for numbers on the calling thread."""
+        return self.search_many_blocking([arguments])[0]
+
+    def search_many_blocking(
+        self,
+        arguments: list[PandasNumberSearchEngineArguments],
+    ) -> list[RowBitmap]:
+        """Search for numbers with many argument sets on the calling thread.
+
+        The merged bounds of all argument sets go through one pair of
+        `np.searchsorted` calls.
+        """
+        labels = self.load_df().index
+        merged = [merge_ranges(argument.number_ranges) for argument in arguments]
+        if not any(merged):
+            return [RowBitmap.full(labels) for _ in arguments]
+
+        sorted_column = self.load_sorted()
+        bounds = np.array([bound for ranges in merged for bound in ranges])
+        starts = np.searchsorted(sorted_column.values, bounds[:, 0], side="left")
+        ends = np.searchsorted(sorted_column.values, bounds[:, 1], side="right")
+        results = []
+        offset = 0
+        for ranges in merged:
+            if not ranges:
+                results.append(RowBitmap.full(labels))
+                continue
+            positions = np.concatenate(
+                [
+                    sorted_column.positions[start:end]
+                    for start, end in zip(
+                        starts[offset : offset + len(ranges)],
+                        ends[offset : offset + len(ranges)],
+                        strict=True,
+                    )
+                ],
+            )
+            results.append(RowBitmap.from_positions(labels, positions))
+            offset += len(ranges)
+        return results
@@ -0,0 +1,203 @@
+"""Dataset loading for pandas search engines and aggregators."""
+
+import functools
+import itertools
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Literal
+
+import pandas as pd
+
+from massivesearch.ext.pandas.cache import dataset_cache
+from massivesearch.ext.pandas.columnar import is_columnar_store, read_columnar_store
+
+type FileFormat = Literal["csv", "parquet", "arrow", "columnar"]
+
+FILE_FORMAT_SUFFIXES: dict[str, FileFormat] = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+COMPRESSION_SUFFIXES = frozenset({".gz", ".bz2", ".zip", ".xz", ".zst", ".tar"})
+
+
+def import_pyarrow() -> ModuleType:
+    """Import pyarrow, which is only needed for Parquet and Arrow files."""
+    try:
+        import pyarrow as pa  # type: ignore[import-untyped]  # noqa: PLC0415
+        import pyarrow.feather  # type: ignore[import-untyped]  # noqa: PLC0415
+        import pyarrow.parquet  # type: ignore[import-untyped]  # noqa: PLC0415
+    except ImportError as e:
+        msg = "Reading Parquet and Arrow files requires pyarrow: pip install pyarrow"
+        raise ImportError(msg) from e
+    return pa
+
+
+def infer_file_format(file_path: str) -> FileFormat:
+    """Infer the file format from the file extension.
+
+    A directory holding a columnar store manifest is a columnar store.
+    Compression suffixes are skipped, and any other extension is read as CSV,
+    like `pd.read_csv` reads it.
+    """
+    if is_columnar_store(file_path):
+        return "columnar"
+    suffixes = [suffix.lower() for suffix in Path(file_path).suffixes]
+    while suffixes and suffixes[-1] in COMPRESSION_SUFFIXES:
+        suffixes.pop()
+    return FILE_FORMAT_SUFFIXES.get(suffixes[-1] if suffixes else "", "csv")
+
+
+def is_compressed(file_path: str) -> bool:
+    """Return whether the file extension is a compression suffix."""
+    return Path(file_path).suffix.lower() in COMPRESSION_SUFFIXES
+
+
+def _read_file(
+    file_path: str,
+    file_format: FileFormat,
+    columns: list[str] | None,
+    dtype: dict[str, str],
+) -> pd.DataFrame:
+    """Read a file into a frame indexed by row position."""
+    if file_format == "csv":
+        return pd.read_csv(file_path, usecols=columns, dtype=dtype or None)
+    if file_format == "columnar":
+        data = read_columnar_store(file_path, columns)
+        return data.astype(dtype) if dtype else data
+
+    pa = import_pyarrow()
+    if file_format == "parquet":
+        table = pa.parquet.read_table(file_path, columns=columns, memory_map=True)
+    else:
+        table = pa.feather.read_table(file_path, columns=columns, memory_map=True)
+    # Ignore the stored pandas index so row labels are row positions, as for CSV.
+    data = table.to_pandas(ignore_metadata=True, split_blocks=True)
+    return data.astype(dtype) if dtype else data
+
+
+def load_dataset(
+    file_path: str,
+    columns: Sequence[str] | None = None,
+    dtype: Mapping[str, str] | None = None,
+    file_format: FileFormat | None = None,
+) -> pd.DataFrame:
+    """Load a CSV, Parquet or Arrow IPC file through the shared dataset cache.
+
+    Only `columns` are read when given, and `dtype` pins the dtype of the
+    listed columns. The format is inferred from the extension unless
+    `file_format` is set. Arrow IPC files and columnar stores (see
+    `massivesearch.ext.pandas.columnar`) are memory-mapped, so processes
+    share their pages instead of each holding a parsed copy. Each distinct
+    projection is cached as its own entry.
+    """
+    file_format = file_format or infer_file_format(file_path)
+    usecols = list(columns) if columns is not None else None
+    dtypes = dict(dtype or {})
+    variant = (
+        tuple(usecols) if usecols is not None else None,
+        tuple(sorted(dtypes.items())),
+        file_format,
+    )
+    return dataset_cache.get(
+        file_path,
+        variant,
+        lambda: _read_file(file_path, file_format, usecols, dtypes),
+    )
+
+
+@dataclass(frozen=True)
+class RowGroupStats:
+    """Position and value bounds of a Parquet row group."""
+
+    index: int
+    first_row: int
+    num_rows: int
+    min: float | None
+    max: float | None
+
+
+def _read_row_group_stats(file_path: str, column: str) -> pd.DataFrame:
+    """Read the position and statistics of a column in every row group."""
+    pa = import_pyarrow()
+    metadata = pa.parquet.ParquetFile(file_path).metadata
+    column_index = metadata.schema.names.index(column)
+    num_rows, mins, maxs = [], [], []
+    for index in range(metadata.num_row_groups):
+        row_group = metadata.row_group(index)
+        stats = row_group.column(column_index).statistics
+        has_bounds = stats is not None and stats.has_min_max
+        num_rows.append(row_group.num_rows)
+        mins.append(stats.min if has_bounds else None)
+        maxs.append(stats.max if has_bounds else None)
+    first_rows = [0, *itertools.accumulate(num_rows)][:-1]
+    return pd.DataFrame(
+        {
+            "first_row": pd.Series(first_rows, dtype="int64"),
+            "num_rows": pd.Series(num_rows, dtype="int64"),
+            "min": pd.Series(mins, dtype=object),
+            "max": pd.Series(maxs, dtype=object),
+        },
+    )
+
+
+def parquet_row_groups(file_path: str, column: str) -> list[RowGroupStats]:
+    """Return the row groups of a Parquet file with the statistics of a column.
+
+    `min` and `max` are None when the row group has no statistics. The
+    metadata is read once per data version through the shared dataset cache.
+    """
+    stats = dataset_cache.get(
+        file_path,
+        ("parquet_row_groups", column),
+        lambda: _read_row_group_stats(file_path, column),
+    )
+    return [
+        RowGroupStats(
+            index=index,
+            first_row=int(first_row),
+            num_rows=int(num_rows),
+            min=row_min,
+            max=row_max,
+        )
+        for index, (first_row, num_rows, row_min, row_max) in enumerate(
+            stats.itertuples(index=False),
+        )
+    ]
+
+
+def _read_row_group(file_path: str, column: str, row_group: int) -> pd.DataFrame:
+    """Read a column from one Parquet row group."""
+    pa = import_pyarrow()
+    table = pa.parquet.ParquetFile(file_path, memory_map=True).read_row_group(
+        row_group,
+        columns=[column],
+    )
+    return table.to_pandas(ignore_metadata=True)
+
+
+def read_parquet_row_groups(
+    file_path: str,
+    column: str,
+    row_groups: Sequence[int],
+) -> pd.Series:
+    """Read a column from the given Parquet row groups.
+
+    Each row group is cached on its own through the shared dataset cache, so
+    a search only reads the row groups no earlier search has read.
+    """
+    frames = [
+        dataset_cache.get(
+            file_path,
+            ("parquet_row_group", column, row_group),
+            functools.partial(_read_row_group, file_path, column, row_group),
+        )
+        for row_group in row_groups
+    ]
+    return pd.concat([frame[column] for frame in frames], ignore_index=True)
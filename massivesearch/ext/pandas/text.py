@@ -1,13 +1,18 @@
 """Text search engine for Pandas."""
 
+import sys
+import threading
+from dataclasses import dataclass
 from typing import Literal
 
+import numpy as np
 import pandas as pd
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from massivesearch.ext.pandas.types import (
-    PandasBaseSearchEngineMixin,
-)
+from massivesearch.ext.pandas.bitmap import RowBitmap
+from massivesearch.ext.pandas.cache import DataVersion
+from massivesearch.ext.pandas.normalize import PandasTextNormalizeMixin
+from massivesearch.ext.pandas.scoring import bm25
 from massivesearch.search_engine.base import BaseSearchEngine
 
 
@@ -19,35 +24,167 @@ class PandasTextSearchEngineArguments(BaseModel):
     )
 
 
-class PandasTextSearchEngine(PandasBaseSearchEngineMixin, BaseSearchEngine):
-    """Text search engine."""
+@dataclass(frozen=True)
+class SortedStrings:
+    """Non-null strings of a column in ascending order with their row positions."""
+
+    values: np.ndarray
+    positions: np.ndarray
+    version: DataVersion | None = None
+
+    @classmethod
+    def from_series(
+        cls,
+        series: pd.Series,
+        version: DataVersion | None = None,
+    ) -> "SortedStrings":
+        """Sort the non-null values of a series indexed by row position."""
+        positions = np.flatnonzero(series.notna().to_numpy())
+        values = series.to_numpy(dtype=object)[positions]
+        # Python's string sort is several times faster than an object argsort.
+        order = np.array(
+            sorted(range(len(values)), key=values.__getitem__),
+            dtype=np.int64,
+        )
+        return cls(
+            values=values[order],
+            positions=positions[order],
+            version=version,
+        )
+
+    def prefix_positions(self, prefix: str) -> np.ndarray:
+        """Return the row positions of the strings starting with the prefix.
+
+        They form the range from the prefix up to the smallest string greater
+        than every string with the prefix.
+        """
+        start = np.searchsorted(self.values, prefix, side="left")
+        stem = prefix.rstrip(chr(sys.maxunicode))
+        if not stem:
+            return self.positions[start:]
+        upper = stem[:-1] + chr(ord(stem[-1]) + 1)
+        end = np.searchsorted(self.values, upper, side="left")
+        return self.positions[start:end]
+
+
+class PandasTextSearchEngine(PandasTextNormalizeMixin, BaseSearchEngine):
+    """Text search engine.
+
+    Every strategy matches against the normalized column. `starts_with` and
+    `ends_with` are answered by binary search over the sorted normalized
+    values, or the sorted reversed values for suffixes. The sorted values are
+    built once and shared by later searches until the data changes.
+
+    With `scoring`, matches are scored with BM25 taking each keyword as one
+    term, and keywords are matched one at a time.
+    """
 
     matching_strategy: Literal["exact", "contains", "starts_with", "ends_with"]
+    scoring: bool = Field(
+        default=False,
+        description="Score matching rows by relevance for ranked aggregation.",
+    )
+
+    _affix_index: SortedStrings | None = PrivateAttr(default=None)
+    _affix_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def search_cost(self) -> float:
+        """Return the estimated relative cost of a search."""
+        return 0.2 if self.matching_strategy == "exact" else 1.0
+
+    def prepare(self) -> None:
+        """Build the affix index for the prefix and suffix strategies."""
+        if self.matching_strategy in ("starts_with", "ends_with"):
+            self.load_affix_index()
+
+    def load_affix_index(self) -> SortedStrings:
+        """Return the sorted values, or reversed values for `ends_with`."""
+        version = self.data_version()
+        with self._affix_lock:
+            if self._affix_index is None or self._affix_index.version != version:
+                values = self.load_normalized().reset_index(drop=True)
+                if self.matching_strategy == "ends_with":
+                    values = values.str[::-1]
+                self._affix_index = SortedStrings.from_series(values, version)
+            return self._affix_index
 
     async def search(
         self,
         arguments: PandasTextSearchEngineArguments,
-    ) -> pd.Index:
+    ) -> RowBitmap:
         """Search for text values."""
-        data = self.load_df()
-        data_series_lower = data[self.column_name].str.lower()
-        keywords_lower = [keyword.lower() for keyword in arguments.keywords]
+        return await self.run_blocking(self.search_blocking, arguments)
+
+    def search_blocking(
+        self,
+        arguments: PandasTextSearchEngineArguments,
+    ) -> RowBitmap:
+        """Search for text values on the calling thread."""
+        data_series = self.load_normalized()
+        keywords = [self.normalize(keyword) for keyword in arguments.keywords]
+        if self.scoring and keywords:
+            return self.scored_search(data_series, keywords)
+        if self.matching_strategy in ("starts_with", "ends_with"):
+            mask = np.zeros(len(data_series), dtype=bool)
+            for keyword in keywords:
+                mask[self.keyword_positions(data_series, keyword)] = True
+            return RowBitmap(data_series.index, mask)
+
         match self.matching_strategy:
             case "exact":
-                indices = data.index[data_series_lower.isin(keywords_lower)]
+                matches = data_series.isin(keywords)
             case "contains":
-                indices = data.index[
-                    data_series_lower.str.contains("|".join(keywords_lower))
-                ]
+                matches = data_series.str.contains("|".join(keywords))
+            case _:
+                msg = "Invalid matching strategy."
+                raise ValueError(msg)
+        return RowBitmap(
+            data_series.index,
+            matches.to_numpy(dtype=bool, na_value=False),
+        )
+
+    def keyword_positions(self, data_series: pd.Series, keyword: str) -> np.ndarray:
+        """Return the row positions matching a normalized keyword."""
+        match self.matching_strategy:
             case "starts_with":
-                indices = data.index[
-                    data_series_lower.str.startswith(tuple(keywords_lower))
-                ]
+                return self.load_affix_index().prefix_positions(keyword)
             case "ends_with":
-                indices = data.index[
-                    data_series_lower.str.endswith(tuple(keywords_lower))
-                ]
+                return self.load_affix_index().prefix_positions(keyword[::-1])
+            case "exact":
+                matches = data_series == keyword
+            case "contains":
+                matches = data_series.str.contains(keyword)
             case _:
                 msg = "Invalid matching strategy."
                 raise ValueError(msg)
-        return indices
+        return np.flatnonzero(matches.to_numpy(dtype=bool, na_value=False))
+
+    def scored_search(self, data_series: pd.Series, keywords: list[str]) -> RowBitmap:
+        """Match normalized keywords one at a time and score them with BM25.
+
+        The term frequency of a keyword is its number of occurrences for the
+        `contains` strategy and one otherwise, and row lengths are counted in
+        characters.
+        """
+        lengths = data_series.str.len().to_numpy(dtype=float, na_value=0)
+        average_length = lengths.mean() if len(lengths) else 0.0
+        mask = np.zeros(len(data_series), dtype=bool)
+        scores = np.zeros(len(data_series))
+        for keyword in keywords:
+            rows = self.keyword_positions(data_series, keyword)
+            mask[rows] = True
+            frequencies: np.ndarray
+            if self.matching_strategy == "contains":
+                frequencies = (
+                    data_series.iloc[rows].str.count(keyword).to_numpy(dtype=float)
+                )
+            else:
+                frequencies = np.ones(len(rows))
+            scores[rows] += bm25(
+                frequencies,
+                lengths[rows],
+                average_length,
+                len(rows),
+                len(data_series),
+            )
+        return RowBitmap(data_series.index, mask, scores)
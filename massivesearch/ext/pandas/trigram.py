@@ -0,0 +1,112 @@
+"""Trigram index text search engine for Pandas."""
+
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+from massivesearch.ext.pandas.bitmap import RowBitmap
+from massivesearch.ext.pandas.postings import (
+    PandasPostingsIndexMixin,
+    Postings,
+    sorted_unique_pairs,
+)
+from massivesearch.ext.pandas.text import (
+    PandasTextSearchEngine,
+    PandasTextSearchEngineArguments,
+)
+
+NGRAM = 3
+_REGEX_SPECIAL = frozenset(".^$*+?{}[]\\|()")
+_BUILD_CHUNK_ROWS = 100_000
+
+
+def trigram_keys(text: str) -> np.ndarray:
+    """Return the integer keys of every trigram of the text.
+
+    Each code point fits in 21 bits, so a trigram packs into one int64.
+    """
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    return (codes[:-2] << 42) | (codes[1:-1] << 21) | codes[2:]
+
+
+def _chunk_pairs(texts: pd.Series, first_row: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the sorted unique (trigram key, row position) pairs of a chunk."""
+    lengths = texts.str.len().to_numpy(dtype=np.int64)
+    keys = trigram_keys("\0".join(texts.tolist()))
+    separators = np.cumsum(lengths + 1)[:-1] - 1
+    is_separator = np.zeros(len(keys) + NGRAM - 1, dtype=bool)
+    is_separator[separators] = True
+    valid = ~(is_separator[:-2] | is_separator[1:-1] | is_separator[2:])
+
+    rows = np.repeat(np.arange(first_row, first_row + len(texts)), lengths + 1)
+    pair_keys, pair_rows = sorted_unique_pairs(keys[valid], rows[: len(keys)][valid])
+    return pair_keys, pair_rows
+
+
+class PandasTrigramSearchEngine(PandasPostingsIndexMixin, PandasTextSearchEngine):
+    """Substring text search engine backed by a trigram index.
+
+    Candidate rows contain every trigram of a keyword and are verified with
+    an exact substring check, so results match the `contains` strategy of
+    `PandasTextSearchEngine`. Keywords with regex metacharacters fall back to
+    the regex scan of that engine, and keywords shorter than a trigram are
+    checked against every row.
+    """
+
+    matching_strategy: Literal["contains"] = "contains"
+
+    def search_cost(self) -> float:
+        """Return the estimated relative cost of a search."""
+        return 0.2
+
+    def build_postings(self) -> Postings:
+        """Build the trigram index from the data file."""
+        texts = self.load_normalized().reset_index(drop=True).fillna("")
+        chunks = [
+            _chunk_pairs(texts.iloc[start : start + _BUILD_CHUNK_ROWS], start)
+            for start in range(0, len(texts), _BUILD_CHUNK_ROWS)
+        ]
+        keys = np.concatenate([keys for keys, _ in chunks] or [np.empty(0, np.int64)])
+        rows = np.concatenate([rows for _, rows in chunks] or [np.empty(0, np.int64)])
+        return Postings.from_pairs(keys, rows, len(texts))
+
+    async def search(
+        self,
+        arguments: PandasTextSearchEngineArguments,
+    ) -> RowBitmap:
+        """Search for text values containing any keyword."""
+        return await self.run_blocking(self.search_blocking, arguments)
+
+    def search_blocking(
+        self,
+        arguments: PandasTextSearchEngineArguments,
+    ) -> RowBitmap:
+        """Search for text values containing any keyword on the calling thread."""
+        keywords = [self.normalize(keyword) for keyword in arguments.keywords] or [""]
+        if self.scoring or any(
+            _REGEX_SPECIAL.intersection(keyword) for keyword in keywords
+        ):
+            return super().search_blocking(arguments)
+
+        data_series = self.load_normalized()
+        mask = np.zeros(len(data_series), dtype=bool)
+        for keyword in keywords:
+            mask[self.keyword_positions(data_series, keyword)] = True
+        return RowBitmap(data_series.index, mask)
+
+    def keyword_positions(self, data_series: pd.Series, keyword: str) -> np.ndarray:
+        """Return the row positions containing a normalized keyword."""
+        if _REGEX_SPECIAL.intersection(keyword):
+            return super().keyword_positions(data_series, keyword)
+        if len(keyword) < NGRAM:
+            candidates = np.arange(len(data_series))
+        else:
+            postings = self.load_postings()
+            candidates = postings.intersect(np.unique(trigram_keys(keyword)))
+        verified = (
+            data_series.iloc[candidates]
+            .str.contains(keyword, regex=False)
+            .to_numpy(dtype=bool, na_value=False)
+        )
+        return candidates[verified]
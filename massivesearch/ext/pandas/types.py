@@ -1,15 +1,76 @@
 """Types for pandas search engine."""
 
+from typing import ClassVar
+
 import pandas as pd
-from pydantic import BaseModel
+from pandas.api.types import pandas_dtype
+from pydantic import BaseModel, Field, field_validator
+
+from massivesearch.ext.pandas.bitmap import RowBitmap
+from massivesearch.ext.pandas.cache import DataVersion, data_version
+from massivesearch.ext.pandas.source import (
+    FileFormat,
+    infer_file_format,
+    load_dataset,
+)
+
+PandasSearchResult = pd.Index | RowBitmap
 
 
 class PandasBaseSearchEngineMixin(BaseModel):
-    """Pandas base search engine."""
+    """Pandas base search engine.
+
+    Only `column_name` is read from the file. Its dtype can be pinned with
+    `dtype` in the spec, e.g. `category` for low-cardinality text or
+    `float32` for prices; otherwise the engine's `default_dtype` is used.
+    CSV, Parquet and Arrow IPC files are supported, see `load_dataset`.
+    """
+
+    default_dtype: ClassVar[str | None] = None
 
     file_path: str
     column_name: str
+    dtype: str | None = None
+    file_format: FileFormat | None = Field(
+        default=None,
+        description="File format, inferred from the extension when not set.",
+    )
+
+    @field_validator("dtype")
+    @classmethod
+    def dtype_validate(cls, value: str | None) -> str | None:
+        """Validate the dtype is understood by pandas."""
+        if value is None:
+            return value
+        try:
+            pandas_dtype(value)
+        except TypeError as e:
+            msg = f"Unknown dtype '{value}': {e}"
+            raise ValueError(msg) from e
+        return value
+
+    def load_columns(self) -> list[str]:
+        """Return the columns the search engine reads."""
+        return [self.column_name]
+
+    def load_dtypes(self) -> dict[str, str]:
+        """Return the pinned dtypes of the loaded columns."""
+        dtype = self.dtype or self.default_dtype
+        return {self.column_name: dtype} if dtype else {}
+
+    def resolved_file_format(self) -> FileFormat:
+        """Return the configured or inferred file format."""
+        return self.file_format or infer_file_format(self.file_path)
 
     def load_df(self) -> pd.DataFrame:
-        """Load data for the search engine."""
-        return pd.read_csv(self.file_path)
+        """Load data for the search engine from the shared dataset cache."""
+        return load_dataset(
+            self.file_path,
+            self.load_columns(),
+            self.load_dtypes(),
+            self.file_format,
+        )
+
+    def data_version(self) -> DataVersion:
+        """Return the version token of the data file."""
+        return data_version(self.file_path)
@@ -1,37 +1,82 @@
 """Model module."""
 
 import json
+from collections.abc import AsyncIterator
 
+import httpx
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
-from openai import AsyncAzureOpenAI
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+from pydantic import Field, PrivateAttr
 
 from massivesearch.model.base import BaseAIClient
 
 
 class AzureOpenAIClient(BaseAIClient):
-    """A client wrapper for interacting with the Azure OpenAI service."""
+    """A client wrapper for interacting with the Azure OpenAI service.
+
+    The credential and the underlying HTTP client are created on first use and
+    reused by every later call, keeping connections alive between requests.
+    Call `aclose` to release them.
+    """
 
     endpoint: str = "https://smarttsg-gpt.openai.azure.com/"
     api_version: str = "2024-08-01-preview"
     model: str = "gpt-4o"
     temperature: float
+    api_key: str | None = Field(
+        default=None,
+        description="API key, Microsoft Entra ID is used when not set.",
+    )
+    max_connections: int = Field(default=100, gt=0)
+    max_keepalive_connections: int = Field(default=20, ge=0)
+    keepalive_expiry: float = Field(default=30.0, ge=0)
 
-    async def response(
-        self,
-        messages: list,
-        format_model: type,
-    ) -> dict:
-        """Get a response from the Azure OpenAI service."""
+    _credential: DefaultAzureCredential | None = PrivateAttr(default=None)
+    _client: AsyncAzureOpenAI | None = PrivateAttr(default=None)
+
+    def _get_client(self) -> AsyncAzureOpenAI:
+        """Return the shared Azure OpenAI client, creating it on first use."""
+        if self._client is not None:
+            return self._client
+
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+        if self.api_key:
+            self._client = AsyncAzureOpenAI(
+                azure_deployment=self.model,
+                azure_endpoint=self.endpoint,
+                api_version=self.api_version,
+                api_key=self.api_key,
+                http_client=http_client,
+            )
+            return self._client
+
+        self._credential = DefaultAzureCredential()
         token_provider = get_bearer_token_provider(
-            DefaultAzureCredential(),
+            self._credential,
             "https://cognitiveservices.azure.com/.default",
         )
-        client = AsyncAzureOpenAI(
+        self._client = AsyncAzureOpenAI(
             azure_deployment=self.model,
             azure_endpoint=self.endpoint,
             api_version=self.api_version,
             azure_ad_token_provider=token_provider,
+            http_client=http_client,
         )
+        return self._client
+
+    async def response(
+        self,
+        messages: list,
+        format_model: type,
+    ) -> dict:
+        """Get a response from the Azure OpenAI service."""
+        client = self._get_client()
         r = await client.beta.chat.completions.parse(
             model=self.model,
             messages=messages,
@@ -50,3 +95,29 @@ class AzureOpenAIClient(BaseAIClient):
         except Exception as e:
             msg = f"Unexpected error: {e}"
             raise ValueError(msg) from e
+
+    async def response_stream(
+        self,
+        messages: list,
+        format_model: type,
+    ) -> AsyncIterator[str]:
+        """Stream the JSON text of a response from the Azure OpenAI service."""
+        client = self._get_client()
+        async with client.beta.chat.completions.stream(
+            model=self.model,
+            messages=messages,
+            response_format=format_model,
+            temperature=self.temperature,
+        ) as stream:
+            async for event in stream:
+                if event.type == "content.delta" and event.delta:
+                    yield event.delta
+
+    async def aclose(self) -> None:
+        """Close the HTTP client and the credential."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+        if self._credential is not None:
+            self._credential.close()
+            self._credential = None
@@ -1,6 +1,8 @@
 """Base model."""
 
+import json
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 from pydantic import BaseModel
 
@@ -11,3 +13,18 @@ class BaseAIClient(BaseModel, ABC):
     @abstractmethod
     async def response(self, messages: list, format_model: type[BaseModel]) -> dict:
         """Get a response from the model."""
+
+    async def response_stream(
+        self,
+        messages: list,
+        format_model: type[BaseModel],
+    ) -> AsyncIterator[str]:
+        """Stream the JSON text of a response from the model in chunks.
+
+        The default yields the whole response of `response` at once. Clients
+        of models that can stream structured output override this.
+        """
+        yield json.dumps(await self.response(messages, format_model))
+
+    async def aclose(self) -> None:
+        """Release the resources held by the client."""
@@ -1,7 +1,9 @@
 """Massive Search Pipe Module."""
 
 from massivesearch.pipe.pipe import MassiveSearchPipe
+from massivesearch.pipe.result import MassiveSearchResult
 
 __all__ = [
     "MassiveSearchPipe",
+    "MassiveSearchResult",
 ]
@@ -0,0 +1,132 @@
+"""Searches shared by a batch of queries."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any
+
+from pydantic import BaseModel
+
+from massivesearch.pipe.spec_index import MassiveSearchIndex
+
+type SearchFunc = Callable[[MassiveSearchIndex, BaseModel], Coroutine[Any, Any, Any]]
+type SearchManyFunc = Callable[
+    [MassiveSearchIndex, list[BaseModel]],
+    Coroutine[Any, Any, list],
+]
+
+
+async def _as_list(search: Awaitable[Any]) -> list:
+    """Await a single search as a batch of one."""
+    return [await search]
+
+
+class SearchBatch:
+    """Distinct searches of a batch of queries, run once per index.
+
+    Searches are added while the query plans are turned into tasks, and
+    `start` then runs the distinct arguments of each index with one
+    `search_many` call, or a plain search when there is only one. A search
+    awaited by several tasks is shielded, so cancelling one query never
+    cancels a search another query needs; once every query awaiting it is
+    done or cancelled, it is cancelled. When a batched call fails, each
+    search falls back to a single search, so the error only reaches the
+    queries with the failing arguments. The fallback of an argument set runs
+    once, however many queries share it.
+    """
+
+    def __init__(self, search: SearchFunc, search_many: SearchManyFunc) -> None:
+        """Initialize the batch with the single and batched search functions."""
+        self._search = search
+        self._search_many = search_many
+        self._indexs: dict[str, MassiveSearchIndex] = {}
+        self._arguments: dict[str, list[BaseModel]] = {}
+        self._positions: dict[tuple[str, str], int] = {}
+        self._consumers: dict[str, int] = {}
+        self._waiting: dict[tuple[str, int | None], int] = {}
+        self._searches: dict[str, Awaitable[list]] = {}
+        self._fallbacks: dict[tuple[str, int], asyncio.Task] = {}
+
+    def add(
+        self,
+        index: MassiveSearchIndex,
+        arguments: BaseModel,
+    ) -> Coroutine[Any, Any, Any]:
+        """Add a search and return a coroutine of its result."""
+        self._indexs[index.name] = index
+        key = (index.name, arguments.model_dump_json())
+        if key not in self._positions:
+            arguments_list = self._arguments.setdefault(index.name, [])
+            self._positions[key] = len(arguments_list)
+            arguments_list.append(arguments)
+        position = self._positions[key]
+        self._consumers[index.name] = self._consumers.get(index.name, 0) + 1
+        for waiting_key in ((index.name, None), (index.name, position)):
+            self._waiting[waiting_key] = self._waiting.get(waiting_key, 0) + 1
+        return self._result(index, arguments, position)
+
+    def start(self) -> None:
+        """Start one batched search per index.
+
+        The only search of an index with a single consumer is awaited by that
+        consumer directly, so cancelling it cancels the search.
+        """
+        for name, arguments in self._arguments.items():
+            if name in self._searches:
+                continue
+            search: Awaitable[list]
+            if len(arguments) > 1:
+                search = self._search_many(self._indexs[name], arguments)
+            else:
+                search = _as_list(self._search(self._indexs[name], arguments[0]))
+            if len(arguments) > 1 or self._consumers[name] > 1:
+                search = asyncio.create_task(search)
+            self._searches[name] = search
+
+    async def _result(
+        self,
+        index: MassiveSearchIndex,
+        arguments: BaseModel,
+        position: int,
+    ) -> Any:  # noqa: ANN401
+        """Return the result of a search from its batched search."""
+        search = self._searches[index.name]
+        if not isinstance(search, asyncio.Task):
+            return (await search)[0]
+        try:
+            return await self._shared_result(search, index, arguments, position)
+        finally:
+            self._release((index.name, None), search)
+            self._release(
+                (index.name, position),
+                self._fallbacks.get((index.name, position)),
+            )
+
+    async def _shared_result(
+        self,
+        search: asyncio.Task,
+        index: MassiveSearchIndex,
+        arguments: BaseModel,
+        position: int,
+    ) -> Any:  # noqa: ANN401
+        """Return the result of a search from a batched search task."""
+        if len(self._arguments[index.name]) == 1:
+            return (await asyncio.shield(search))[0]
+        try:
+            results = await asyncio.shield(search)
+        except Exception:  # noqa: BLE001
+            fallback = self._fallbacks.get((index.name, position))
+            if fallback is None:
+                fallback = asyncio.create_task(self._search(index, arguments))
+                self._fallbacks[index.name, position] = fallback
+            return await asyncio.shield(fallback)
+        return results[position]
+
+    def _release(
+        self,
+        key: tuple[str, int | None],
+        task: asyncio.Task | None,
+    ) -> None:
+        """Drop a waiting query, cancelling the task once no query waits."""
+        self._waiting[key] -= 1
+        if self._waiting[key] == 0 and task is not None:
+            task.cancel()
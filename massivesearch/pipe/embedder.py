@@ -0,0 +1,101 @@
+"""Query embedders."""
+
+import hashlib
+import re
+from abc import ABC, abstractmethod
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+_WORD_PATTERN = re.compile(r"\w+")
+_MIN_PLURAL_LENGTH = 3
+_STOP_WORDS = frozenset(
+    {"a", "about", "an", "and", "are", "at", "by", "dollar", "euro", "for"}
+    | {"from", "in", "is", "of", "on", "or", "than", "the", "to", "usd", "with"},
+)
+_LESS_THAN = {"below", "cheaper", "fewer", "less", "max", "maximum", "most", "under"}
+_GREATER_THAN = {
+    "above",
+    "beyond",
+    "greater",
+    "least",
+    "min",
+    "minimum",
+    "more",
+    "over",
+}
+_NEGATIONS = {"except", "excluding", "never", "no", "non", "nor", "not", "without"}
+_TERM_ALIASES = (
+    dict.fromkeys(_LESS_THAN, "lt")
+    | dict.fromkeys(_GREATER_THAN, "gt")
+    | dict.fromkeys(_NEGATIONS, "not")
+)
+GUARD_TERMS = frozenset(_TERM_ALIASES.values())
+
+
+def query_terms(text: str) -> list[str]:
+    """Return the content terms of a query.
+
+    Words are casefolded and lose a plural "s", stop words are dropped, and
+    comparison and negation words become the shared terms of `GUARD_TERMS`,
+    so "max 30 dollars" and "under $30" both give ["lt", "30"].
+    """
+    terms = []
+    for word in _WORD_PATTERN.findall(text.casefold()):
+        term = _TERM_ALIASES.get(word, word)
+        if (
+            len(term) > _MIN_PLURAL_LENGTH
+            and term.endswith("s")
+            and not term.endswith("ss")
+        ):
+            term = term[:-1]
+        if term not in _STOP_WORDS:
+            terms.append(term)
+    return terms
+
+
+class BaseEmbedder(BaseModel, ABC):
+    """Base class for query embedders."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed the texts into an L2-normalized float32 array of shape (n, dim)."""
+
+
+class HashingEmbedder(BaseEmbedder):
+    """Local embedder hashing word and character n-grams into a fixed dimension.
+
+    Words are the `query_terms` of a text. It needs no model download or
+    network access, and captures reordered and slightly reworded queries
+    rather than true synonyms.
+    """
+
+    dim: int = Field(default=256, gt=0)
+    char_ngram: int = Field(default=3, gt=0)
+
+    def _features(self, text: str) -> list[str]:
+        """Return the hashed features of a text."""
+        words = query_terms(text)
+        features = [f"w:{word}" for word in words]
+        for word in words:
+            padded = f" {word} "
+            features.extend(
+                f"c:{padded[i : i + self.char_ngram]}"
+                for i in range(max(len(padded) - self.char_ngram + 1, 1))
+            )
+        return features
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed the texts with signed feature hashing."""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(
+                    hashlib.blake2b(feature.encode(), digest_size=8).digest(),
+                )
+                sign = 1.0 if digest & 1 else -1.0
+                vectors[row, (digest >> 1) % self.dim] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
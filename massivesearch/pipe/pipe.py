@@ -1,9 +1,13 @@
 """Pipe."""
 
 import asyncio
+import itertools
+import json
+import time
 import typing
+from collections.abc import AsyncIterator, Coroutine
 from pathlib import Path
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, TypeVar, cast
 
 import yaml
 from pydantic import BaseModel, Field, ValidationError, create_model
@@ -12,13 +16,25 @@ from massivesearch.aggregator.base import (
     BaseAggregator,
     MassiveSearchTasks,
 )
+from massivesearch.pipe.batch import SearchBatch
+from massivesearch.pipe.plan_cache import (
+    BasePlanCache,
+    create_plan_cache,
+    plan_fingerprint,
+)
+from massivesearch.pipe.plan_stream import QueryPlanStreamParser
 from massivesearch.pipe.prompt import PIPE_STSTEM_PROMPT_TEMPLATE
 from massivesearch.pipe.registry import MassiveSearchRegistry
+from massivesearch.pipe.result import MassiveSearchResult
 from massivesearch.pipe.spec_index import MassiveSearchIndex
+from massivesearch.pipe.stages import PendingSearch, SearchStages
 from massivesearch.pipe.validator import (
     validate_pipe_search_result_index,
     validate_spec,
 )
+from massivesearch.search_engine.cache import SearchResultCache
+from massivesearch.search_engine.executor import SearchExecutor
+from massivesearch.search_engine.scheduler import SearchScheduler
 
 if typing.TYPE_CHECKING:
     from massivesearch.model.base import BaseAIClient
@@ -29,13 +45,30 @@ MassiveSearchResT = TypeVar("MassiveSearchResT")
 class MassiveSearchPipe(MassiveSearchRegistry, Generic[MassiveSearchResT]):
     """Massive Search Pipe."""
 
-    def __init__(self, *, prompt_template: str | None = None) -> None:
-        """Initialize the Massive Search Pipe."""
+    def __init__(
+        self,
+        *,
+        prompt_template: str | None = None,
+        plan_cache: BasePlanCache | None = None,
+        stream_plan: bool = False,
+    ) -> None:
+        """Initialize the Massive Search Pipe.
+
+        `plan_cache` caches the query plans generated by the AI client. It can
+        also be configured with the `plan_cache` section of the spec. With
+        `stream_plan`, the plan is streamed from the AI client and the
+        searches of each sub-query start as soon as it is generated.
+        """
         super().__init__()
 
         self.indexs: list[MassiveSearchIndex] = []
         self.aggregator: BaseAggregator | None = None
         self.ai_client: BaseAIClient | None = None
+        self.executor: SearchExecutor | None = None
+        self.plan_cache = plan_cache
+        self.stream_plan = stream_plan
+        self.result_cache: SearchResultCache | None = None
+        self.scheduler: SearchScheduler | None = None
 
         if prompt_template and "{index_context}" not in prompt_template:
             missing_result_type_msg = (
@@ -46,7 +79,7 @@ class MassiveSearchPipe(MassiveSearchRegistry, Generic[MassiveSearchResT]):
 
         self.prompt: str = ""
         self.format_model: type[BaseModel] | None = None
-        self.serach_query: list[dict] = []
+        self._plan_fingerprint: str | None = None
 
     def build_from_file(self, file_path: str) -> None:
         """Build the spec from a path."""
@@ -92,6 +125,14 @@ class MassiveSearchPipe(MassiveSearchRegistry, Generic[MassiveSearchResT]):
             self.registered_ai_client_types,
         )
 
+        self.executor = SearchExecutor(**spec.get("executor", {}))
+        if "plan_cache" in spec:
+            self.plan_cache = create_plan_cache(spec["plan_cache"])
+        if "result_cache" in spec:
+            self.result_cache = SearchResultCache(**spec["result_cache"])
+        if "scheduler" in spec:
+            self.scheduler = SearchScheduler(**spec["scheduler"])
+
         indexs_spec = spec["indexs"]
         for index_spec in indexs_spec:
             name = index_spec.get("name")
@@ -102,6 +143,7 @@ class MassiveSearchPipe(MassiveSearchRegistry, Generic[MassiveSearchResT]):
             search_engine = self.registered_search_engine_types[search_engine_type](
                 **search_engine_spec,
             )
+            search_engine.bind_executor(self.executor)
             self.indexs.append(
                 MassiveSearchIndex(
                     name=name,
@@ -129,8 +171,12 @@ class MassiveSearchPipe(MassiveSearchRegistry, Generic[MassiveSearchResT]):
 
         validate_pipe_search_result_index(self.indexs, self.aggregator, pipe_res_type)
 
+        for search_index in self.indexs:
+            search_index.search_engine.prepare()
+
         self._build_prompt()
         self._build_format_model()
+        self._plan_fingerprint = None
 
     def _build_prompt(self) -> None:
         """Build the prompt for the spec."""
@@ -267,6 +313,28 @@ class MassiveSearchPipe(MassiveSearchRegistry, Generic[MassiveSearchResT]):
             },
         ]
 
+    def _get_plan_fingerprint(self) -> str:
+        """Return the fingerprint of the prompt and format model."""
+        if self._plan_fingerprint is None:
+            if not self.format_model:
+                msg = "Format model is not set. Cannot fingerprint plans."
+                raise ValueError(msg)
+            self._plan_fingerprint = plan_fingerprint(self.prompt, self.format_model)
+        return self._plan_fingerprint
+
+    def _get_cached_plan(self, query: str) -> list[dict] | None:
+        """Return the cached sub-queries of the query if they are still valid."""
+        if not self.plan_cache or not self.format_model:
+            return None
+        plan = self.plan_cache.get(query, self._get_plan_fingerprint())
+        if plan is None:
+            return None
+        try:
+            self.format_model(**plan)
+        except ValidationError:
+            return None
+        return plan["queries"]
+
     async def build_query(self, query: str) -> list[dict]:
         """Generate the query based on the spec."""
         if not self.ai_client:
@@ -275,14 +343,16 @@ class MassiveSearchPipe(MassiveSearchRegistry, Generic[MassiveSearchResT]):
         if not self.format_model:
             msg = "Format model is not set. Cannot build query."
             raise ValueError(msg)
+        cached_queries = self._get_cached_plan(query)
+        if cached_queries is not None:
+            return cached_queries
         try:
             response = await self.ai_client.response(
                 self._build_messages(query),
                 self.format_model,
             )
             self.format_model(**response)
-            self.serach_query = response["queries"]
-            return response["queries"]
+            queries = response["queries"]
         except KeyError:
             msg = "Failed to parse response: 'queries' key not found."
             raise ValueError(msg) from None
@@ -293,29 +363,394 @@ class MassiveSearchPipe(MassiveSearchRegistry, Generic[MassiveSearchResT]):
             msg = f"Unexpected error: {e}"
             raise ValueError(msg) from e
 
+        if self.plan_cache:
+            self.plan_cache.set(query, self._get_plan_fingerprint(), response)
+        return queries
+
     async def search_task(self, query: str) -> MassiveSearchTasks:
         """Search for the query."""
+        _, search_tasks = await self._plan_search_tasks(query, [])
+        return search_tasks
+
+    async def _plan_search_tasks(
+        self,
+        query: str,
+        search_timings: list[dict[str, float]],
+    ) -> tuple[list[dict], MassiveSearchTasks]:
+        """Generate the sub-queries of the query and start their searches."""
+        if self.stream_plan:
+            return await self._stream_search_tasks(query, search_timings)
         search_queries = await self.build_query(query)
+        return search_queries, self._create_search_tasks(search_queries, search_timings)
+
+    async def _stream_search_tasks(
+        self,
+        query: str,
+        search_timings: list[dict[str, float]],
+    ) -> tuple[list[dict], MassiveSearchTasks]:
+        """Stream the plan of the query, starting searches as sub-queries arrive.
+
+        Every sub-query is validated before its searches start, so generation
+        and search overlap. Searches already started are cancelled when the
+        plan turns out to be invalid.
+        """
+        cached_queries = self._get_cached_plan(query)
+        if cached_queries is not None:
+            return cached_queries, self._create_search_tasks(
+                cached_queries,
+                search_timings,
+            )
+
         search_tasks: MassiveSearchTasks = []
-        for search_query in search_queries:
-            result = {}
-            for index in self.indexs:
-                search_engine_arguments = index.search_engine_arguments_type(
-                    **search_query[index.name],
+        try:
+            response = await self._read_plan_stream(query, search_tasks, search_timings)
+        except BaseException:
+            self._cancel_search_tasks(search_tasks)
+            raise
+
+        if self.plan_cache:
+            self.plan_cache.set(query, self._get_plan_fingerprint(), response)
+        return response["queries"], search_tasks
+
+    async def _read_plan_stream(
+        self,
+        query: str,
+        search_tasks: MassiveSearchTasks,
+        search_timings: list[dict[str, float]],
+    ) -> dict:
+        """Read the streamed plan into `search_tasks` and return the response."""
+        if not self.ai_client:
+            msg = "AI client is not set. Cannot build query."
+            raise ValueError(msg)
+        if not self.format_model:
+            msg = "Format model is not set. Cannot build query."
+            raise ValueError(msg)
+
+        (query_format_model,) = typing.get_args(
+            self.format_model.model_fields["queries"].annotation,
+        )
+        parser = QueryPlanStreamParser()
+        stages = SearchStages(self._search, self._matches_nothing)
+        started: dict[tuple[str, str], PendingSearch] = {}
+        try:
+            async for chunk in self.ai_client.response_stream(
+                self._build_messages(query),
+                self.format_model,
+            ):
+                for search_query in parser.feed(chunk):
+                    query_format_model(**search_query)
+                    search_tasks.append(
+                        self._add_searches(
+                            stages,
+                            search_query,
+                            started,
+                            search_timings,
+                        ),
+                    )
+                    stages.start()
+            response = json.loads(parser.text)
+            self.format_model(**response)
+            streamed = len(response["queries"]) == len(search_tasks)
+        except KeyError:
+            msg = "Failed to parse response: 'queries' key not found."
+            raise ValueError(msg) from None
+        except ValidationError as e:
+            msg = f"Model didn't respond with a valid query: {e}"
+            raise ValueError(msg) from e
+        except Exception as e:
+            msg = f"Unexpected error: {e}"
+            raise ValueError(msg) from e
+
+        if not streamed:
+            msg = "Failed to parse response: streamed queries are incomplete."
+            raise ValueError(msg)
+        return response
+
+    @staticmethod
+    def _cancel_search_tasks(search_tasks: MassiveSearchTasks) -> None:
+        """Cancel the searches of every sub-query."""
+        for tasks in search_tasks:
+            for task in tasks.values():
+                task.cancel()
+
+    def _create_search_tasks(
+        self,
+        search_queries: list[dict],
+        search_timings: list[dict[str, float]],
+        stages: SearchStages | None = None,
+    ) -> MassiveSearchTasks:
+        """Start the index searches of each sub-query.
+
+        Sub-queries often repeat the same arguments for an index, e.g. the same
+        price range in every OR branch. Each distinct (index, arguments) pair
+        is searched once and its task is shared by those sub-queries, and the
+        distinct arguments of an index are passed to one `search_many` call.
+        Searches run in stages of increasing cost, so a costly search is
+        skipped when the cheaper ones already rule its sub-queries out. The
+        search time of each index is recorded into `search_timings`, one dict
+        per sub-query. Given `stages` are shared with other plans and started
+        by the caller.
+        """
+        own_stages = stages is None
+        if stages is None:
+            batch = SearchBatch(self._search, self._search_many)
+            stages = SearchStages(batch.add, self._matches_nothing, batch.start)
+        started: dict[tuple[str, str], PendingSearch] = {}
+        search_tasks = [
+            self._add_searches(stages, search_query, started, search_timings)
+            for search_query in search_queries
+        ]
+        if own_stages:
+            stages.start()
+        return search_tasks
+
+    def _add_searches(
+        self,
+        stages: SearchStages,
+        search_query: dict,
+        started: dict[tuple[str, str], PendingSearch],
+        search_timings: list[dict[str, float]],
+    ) -> dict[str, asyncio.Task]:
+        """Add the index searches of one sub-query to the stages."""
+        timings: dict[str, float] = {}
+        search_timings.append(timings)
+        return stages.add(
+            [
+                (
+                    index,
+                    index.search_engine_arguments_type(**search_query[index.name]),
                 )
-                search_result = asyncio.create_task(
-                    index.search_engine.search(
-                        search_engine_arguments,
-                    ),
+                for index in self.indexs
+            ],
+            started,
+            timings,
+        )
+
+    def _matches_nothing(self, results: list[Any]) -> bool | None:
+        """Return whether the aggregator rules out a sub-query with these results."""
+        if not self.aggregator:
+            return None
+        return self.aggregator.matches_nothing(results)
+
+    def _search(
+        self,
+        index: MassiveSearchIndex,
+        arguments: BaseModel,
+    ) -> Coroutine[Any, Any, Any]:
+        """Return the search of an index, served by the result cache if set.
+
+        With a scheduler, searches that reach the engine are batched with the
+        concurrent searches of other requests.
+        """
+        if self.result_cache:
+            return self.result_cache.search(
+                index.search_engine,
+                arguments,
+                self.scheduler.search if self.scheduler else None,
+            )
+        if self.scheduler:
+            return self.scheduler.search(index.search_engine, arguments)
+        return index.search_engine.search(arguments)
+
+    async def _search_many(
+        self,
+        index: MassiveSearchIndex,
+        arguments: list[BaseModel],
+    ) -> list:
+        """Search an index for several argument sets in one call.
+
+        With a result cache or a scheduler, each search goes through them
+        instead, and the scheduler batches them with concurrent requests.
+        """
+        if self.result_cache or self.scheduler:
+            return list(
+                await asyncio.gather(
+                    *(self._search(index, item) for item in arguments),
+                ),
+            )
+        return await index.search_engine.search_many(arguments)
+
+    async def run(self, query: str) -> MassiveSearchResult[MassiveSearchResT]:
+        """Execute the query and return the request-scoped result."""
+        if not self.aggregator:
+            msg = "Aggregator is not set. Cannot run query."
+            raise ValueError(msg)
+
+        start = time.perf_counter()
+        search_timings: list[dict[str, float]] = []
+        search_queries, search_tasks = await self._plan_search_tasks(
+            query,
+            search_timings,
+        )
+        build_query_end = time.perf_counter()
+
+        result = await self.aggregator.aggregate(search_tasks)
+        end = time.perf_counter()
+
+        return MassiveSearchResult[MassiveSearchResT](
+            query=query,
+            queries=search_queries,
+            search_results=self._search_results(search_tasks),
+            search_timings=search_timings,
+            timings={
+                "build_query": build_query_end - start,
+                "search_and_aggregate": end - build_query_end,
+                "total": end - start,
+            },
+            result=result,
+        )
+
+    @staticmethod
+    def _search_results(search_tasks: MassiveSearchTasks) -> list[dict[str, Any]]:
+        """Return the results of the finished searches of each sub-query."""
+        return [
+            {
+                name: task.result()
+                for name, task in tasks.items()
+                if task.done() and not task.cancelled() and not task.exception()
+            }
+            for tasks in search_tasks
+        ]
+
+    async def run_many(
+        self,
+        queries: list[str],
+        concurrency: int = 8,
+    ) -> list[MassiveSearchResult[MassiveSearchResT] | BaseException]:
+        """Execute a batch of queries and return their results in input order.
+
+        At most `concurrency` AI client calls are in flight, and identical
+        queries are planned once. The distinct queries are then searched and
+        aggregated in windows of `concurrency`, in input order, while the
+        later queries are still being planned. Each distinct (index,
+        arguments) pair of a window is searched once, with the distinct
+        arguments of an index passed to one `search_many` call. A query that
+        fails gets its exception in place of a result without affecting the
+        others. Results do not keep the search results of their sub-queries,
+        so a large batch does not hold every index result in memory. Timings
+        are those of the query's window.
+        """
+        if not self.aggregator:
+            msg = "Aggregator is not set. Cannot run query."
+            raise ValueError(msg)
+        if concurrency < 1:
+            msg = f"Concurrency must be at least 1, got {concurrency}."
+            raise ValueError(msg)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        plans = {
+            query: asyncio.create_task(self._build_query_bounded(query, semaphore))
+            for query in dict.fromkeys(queries)
+        }
+        outcomes: dict[str, MassiveSearchResult[MassiveSearchResT] | BaseException]
+        outcomes = {}
+        try:
+            for window in itertools.batched(plans, concurrency, strict=False):
+                outcomes |= await self._run_window(
+                    self.aggregator,
+                    {query: plans[query] for query in window},
                 )
-                result[index.name] = search_result
-            search_tasks.append(result)
+        finally:
+            for plan in plans.values():
+                plan.cancel()
+        return [outcomes[query] for query in queries]
 
-        return search_tasks
+    async def _run_window(
+        self,
+        aggregator: BaseAggregator,
+        plans: dict[str, asyncio.Task[list[dict]]],
+    ) -> dict[str, MassiveSearchResult[MassiveSearchResT] | BaseException]:
+        """Search and aggregate a window of `run_many` once it is planned."""
+        start = time.perf_counter()
+        distinct_plans = await asyncio.gather(*plans.values(), return_exceptions=True)
+        build_query_end = time.perf_counter()
+
+        batch = SearchBatch(self._search, self._search_many)
+        stages = SearchStages(batch.add, self._matches_nothing, batch.start)
+        planned = {}
+        for query, plan in zip(plans, distinct_plans, strict=True):
+            if not isinstance(plan, BaseException):
+                search_timings: list[dict[str, float]] = []
+                search_tasks = self._create_search_tasks(plan, search_timings, stages)
+                planned[query] = (plan, search_tasks, search_timings)
+        stages.start()
+
+        aggregated = await asyncio.gather(
+            *(
+                aggregator.aggregate(search_tasks)
+                for _, search_tasks, _ in planned.values()
+            ),
+            return_exceptions=True,
+        )
+        end = time.perf_counter()
 
-    async def run(self, query: str) -> MassiveSearchResT:
-        """Execute the query and return the aggregated result."""
+        timings = {
+            "build_query": build_query_end - start,
+            "search_and_aggregate": end - build_query_end,
+            "total": end - start,
+        }
+        outcomes: dict[str, MassiveSearchResult[MassiveSearchResT] | BaseException]
+        outcomes = {
+            query: plan
+            for query, plan in zip(plans, distinct_plans, strict=True)
+            if isinstance(plan, BaseException)
+        }
+        for (query, (search_queries, _, search_timings)), result in zip(
+            planned.items(),
+            aggregated,
+            strict=True,
+        ):
+            outcomes[query] = (
+                result
+                if isinstance(result, BaseException)
+                else MassiveSearchResult[MassiveSearchResT](
+                    query=query,
+                    queries=search_queries,
+                    search_results=[],
+                    search_timings=search_timings,
+                    timings=timings,
+                    result=cast("MassiveSearchResT", result),
+                )
+            )
+        return outcomes
+
+    async def _build_query_bounded(
+        self,
+        query: str,
+        semaphore: asyncio.Semaphore,
+    ) -> list[dict]:
+        """Generate the query once the semaphore admits another AI client call."""
+        async with semaphore:
+            return await self.build_query(query)
+
+    async def run_stream(self, query: str) -> AsyncIterator[Any]:
+        """Execute the query and yield aggregated results as sub-queries finish.
+
+        What is yielded depends on the aggregator, see
+        `BaseAggregator.aggregate_stream`. Searches still running when the
+        caller stops iterating are cancelled.
+        """
         if not self.aggregator:
             msg = "Aggregator is not set. Cannot run query."
             raise ValueError(msg)
-        return await self.aggregator.aggregate(await self.search_task(query))
+
+        _, search_tasks = await self._plan_search_tasks(query, [])
+        try:
+            async for result in self.aggregator.aggregate_stream(search_tasks):
+                yield result
+        except BaseException:
+            self._cancel_search_tasks(search_tasks)
+            raise
+
+    def close(self) -> None:
+        """Release the resources held by the pipe."""
+        if self.executor:
+            self.executor.shutdown()
+        if self.plan_cache:
+            self.plan_cache.close()
+
+    async def aclose(self) -> None:
+        """Release the resources held by the pipe, including the AI client."""
+        if self.ai_client:
+            await self.ai_client.aclose()
+        self.close()
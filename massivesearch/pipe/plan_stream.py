@@ -0,0 +1,90 @@
+"""Incremental parsing of streamed query plans."""
+
+import json
+
+QUERIES_KEY = "queries"
+
+
+class QueryPlanStreamParser:
+    """Parse the elements of the `queries` array from streamed JSON text.
+
+    Text is fed in arbitrary chunks, and each element of the top-level
+    `queries` array is returned as soon as its closing bracket arrives. Only
+    strings, nesting depth and the keys of the top-level object are tracked;
+    the full response is still parsed and validated once it is complete.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self.text = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_key: str | None = None
+        self._array_depth: int | None = None
+        self._element_start: int | None = None
+        self._done = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Add a chunk of text and return the queries it completes."""
+        self.text += chunk
+        queries = []
+        while self._position < len(self.text) and not self._done:
+            query = self._step(self.text[self._position])
+            self._position += 1
+            if query is not None:
+                queries.append(query)
+        return queries
+
+    def _step(self, char: str) -> dict | None:
+        """Consume one character, returning a query when it completes one."""
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                if self._depth == 1 and self._array_depth is None:
+                    self._last_key = json.loads(
+                        self.text[self._string_start : self._position + 1],
+                    )
+            return None
+
+        if char == '"':
+            self._in_string = True
+            self._string_start = self._position
+        elif char in "{[":
+            self._open(char)
+        elif char in "}]":
+            return self._close()
+        return None
+
+    def _open(self, char: str) -> None:
+        """Enter an object or array."""
+        if (
+            char == "["
+            and self._depth == 1
+            and self._array_depth is None
+            and self._last_key == QUERIES_KEY
+        ):
+            self._array_depth = self._depth + 1
+        elif self._array_depth is not None and self._depth == self._array_depth:
+            self._element_start = self._position
+        self._depth += 1
+
+    def _close(self) -> dict | None:
+        """Leave an object or array, returning a completed query."""
+        self._depth -= 1
+        if self._array_depth is None:
+            return None
+        if self._depth == self._array_depth - 1:
+            self._done = True
+            return None
+        if self._depth == self._array_depth and self._element_start is not None:
+            element = self.text[self._element_start : self._position + 1]
+            self._element_start = None
+            return json.loads(element)
+        return None
@@ -0,0 +1,33 @@
+"""Request-scoped result of a pipe run."""
+
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class MassiveSearchResult[ResT](BaseModel):
+    """Result of a single `MassiveSearchPipe.run` call.
+
+    Holds everything produced for one request, so one built pipe can serve
+    concurrent requests without sharing state between them.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    query: str
+    queries: list[dict] = Field(
+        description="Sub-queries generated by the AI client.",
+    )
+    search_results: list[dict[str, Any]] = Field(
+        description=(
+            "Search result of each index, per sub-query. Empty for the results "
+            "of `run_many`, which do not keep them."
+        ),
+    )
+    search_timings: list[dict[str, float]] = Field(
+        description="Search time in seconds of each index, per sub-query.",
+    )
+    timings: dict[str, float] = Field(
+        description="Time in seconds of each pipe stage.",
+    )
+    result: ResT
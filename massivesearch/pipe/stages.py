@@ -0,0 +1,181 @@
+"""Index searches started in stages of increasing cost."""
+
+import asyncio
+import inspect
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+
+from massivesearch.pipe.batch import SearchFunc
+from massivesearch.pipe.spec_index import MassiveSearchIndex
+
+type MatchesNothingFunc = Callable[[list[Any]], bool | None]
+
+
+@dataclass
+class PendingSearch:
+    """Task of a distinct (index, arguments) pair and the future starting it."""
+
+    index: MassiveSearchIndex
+    arguments: BaseModel
+    release: asyncio.Future[Awaitable[Any]]
+    task: asyncio.Task[Any]
+    timings: list[dict[str, float]]
+    consumers: int = 0
+
+
+async def _released_search(
+    name: str,
+    release: asyncio.Future[Awaitable[Any]],
+    timings: list[dict[str, float]],
+) -> Any:  # noqa: ANN401
+    """Await the search once released and record its duration in each timings."""
+    try:
+        search = await release
+    except asyncio.CancelledError:
+        if release.done() and not release.cancelled():
+            search = release.result()
+            if inspect.iscoroutine(search):
+                search.close()
+        raise
+    start = time.perf_counter()
+    try:
+        return await search
+    finally:
+        duration = time.perf_counter() - start
+        for sub_query_timings in timings:
+            sub_query_timings[name] = duration
+
+
+class SearchStages:
+    """Start the index searches of sub-queries in stages of increasing cost.
+
+    Every distinct (index, arguments) pair of a sub-query gets its task right
+    away, but a search only starts once the cheaper searches of one of its
+    sub-queries have finished and `matches_nothing` does not rule that
+    sub-query out. A search whose sub-queries are all ruled out never starts,
+    and its task is cancelled. When `matches_nothing([])` is None, nothing is
+    ever ruled out and every search starts at once.
+    """
+
+    def __init__(
+        self,
+        search: SearchFunc,
+        matches_nothing: MatchesNothingFunc,
+        start_batch: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the stages with the search and its batch start, if any."""
+        self._search = search
+        self._matches_nothing = matches_nothing
+        self._start_batch = start_batch
+        self._sub_queries: list[list[tuple[float, PendingSearch]]] = []
+        self._drivers: set[asyncio.Task] = set()
+
+    def add(
+        self,
+        searches: list[tuple[MassiveSearchIndex, BaseModel]],
+        started: dict[tuple[str, str], PendingSearch],
+        timings: dict[str, float],
+    ) -> dict[str, asyncio.Task]:
+        """Add the searches of one sub-query and return their tasks.
+
+        Searches in `started` are shared instead of added again, unless their
+        task was cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        sub_query = []
+        for index, arguments in searches:
+            key = (index.name, arguments.model_dump_json())
+            pending = started.get(key)
+            if pending is None or pending.task.cancelled():
+                release: asyncio.Future[Awaitable[Any]] = loop.create_future()
+                shared_timings: list[dict[str, float]] = []
+                pending = PendingSearch(
+                    index=index,
+                    arguments=arguments,
+                    release=release,
+                    task=asyncio.create_task(
+                        _released_search(index.name, release, shared_timings),
+                    ),
+                    timings=shared_timings,
+                )
+                started[key] = pending
+            pending.timings.append(timings)
+            pending.consumers += 1
+            sub_query.append((index.search_engine.search_cost(), pending))
+        self._sub_queries.append(sub_query)
+        return {pending.index.name: pending.task for _, pending in sub_query}
+
+    def start(self) -> None:
+        """Start the cheapest searches added so far and schedule the others."""
+        sub_queries, self._sub_queries = self._sub_queries, []
+        if self._matches_nothing([]) is None:
+            costs = [0.0]
+            sub_queries = [
+                [(0.0, pending) for _, pending in sub_query]
+                for sub_query in sub_queries
+            ]
+        else:
+            costs = sorted({cost for sub_query in sub_queries for cost, _ in sub_query})
+        if not costs:
+            return
+        self._release_stage(sub_queries, costs[0])
+        if len(costs) > 1:
+            driver = asyncio.create_task(self._run_stages(sub_queries, costs[1:]))
+            self._drivers.add(driver)
+            driver.add_done_callback(self._drivers.discard)
+
+    async def _run_stages(
+        self,
+        sub_queries: list[list[tuple[float, PendingSearch]]],
+        costs: list[float],
+    ) -> None:
+        """Release each stage once the searches of the cheaper stages finish."""
+        for cost in costs:
+            cheaper = [
+                pending.task
+                for sub_query in sub_queries
+                for search_cost, pending in sub_query
+                if search_cost < cost and not pending.task.done()
+            ]
+            if cheaper:
+                await asyncio.wait(cheaper)
+            self._release_stage(sub_queries, cost)
+
+    def _release_stage(
+        self,
+        sub_queries: list[list[tuple[float, PendingSearch]]],
+        cost: float,
+    ) -> None:
+        """Start the searches of a stage for the sub-queries not ruled out."""
+        for sub_query in sub_queries:
+            stage = [
+                pending for search_cost, pending in sub_query if search_cost == cost
+            ]
+            if not stage:
+                continue
+            cheaper = [
+                pending.task for search_cost, pending in sub_query if search_cost < cost
+            ]
+            if self._ruled_out(cheaper):
+                for pending in stage:
+                    pending.consumers -= 1
+                    if pending.consumers == 0 and not pending.release.done():
+                        pending.task.cancel()
+            else:
+                for pending in stage:
+                    if not pending.release.done() and not pending.task.done():
+                        pending.release.set_result(
+                            self._search(pending.index, pending.arguments),
+                        )
+        if self._start_batch:
+            self._start_batch()
+
+    def _ruled_out(self, cheaper: list[asyncio.Task]) -> bool:
+        """Return whether the finished cheaper searches rule a sub-query out."""
+        if any(task.cancelled() or task.exception() is not None for task in cheaper):
+            return True
+        return bool(self._matches_nothing([task.result() for task in cheaper]))
@@ -1,6 +1,7 @@
 """Spec file validator."""
 
 import inspect
+import types
 import typing
 
 from pydantic import BaseModel, ValidationError
@@ -8,8 +9,12 @@ from pydantic import BaseModel, ValidationError
 from massivesearch.aggregator.base import BaseAggregator, MassiveSearchTasks
 from massivesearch.index.base import BaseIndex
 from massivesearch.model.base import BaseAIClient
+from massivesearch.pipe.plan_cache import create_plan_cache
 from massivesearch.pipe.spec_index import MassiveSearchIndex
 from massivesearch.search_engine.base import BaseSearchEngine
+from massivesearch.search_engine.cache import SearchResultCache
+from massivesearch.search_engine.executor import SearchExecutor
+from massivesearch.search_engine.scheduler import SearchScheduler
 
 
 class SpecSchemaError(Exception):
@@ -38,9 +43,13 @@ def validate_spec(
         raise SpecSchemaError(name, msg)
 
     spec_keys = {"indexs", "aggregator", "ai_client"}
-    if set(spec.keys()) != spec_keys:
+    optional_spec_keys = {"executor", "plan_cache", "result_cache", "scheduler"}
+    if not spec_keys <= set(spec.keys()) <= spec_keys | optional_spec_keys:
         name = "spec"
-        msg = f"Spec keys must be exactly {spec_keys}, but got {set(spec.keys())}"
+        msg = (
+            f"Spec keys must be {spec_keys} with optional {optional_spec_keys}, "
+            f"but got {set(spec.keys())}"
+        )
         raise SpecSchemaError(name, msg)
 
     validate_index_spec(
@@ -59,6 +68,14 @@ def validate_spec(
         spec["ai_client"],
         registered_ai_clients,
     )
+    if "executor" in spec:
+        validate_executor_spec(spec["executor"])
+    if "plan_cache" in spec:
+        validate_plan_cache_spec(spec["plan_cache"])
+    if "result_cache" in spec:
+        validate_result_cache_spec(spec["result_cache"])
+    if "scheduler" in spec:
+        validate_scheduler_spec(spec["scheduler"])
 
 
 def validate_index_spec(
@@ -201,6 +218,65 @@ def validate_ai_client_spec(
         raise SpecSchemaError(name, msg) from e
 
 
+def validate_executor_spec(executor_spec: dict) -> None:
+    """Validate the executor."""
+    if not isinstance(executor_spec, dict):
+        name = "executor"
+        msg = "Executor spec must be a dictionary."
+        raise SpecSchemaError(name, msg)
+    try:
+        SearchExecutor(**executor_spec)
+    except ValidationError as e:
+        name = "executor"
+        msg = f"Executor validation failed: {e}"
+        raise SpecSchemaError(name, msg) from e
+
+
+def validate_plan_cache_spec(plan_cache_spec: dict) -> None:
+    """Validate the plan cache."""
+    if not isinstance(plan_cache_spec, dict):
+        name = "plan_cache"
+        msg = "Plan cache spec must be a dictionary."
+        raise SpecSchemaError(name, msg)
+    try:
+        create_plan_cache(plan_cache_spec)
+    except ValidationError as e:
+        name = "plan_cache"
+        msg = f"Plan cache validation failed: {e}"
+        raise SpecSchemaError(name, msg) from e
+    except ValueError as e:
+        name = "plan_cache"
+        raise SpecSchemaError(name, str(e)) from e
+
+
+def validate_result_cache_spec(result_cache_spec: dict) -> None:
+    """Validate the search result cache."""
+    if not isinstance(result_cache_spec, dict):
+        name = "result_cache"
+        msg = "Result cache spec must be a dictionary."
+        raise SpecSchemaError(name, msg)
+    try:
+        SearchResultCache(**result_cache_spec)
+    except ValidationError as e:
+        name = "result_cache"
+        msg = f"Result cache validation failed: {e}"
+        raise SpecSchemaError(name, msg) from e
+
+
+def validate_scheduler_spec(scheduler_spec: dict) -> None:
+    """Validate the search scheduler."""
+    if not isinstance(scheduler_spec, dict):
+        name = "scheduler"
+        msg = "Scheduler spec must be a dictionary."
+        raise SpecSchemaError(name, msg)
+    try:
+        SearchScheduler(**scheduler_spec)
+    except ValidationError as e:
+        name = "scheduler"
+        msg = f"Scheduler validation failed: {e}"
+        raise SpecSchemaError(name, msg) from e
+
+
 def validate_search_engine(cls: type[BaseSearchEngine]) -> None:
     """Validate the search engine."""
     if hasattr(cls, "search") and not callable(cls.search):
@@ -307,6 +383,15 @@ def validate_ai_client(cls: type[BaseAIClient]) -> None:
         raise TypeError(msg)
 
 
+def _union_members(annotation: object) -> set:
+    """Return the members of a union annotation, or the annotation itself."""
+    if isinstance(annotation, typing.TypeAliasType):
+        annotation = annotation.__value__
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        return set(typing.get_args(annotation))
+    return {annotation}
+
+
 def validate_pipe_search_result_index(
     indexs: list[MassiveSearchIndex],
     aggregator: BaseAggregator,
@@ -325,30 +410,21 @@ def validate_pipe_search_result_index(
             msg = "Index must be a MassiveSearchIndex."
             raise TypeError(msg)
 
-    search_return_type = indexs[0].search_engine.search.__annotations__["return"]
+    aggregator_tasks_annotation = aggregator.aggregate.__annotations__["tasks"]
+    args = typing.get_args(aggregator_tasks_annotation)
+    accepted_types = _union_members(args[0])
+
     for index in indexs:
         return_type = index.search_engine.search.__annotations__["return"]
-        if return_type is not search_return_type:
+        if not _union_members(return_type) <= accepted_types:
             msg = (
-                f"Search return type of {index.name} is mismatched."
-                f" Found two different search return types:"
-                f" {return_type} and {search_return_type}."
-                f" Please check the indexs."
+                "Aggregator 'tasks' annotation does not accept the search "
+                f"return type of {index.name}."
+                f" Expected {return_type}, got {args[0]}."
+                f" Please check the aggregator and indexs."
             )
             raise TypeError(msg)
 
-    aggregator_tasks_annotation = aggregator.aggregate.__annotations__["tasks"]
-    args = typing.get_args(aggregator_tasks_annotation)
-
-    if args[0] is not search_return_type:
-        msg = (
-            "Aggregator 'tasks' annotation does not match the search "
-            f"return type."
-            f" Expected {search_return_type}, got {args[0]}."
-            f" Please check the aggregator and indexs."
-        )
-        raise TypeError(msg)
-
     aggregator_sig = inspect.signature(aggregator.aggregate)
     aggregator_return_type = aggregator_sig.return_annotation
     if typing.get_origin(aggregator_return_type) is typing.Awaitable:
@@ -3,7 +3,13 @@
 from massivesearch.search_engine.base import (
     BaseSearchEngine,
 )
+from massivesearch.search_engine.cache import SearchResultCache
+from massivesearch.search_engine.executor import SearchExecutor
+from massivesearch.search_engine.scheduler import SearchScheduler
 
 __all__ = [
     "BaseSearchEngine",
+    "SearchExecutor",
+    "SearchResultCache",
+    "SearchScheduler",
 ]
@@ -1,12 +1,16 @@
 """Base class for search engines."""
 
+import asyncio
 from abc import abstractmethod
+from collections.abc import Callable, Hashable
 from types import NoneType
 from typing import Any, Generic, TypeVar, get_args, get_origin
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 from pydantic.fields import FieldInfo
 
+from massivesearch.search_engine.executor import SearchExecutor
+
 SearchArgT = TypeVar("SearchArgT", bound=BaseModel)
 
 
@@ -18,6 +22,57 @@ class BaseSearchEngine(BaseModel, Generic[SearchArgT, SearchResT]):
 
     model_config = ConfigDict(extra="ignore")
 
+    _executor: SearchExecutor | None = PrivateAttr(default=None)
+
+    def bind_executor(self, executor: SearchExecutor | None) -> None:
+        """Bind the executor used by `run_blocking`."""
+        self._executor = executor
+
+    def prepare(self) -> None:
+        """Prepare the search engine when the pipe is built.
+
+        Engines backed by an index build or load it here instead of during
+        the first search.
+        """
+
+    def search_cost(self) -> float:
+        """Return the estimated relative cost of a search.
+
+        With an aggregator that skips empty sub-queries, the pipe runs the
+        searches of a sub-query in stages of increasing cost, so a selective
+        cheap filter skips the expensive searches.
+        """
+        return 1.0
+
+    async def search_many(self, arguments: list[SearchArgT]) -> list[SearchResT]:
+        """Search for several argument sets and return one result for each.
+
+        The default runs the searches concurrently. Engines that can answer
+        many searches in one pass override this.
+        """
+        return list(await asyncio.gather(*(self.search(item) for item in arguments)))
+
+    def data_version(self) -> Hashable:
+        """Return a token that changes whenever the searched data changes.
+
+        Search results are cached by this token. Engines over static data can
+        keep the default.
+        """
+        return None
+
+    async def run_blocking[ResT](
+        self,
+        func: Callable[[SearchArgT], ResT],
+        arguments: SearchArgT,
+    ) -> ResT:
+        """Run a blocking method of the search engine on the bound executor.
+
+        Without an executor the method runs directly in the event loop.
+        """
+        if self._executor is None:
+            return func(arguments)
+        return await self._executor.run(func, arguments)
+
     @staticmethod
     def _format_field_header(name: str, field_info: FieldInfo, indent: str) -> str:
         """Format the header part of a field description."""
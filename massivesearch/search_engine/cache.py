@@ -0,0 +1,119 @@
+"""Cross-request cache of search engine results."""
+
+import asyncio
+import sys
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from massivesearch.search_engine.base import BaseSearchEngine
+
+
+def result_nbytes(result: Any) -> int:  # noqa: ANN401
+    """Return the approximate memory used by a search result."""
+    memory_usage = getattr(result, "memory_usage", None)
+    if callable(memory_usage):
+        return int(memory_usage(deep=True))
+    nbytes = getattr(result, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(result)
+
+
+class SearchResultCache(BaseModel):
+    """LRU cache of search results shared by every request of a pipe.
+
+    Results are keyed by the engine type and config, the arguments and the
+    engine's data version, and evicted once they use more than `max_bytes`.
+    Concurrent requests for the same key share one search. Cached results are
+    shared between callers and must not be mutated.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    max_bytes: int = Field(default=256 * 1024**2, gt=0)
+
+    _entries: OrderedDict[Hashable, tuple[Any, int]] = PrivateAttr(
+        default_factory=OrderedDict,
+    )
+    _pending: dict[Hashable, asyncio.Task] = PrivateAttr(default_factory=dict)
+    _total_bytes: int = PrivateAttr(default=0)
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+
+    @property
+    def hits(self) -> int:
+        """Return the number of cache hits."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Return the number of cache misses."""
+        return self._misses
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the memory used by the cached results."""
+        return self._total_bytes
+
+    @staticmethod
+    def _key(search_engine: BaseSearchEngine, arguments: BaseModel) -> Hashable:
+        """Return the cache key of a search."""
+        engine_type = type(search_engine)
+        return (
+            f"{engine_type.__module__}.{engine_type.__qualname__}",
+            search_engine.model_dump_json(),
+            arguments.model_dump_json(),
+            search_engine.data_version(),
+        )
+
+    async def search(
+        self,
+        search_engine: BaseSearchEngine,
+        arguments: BaseModel,
+        search: Callable[[BaseSearchEngine, BaseModel], Coroutine[Any, Any, Any]]
+        | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Return the cached result of the search, searching on a miss.
+
+        `search` runs a missed search instead of the engine, e.g. a scheduler.
+        """
+        key = self._key(search_engine, arguments)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return self._entries[key][0]
+
+        self._misses += 1
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                search(search_engine, arguments)
+                if search
+                else search_engine.search(arguments),
+            )
+            self._pending[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Store the result of a finished search."""
+        self._pending.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        nbytes = result_nbytes(result)
+        if nbytes > self.max_bytes:
+            return
+        self._entries[key] = (result, nbytes)
+        self._total_bytes += nbytes
+        while self._total_bytes > self.max_bytes:
+            _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_nbytes
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        self._entries.clear()
+        self._total_bytes = 0
@@ -0,0 +1,95 @@
+"""Executors for blocking search engine work."""
+
+import asyncio
+import json
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+if TYPE_CHECKING:
+    from massivesearch.search_engine.base import BaseSearchEngine
+
+_worker_engines: dict[tuple[type, str], "BaseSearchEngine"] = {}
+
+
+def _call_in_worker(
+    engine_type: type["BaseSearchEngine"],
+    engine_config: dict,
+    method_name: str,
+    arguments: BaseModel,
+) -> Any:  # noqa: ANN401
+    """Run a search engine method inside a worker process.
+
+    Engines are rebuilt from their config once per worker process and reused,
+    so per-engine state such as loaded data survives across calls.
+    """
+    key = (engine_type, json.dumps(engine_config, sort_keys=True, default=str))
+    engine = _worker_engines.get(key)
+    if engine is None:
+        engine = engine_type(**engine_config)
+        _worker_engines[key] = engine
+    return getattr(engine, method_name)(arguments)
+
+
+class SearchExecutor(BaseModel):
+    """Executor for the blocking part of search engines.
+
+    `inline` runs the work directly in the event loop, `thread` dispatches it
+    to a thread pool and `process` to a process pool of `max_workers` workers.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    mode: Literal["inline", "thread", "process"] = "inline"
+    max_workers: int | None = Field(default=None, gt=0)
+
+    _pool: Executor | None = PrivateAttr(default=None)
+
+    def _get_pool(self) -> Executor:
+        """Return the worker pool, creating it on first use."""
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="massivesearch",
+                )
+        return self._pool
+
+    async def run[ArgT: BaseModel, ResT](
+        self,
+        func: Callable[[ArgT], ResT],
+        arguments: ArgT,
+    ) -> ResT:
+        """Run a blocking search engine method with the given arguments.
+
+        In `process` mode `func` must be a method bound to a search engine.
+        """
+        if self.mode == "inline":
+            return func(arguments)
+
+        loop = asyncio.get_running_loop()
+        if self.mode == "thread":
+            return await loop.run_in_executor(self._get_pool(), func, arguments)
+
+        engine = getattr(func, "__self__", None)
+        if engine is None:
+            msg = "Process executor can only run methods bound to a search engine."
+            raise TypeError(msg)
+        return await loop.run_in_executor(
+            self._get_pool(),
+            _call_in_worker,
+            type(engine),
+            engine.model_dump(),
+            func.__name__,
+            arguments,
+        )
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
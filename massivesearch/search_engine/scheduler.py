@@ -0,0 +1,125 @@
+"""Micro-batching of concurrent searches on the same search engine."""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from massivesearch.search_engine.base import BaseSearchEngine
+
+
+@dataclass
+class _PendingBatch:
+    """Searches of one engine collected during the current window."""
+
+    search_engine: BaseSearchEngine
+    loop: asyncio.AbstractEventLoop
+    arguments: dict[str, BaseModel] = field(default_factory=dict)
+    futures: dict[str, asyncio.Future] = field(default_factory=dict)
+    timer: asyncio.TimerHandle | None = None
+
+
+class SearchScheduler(BaseModel):
+    """Scheduler batching the searches of concurrent requests per engine.
+
+    Searches on the same engine are collected for `window_ms` after the
+    first one, or until `max_batch_size` distinct argument sets are pending.
+    Identical arguments share one search, and the batch goes to the engine's
+    `search_many` in one call. When that call fails, each search of the
+    batch is retried alone, so the error only reaches the callers with the
+    failing arguments.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    window_ms: float = Field(default=2.0, ge=0)
+    max_batch_size: int = Field(default=64, gt=0)
+
+    _batches: dict[int, _PendingBatch] = PrivateAttr(default_factory=dict)
+    _running: set[asyncio.Task] = PrivateAttr(default_factory=set)
+
+    async def search(
+        self,
+        search_engine: BaseSearchEngine,
+        arguments: BaseModel,
+    ) -> Any:  # noqa: ANN401
+        """Return the result of the search once its batch has run."""
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(id(search_engine))
+        if batch is None or batch.loop is not loop:
+            batch = _PendingBatch(search_engine, loop)
+            batch.timer = loop.call_later(
+                self.window_ms / 1000,
+                self._flush,
+                id(search_engine),
+            )
+            self._batches[id(search_engine)] = batch
+
+        key = arguments.model_dump_json()
+        future = batch.futures.get(key)
+        if future is None:
+            future = loop.create_future()
+            batch.arguments[key] = arguments
+            batch.futures[key] = future
+            if len(batch.futures) >= self.max_batch_size:
+                self._flush(id(search_engine))
+        return await asyncio.shield(future)
+
+    def _flush(self, engine_id: int) -> None:
+        """Run the pending batch of an engine."""
+        batch = self._batches.pop(engine_id, None)
+        if batch is None:
+            return
+        if batch.timer:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    @staticmethod
+    async def _run(batch: _PendingBatch) -> None:
+        """Search the batch and resolve the future of each argument set."""
+        arguments = list(batch.arguments.values())
+        futures = list(batch.futures.values())
+        try:
+            try:
+                results = await _search_batch(batch.search_engine, arguments)
+            except Exception as e:  # noqa: BLE001
+                results = [e] * len(futures)
+            for future, result in zip(futures, results, strict=True):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+
+
+async def _search_batch(
+    search_engine: BaseSearchEngine,
+    arguments: list[BaseModel],
+) -> list[Any]:
+    """Return the results of a batch, or the exception of each failed search.
+
+    A failed `search_many` is retried one search at a time. A result list of
+    the wrong length is an error of the whole batch.
+    """
+    try:
+        results = await search_engine.search_many(arguments)
+    except Exception:  # noqa: BLE001
+        return await asyncio.gather(
+            *(search_engine.search(item) for item in arguments),
+            return_exceptions=True,
+        )
+    if len(results) != len(arguments):
+        msg = (
+            f"{type(search_engine).__name__}.search_many returned "
+            f"{len(results)} results for {len(arguments)} searches."
+        )
+        raise ValueError(msg)
+    return results
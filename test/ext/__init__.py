@@ -0,0 +1 @@
+"""Ext Test."""
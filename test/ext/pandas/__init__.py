@@ -0,0 +1 @@
+"""Pandas Ext Test."""
@@ -0,0 +1,261 @@
+# ruff: noqa: D100, D103, S101
+
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from massivesearch.ext.pandas.aggregator import PandasAggregator
+from massivesearch.ext.pandas.bitmap import RowBitmap
+
+
+@pytest.fixture
+def aggregator(tmp_path: Path) -> PandasAggregator:
+    path = tmp_path / "books.csv"
+    pd.DataFrame({"title": list("abcde")}).to_csv(path, index=False)
+    return PandasAggregator(file_path=str(path))
+
+
+async def _result(index: list[int], delay: float = 0) -> pd.Index:
+    await asyncio.sleep(delay)
+    return pd.Index(index)
+
+
+@pytest.mark.asyncio
+async def test_aggregate_intersects_and_merges(aggregator: PandasAggregator) -> None:
+    tasks = [
+        {
+            "title": asyncio.create_task(_result([0, 1, 2])),
+            "price": asyncio.create_task(_result([1, 2, 3])),
+        },
+        {"title": asyncio.create_task(_result([4]))},
+    ]
+
+    result = await aggregator.aggregate(tasks)
+
+    assert sorted(result.index) == [1, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_empty_intersection_cancels_remaining_searches(
+    aggregator: PandasAggregator,
+) -> None:
+    slow = asyncio.create_task(_result([0, 1], delay=10))
+    tasks = [{"flag": asyncio.create_task(_result([])), "title": slow}]
+
+    result = await asyncio.wait_for(aggregator.aggregate(tasks), timeout=1)
+
+    assert result.empty
+    assert slow.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_shared_search_is_not_cancelled(aggregator: PandasAggregator) -> None:
+    shared = asyncio.create_task(_result([0, 1], delay=0.01))
+    tasks = [
+        {"flag": asyncio.create_task(_result([])), "price": shared},
+        {"flag": asyncio.create_task(_result([0])), "price": shared},
+    ]
+
+    result = await aggregator.aggregate(tasks)
+
+    assert list(result.index) == [0]
+    assert not shared.cancelled()
+
+
+async def _bitmap(positions: list[int]) -> RowBitmap:
+    return RowBitmap.from_positions(pd.RangeIndex(5), np.array(positions, dtype=int))
+
+
+@pytest.mark.asyncio
+async def test_aggregate_combines_bitmaps_and_indices(
+    aggregator: PandasAggregator,
+) -> None:
+    tasks = [
+        {
+            "title": asyncio.create_task(_bitmap([0, 1, 2])),
+            "price": asyncio.create_task(_result([1, 2, 3])),
+            "flag": asyncio.create_task(_bitmap([2, 3])),
+        },
+        {"title": asyncio.create_task(_bitmap([4]))},
+    ]
+
+    result = await aggregator.aggregate(tasks)
+
+    assert list(result.index) == [2, 4]
+
+
+@pytest.mark.asyncio
+async def test_empty_result_does_not_load_data(aggregator: PandasAggregator) -> None:
+    tasks = [{"title": asyncio.create_task(_result([]))}]
+
+    with patch(
+        "massivesearch.ext.pandas.aggregator.load_dataset",
+        side_effect=AssertionError,
+    ):
+        result = await aggregator.aggregate(tasks)
+
+    assert result.empty
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("row_fetch", ["cache", "offsets"])
+async def test_aggregate_fetches_projected_rows(tmp_path: Path, row_fetch: str) -> None:
+    path = tmp_path / "books.csv"
+    pd.DataFrame({"title": list("abcde"), "price": range(5)}).to_csv(path, index=False)
+    aggregator = PandasAggregator(
+        file_path=str(path),
+        columns=["title"],
+        row_fetch=row_fetch,
+    )
+    tasks = [{"title": asyncio.create_task(_bitmap([1, 3]))}]
+
+    result = await aggregator.aggregate(tasks)
+
+    assert result.to_dict() == {"title": {1: "b", 3: "d"}}
+
+
+@pytest.mark.asyncio
+async def test_offsets_fetch_falls_back_for_quotes_in_unquoted_fields(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "books.csv"
+    path.write_text('title,price\n15" laptop,10\nmouse,20\n"pad",5\nkey,7\n')
+    aggregator = PandasAggregator(file_path=str(path), row_fetch="offsets")
+    tasks = [{"title": asyncio.create_task(_result([0, 3]))}]
+
+    result = await aggregator.aggregate(tasks)
+
+    assert result["title"].tolist() == ['15" laptop', "key"]
+
+
+async def _scored(scores: dict[int, float]) -> RowBitmap:
+    bitmap = RowBitmap.from_positions(pd.RangeIndex(5), np.array(list(scores)))
+    values = np.zeros(5)
+    values[list(scores)] = list(scores.values())
+    return RowBitmap(bitmap.labels, bitmap.mask, values)
+
+
+def _ranked_tasks() -> list[dict[str, asyncio.Task]]:
+    return [
+        {
+            "title": asyncio.create_task(_scored({0: 1.0, 1: 3.0, 2: 2.0})),
+            "author": asyncio.create_task(_scored({1: 1.0, 2: 1.5, 3: 9.0})),
+            "price": asyncio.create_task(_result([0, 1, 2, 3])),
+        },
+        {"title": asyncio.create_task(_scored({4: 3.5}))},
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("fusion", "expected"),
+    [
+        ("sum", {1: 4.0, 2: 3.5}),
+        ("max", {4: 3.5, 1: 3.0}),
+        ("rrf", {1: 1 / 61, 4: 1 / 61}),
+    ],
+)
+async def test_top_k_ranks_by_fused_scores(
+    aggregator: PandasAggregator,
+    fusion: str,
+    expected: dict[int, float],
+) -> None:
+    ranked = aggregator.model_copy(update={"top_k": 2, "fusion": fusion})
+
+    result = await ranked.aggregate(_ranked_tasks())
+
+    assert list(result.index) == list(expected)
+    assert result["score"].to_numpy() == pytest.approx(list(expected.values()))
+    assert list(result["title"]) == ["abcde"[i] for i in expected]
+
+
+@pytest.mark.asyncio
+async def test_rrf_ignores_sub_queries_without_scores(
+    aggregator: PandasAggregator,
+) -> None:
+    ranked = aggregator.model_copy(update={"top_k": 2, "fusion": "rrf"})
+    tasks = [
+        {"title": asyncio.create_task(_scored({0: 3.0, 1: 2.0, 2: 1.0}))},
+        {"title": asyncio.create_task(_result([3]))},
+    ]
+
+    result = await ranked.aggregate(tasks)
+
+    assert list(result.index) == [0, 1]
+    assert result["score"].to_numpy() == pytest.approx([1 / 61, 1 / 62])
+
+
+@pytest.mark.asyncio
+async def test_top_k_without_scores_keeps_lowest_rows(
+    aggregator: PandasAggregator,
+) -> None:
+    ranked = aggregator.model_copy(update={"top_k": 2})
+    tasks = [{"title": asyncio.create_task(_result([4, 3, 1]))}]
+
+    result = await ranked.aggregate(tasks)
+
+    assert list(result.index) == [1, 3]
+    assert list(result["score"]) == [0.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_top_k_rejects_data_column_named_like_scores(tmp_path: Path) -> None:
+    path = tmp_path / "reviews.csv"
+    pd.DataFrame({"title": list("ab"), "score": [4.5, 3.0]}).to_csv(path, index=False)
+    ranked = PandasAggregator(file_path=str(path), top_k=1)
+
+    with pytest.raises(ValueError, match="already has a 'score' column"):
+        await ranked.aggregate([{"title": asyncio.create_task(_result([0, 1]))}])
+
+    renamed = ranked.model_copy(update={"score_column": "relevance"})
+    result = await renamed.aggregate([{"title": asyncio.create_task(_result([1]))}])
+
+    assert list(result.columns) == ["title", "score", "relevance"]
+    assert list(result["score"]) == [3.0]
+
+
+@pytest.mark.asyncio
+async def test_aggregate_stream_yields_new_rows_per_sub_query(
+    aggregator: PandasAggregator,
+) -> None:
+    tasks = [
+        {"title": asyncio.create_task(_result([1, 2, 3], delay=0.02))},
+        {"title": asyncio.create_task(_bitmap([0, 1]))},
+        {"title": asyncio.create_task(_result([0], delay=0.01))},
+    ]
+
+    batches = [batch async for batch in aggregator.aggregate_stream(tasks)]
+
+    assert [list(batch.index) for batch in batches] == [[0, 1], [2, 3]]
+    assert list(batches[1]["title"]) == ["c", "d"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.filterwarnings("error")
+async def test_aggregate_stream_yields_each_row_once(
+    aggregator: PandasAggregator,
+) -> None:
+    tasks = [
+        {"title": asyncio.create_task(_result(rows, delay=delay / 100))}
+        for delay, rows in enumerate([[4], [], [0, 4], [3, 0], [1, 2, 3], [4, 2]])
+    ]
+
+    batches = [batch async for batch in aggregator.aggregate_stream(tasks)]
+
+    assert [list(batch.index) for batch in batches] == [[4], [0], [3], [1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_aggregate_stream_with_top_k_yields_ranked_rows_once(
+    aggregator: PandasAggregator,
+) -> None:
+    ranked = aggregator.model_copy(update={"top_k": 2})
+
+    batches = [batch async for batch in ranked.aggregate_stream(_ranked_tasks())]
+
+    assert len(batches) == 1
+    assert list(batches[0].index) == [1, 2]
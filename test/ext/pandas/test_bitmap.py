@@ -0,0 +1,54 @@
+# ruff: noqa: D100, D103, S101
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from massivesearch.ext.pandas.bitmap import RowBitmap
+
+LABELS = pd.RangeIndex(5)
+
+
+def test_and_or_invert() -> None:
+    left = RowBitmap.from_positions(LABELS, np.array([0, 1, 2]))
+    right = RowBitmap.from_index(LABELS, pd.Index([1, 2, 3]))
+
+    assert list((left & right).to_index()) == [1, 2]
+    assert list((left | right).to_index()) == [0, 1, 2, 3]
+    assert list((~left).positions()) == [3, 4]
+
+
+def test_len_counts_matches() -> None:
+    assert len(RowBitmap.full(LABELS)) == len(LABELS)
+    assert len(RowBitmap.empty(LABELS)) == 0
+
+
+def test_to_index_uses_frame_labels() -> None:
+    labels = pd.Index([10, 20, 30])
+    bitmap = RowBitmap(labels, np.array([False, True, True]))
+
+    assert list(bitmap.to_index()) == [20, 30]
+
+
+def test_combining_different_lengths_fails() -> None:
+    with pytest.raises(ValueError, match="different numbers of rows"):
+        RowBitmap.full(LABELS) & RowBitmap.full(pd.RangeIndex(3))
+
+
+def test_mask_length_is_checked() -> None:
+    with pytest.raises(ValueError, match="Mask length"):
+        RowBitmap(LABELS, np.ones(3, dtype=bool))
+
+
+def test_operators_add_scores() -> None:
+    scored = RowBitmap(LABELS, np.ones(5, dtype=bool), np.arange(5.0))
+    unscored = RowBitmap.from_positions(LABELS, np.array([1, 2]))
+
+    assert (scored & unscored).to_scores().to_dict() == {1: 1.0, 2: 2.0}
+    assert list((scored | scored).to_scores()) == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert unscored.to_scores() is None
+
+
+def test_scores_length_is_checked() -> None:
+    with pytest.raises(ValueError, match="Scores length"):
+        RowBitmap(LABELS, np.ones(5, dtype=bool), np.zeros(3))
@@ -0,0 +1,70 @@
+# ruff: noqa: D100, D103, S101, PLR2004
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from massivesearch.ext.pandas.cache import DatasetCache
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    path = tmp_path / "books.csv"
+    pd.DataFrame({"title": ["a", "b"], "price": [1.0, 2.0]}).to_csv(
+        path,
+        index=False,
+    )
+    return path
+
+
+def test_get_loads_once(csv_path: Path) -> None:
+    cache = DatasetCache()
+    calls = []
+
+    def loader() -> pd.DataFrame:
+        calls.append(1)
+        return pd.read_csv(csv_path)
+
+    first = cache.get(str(csv_path), (), loader)
+    second = cache.get(str(csv_path), (), loader)
+
+    assert first is second
+    assert len(calls) == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_get_reloads_when_file_changes(csv_path: Path) -> None:
+    cache = DatasetCache()
+    first = cache.get(str(csv_path), (), lambda: pd.read_csv(csv_path))
+
+    pd.DataFrame({"title": ["a", "b", "c"], "price": [1.0, 2.0, 3.0]}).to_csv(
+        csv_path,
+        index=False,
+    )
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = cache.get(str(csv_path), (), lambda: pd.read_csv(csv_path))
+
+    assert len(first) == 2
+    assert len(second) == 3
+    assert cache.misses == 2
+
+
+def test_get_evicts_least_recently_used(tmp_path: Path, csv_path: Path) -> None:
+    other_path = tmp_path / "other.csv"
+    other_path.write_text(csv_path.read_text())
+    cache = DatasetCache()
+    cache.get(str(csv_path), (), lambda: pd.read_csv(csv_path))
+    cache.max_bytes = cache.total_bytes
+
+    cache.get(str(other_path), (), lambda: pd.read_csv(other_path))
+    cache.get(str(other_path), (), lambda: pd.read_csv(other_path))
+    cache.get(str(csv_path), (), lambda: pd.read_csv(csv_path))
+
+    assert cache.hits == 1
+    assert cache.misses == 3
+    assert cache.total_bytes <= cache.max_bytes
@@ -0,0 +1,124 @@
+# ruff: noqa: D100, D103, S101
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from massivesearch.ext.pandas.cache import data_version
+from massivesearch.ext.pandas.columnar import (
+    convert_csv,
+    main,
+    read_columnar_store,
+)
+from massivesearch.ext.pandas.source import load_dataset
+from massivesearch.ext.pandas.text import (
+    PandasTextSearchEngine,
+    PandasTextSearchEngineArguments,
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    path = tmp_path / "books.csv"
+    pd.DataFrame(
+        {
+            "title": ["Dune", None, "Café", ""],
+            "price": [9.5, 12.0, np.nan, 3.25],
+            "stock": [1, 2, 3, 4],
+            "in_print": [True, False, True, True],
+        },
+    ).to_csv(path, index=False)
+    return path
+
+
+def test_round_trip_matches_csv(csv_path: Path, tmp_path: Path) -> None:
+    store = tmp_path / "books.columns"
+    convert_csv(str(csv_path), str(store))
+
+    data = read_columnar_store(str(store))
+
+    expected = pd.read_csv(csv_path)
+    expected["title"] = expected["title"].astype(data["title"].dtype)
+    pd.testing.assert_frame_equal(data, expected)
+
+
+def test_numeric_columns_are_memory_mapped(csv_path: Path, tmp_path: Path) -> None:
+    store = tmp_path / "books.columns"
+    convert_csv(str(csv_path), str(store))
+
+    data = read_columnar_store(str(store), ["price"])
+
+    assert list(data.columns) == ["price"]
+    array = data["price"].to_numpy()
+    while not isinstance(array, np.memmap) and array.base is not None:
+        array = array.base
+    assert isinstance(array, np.memmap)
+
+
+def test_text_columns_without_pyarrow(csv_path: Path, tmp_path: Path) -> None:
+    store = tmp_path / "books.columns"
+    convert_csv(str(csv_path), str(store))
+
+    with patch.dict(sys.modules, {"pyarrow": None}):
+        data = read_columnar_store(str(store), ["title"])
+
+    assert data["title"].tolist()[0] == "Dune"
+    assert data["title"].tolist()[2] == "Café"
+    assert data["title"].isna().tolist() == [False, True, False, True]
+
+
+def test_engines_load_stores(csv_path: Path, tmp_path: Path) -> None:
+    store = tmp_path / "books.columns"
+    main([str(csv_path), str(store)])
+    engine = PandasTextSearchEngine(
+        file_path=str(store),
+        column_name="title",
+        matching_strategy="contains",
+    )
+
+    result = engine.search_blocking(PandasTextSearchEngineArguments(keywords=["caf"]))
+
+    assert list(result.to_index()) == [2]
+    assert list(load_dataset(str(store)).columns) == [
+        "title",
+        "price",
+        "stock",
+        "in_print",
+    ]
+
+
+def test_rewriting_store_changes_data_version(csv_path: Path, tmp_path: Path) -> None:
+    store = tmp_path / "books.columns"
+    convert_csv(str(csv_path), str(store))
+    version = data_version(str(store))
+
+    pd.DataFrame({"title": ["Emma"]}).to_csv(csv_path, index=False)
+    convert_csv(str(csv_path), str(store))
+
+    assert data_version(str(store)) != version
+    assert read_columnar_store(str(store))["title"].tolist() == ["Emma"]
+
+
+def test_failed_replace_keeps_existing_store(csv_path: Path, tmp_path: Path) -> None:
+    store = tmp_path / "books.columns"
+    convert_csv(str(csv_path), str(store))
+    rename = Path.rename
+
+    def failing_rename(self: Path, target: Path) -> Path:
+        if self.name.startswith(".") and not self.name.endswith(".old"):
+            msg = "rename failed"
+            raise OSError(msg)
+        return rename(self, target)
+
+    with (
+        patch.object(Path, "rename", failing_rename),
+        pytest.raises(OSError, match="rename failed"),
+    ):
+        convert_csv(str(csv_path), str(store))
+
+    assert read_columnar_store(str(store))["stock"].tolist() == [1, 2, 3, 4]
+    assert [path.name for path in tmp_path.iterdir() if path.name.startswith(".")] == []
@@ -0,0 +1,75 @@
+# ruff: noqa: D100, D103, S101
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from massivesearch.ext.pandas.csv_index import (
+    UnindexableCsvError,
+    load_csv_records,
+    read_csv_rows,
+    scan_csv_records,
+)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        'title,price\na,1\n"b\nc",2\n"say ""hi""",3\n',
+        'title,price\n"",1\n"a,""b""\n",2\n',
+        "title,price\r\na,1\r\n\r\nb,2\r\n",
+        "title,price\na,1\n\nb,2\n\nc,3",
+        "title,price\na,1\nb,2\nx,3",
+    ],
+)
+def test_read_csv_rows_matches_read_csv(tmp_path: Path, content: str) -> None:
+    path = tmp_path / "books.csv"
+    path.write_bytes(content.encode())
+    expected = pd.read_csv(path)
+
+    for positions in ([0], [len(expected) - 1, 0], list(range(len(expected)))):
+        result = read_csv_rows(str(path), positions)
+
+        pd.testing.assert_frame_equal(
+            result,
+            expected.iloc[positions],
+            check_dtype=False,
+        )
+
+
+def test_scan_csv_records_counts_header_and_rows(tmp_path: Path) -> None:
+    path = tmp_path / "books.csv"
+    path.write_text('title\n"a\nb"\n\nc\n')
+
+    records = scan_csv_records(str(path))
+
+    assert records.to_numpy().tolist() == [[0, 6], [6, 12], [13, 15]]
+
+
+def test_scan_csv_records_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "books.csv"
+    path.write_text("")
+
+    assert scan_csv_records(str(path)).empty
+
+
+def test_read_csv_rows_projects_columns(tmp_path: Path) -> None:
+    path = tmp_path / "books.csv"
+    pd.DataFrame({"title": ["a", "b"], "price": [1, 2]}).to_csv(path, index=False)
+
+    result = read_csv_rows(str(path), [1], ["price"])
+
+    assert list(result.columns) == ["price"]
+    assert result.to_dict() == {"price": {1: 2}}
+
+
+def test_quote_inside_unquoted_field_is_unindexable(tmp_path: Path) -> None:
+    path = tmp_path / "books.csv"
+    path.write_text('title,price\n15" laptop,10\nmouse,20\n"pad",5\nkey,7\n')
+
+    with pytest.raises(UnindexableCsvError):
+        scan_csv_records(str(path))
+    assert load_csv_records(str(path)) is None
+    with pytest.raises(UnindexableCsvError):
+        read_csv_rows(str(path), [1, 2])
@@ -0,0 +1,101 @@
+# ruff: noqa: D100, D103, S101
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from massivesearch.ext.pandas.inverted import PandasInvertedIndexSearchEngine
+from massivesearch.ext.pandas.text import PandasTextSearchEngineArguments
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    path = tmp_path / "books.csv"
+    pd.DataFrame(
+        {
+            "title": [
+                "The Little Prince",
+                "The Lord of the Rings",
+                None,
+                "Prince of Persia",
+            ],
+        },
+    ).to_csv(path, index=False)
+    return path
+
+
+def _search(engine: PandasInvertedIndexSearchEngine, keywords: list[str]) -> list:
+    arguments = PandasTextSearchEngineArguments(keywords=keywords)
+    return list(engine.search_blocking(arguments).to_index())
+
+
+def test_keywords_are_ored_and_tokens_anded(csv_path: Path) -> None:
+    engine = PandasInvertedIndexSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+    )
+
+    assert _search(engine, ["prince"]) == [0, 3]
+    assert _search(engine, ["little prince", "RINGS"]) == [0, 1]
+    assert _search(engine, ["prince lord"]) == []
+    assert _search(engine, []) == [0, 1, 2, 3]
+
+
+def test_keyword_without_tokens_matches_no_rows(csv_path: Path) -> None:
+    engine = PandasInvertedIndexSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+    )
+
+    assert _search(engine, ["!!"]) == []
+    assert _search(engine, ["!!", "rings"]) == [1]
+
+
+def test_index_is_saved_and_reloaded(csv_path: Path, tmp_path: Path) -> None:
+    index_path = tmp_path / "title.npz"
+    engine = PandasInvertedIndexSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        index_path=str(index_path),
+    )
+    engine.prepare()
+    assert index_path.exists()
+
+    reloaded = PandasInvertedIndexSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        index_path=str(index_path),
+    )
+    with patch.object(
+        PandasInvertedIndexSearchEngine,
+        "build_postings",
+        side_effect=AssertionError,
+    ):
+        assert _search(reloaded, ["persia"]) == [3]
+
+
+def test_index_is_rebuilt_when_data_changes(csv_path: Path) -> None:
+    engine = PandasInvertedIndexSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+    )
+    assert _search(engine, ["hobbit"]) == []
+
+    pd.DataFrame({"title": ["The Hobbit", "Dune"]}).to_csv(csv_path, index=False)
+
+    assert _search(engine, ["hobbit"]) == [0]
+
+
+def test_matches_are_scored(csv_path: Path) -> None:
+    engine = PandasInvertedIndexSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+    )
+    arguments = PandasTextSearchEngineArguments(keywords=["prince", "persia"])
+
+    scores = engine.search_blocking(arguments).to_scores()
+
+    assert list(scores.index) == [0, 3]
+    assert scores[3] > scores[0] > 0
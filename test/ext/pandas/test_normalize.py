@@ -0,0 +1,118 @@
+# ruff: noqa: D100, D103, S101
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from massivesearch.ext.pandas.cache import dataset_cache
+from massivesearch.ext.pandas.inverted import PandasInvertedIndexSearchEngine
+from massivesearch.ext.pandas.normalize import (
+    NORMALIZED_DTYPE,
+    normalize_series,
+    normalize_text,
+)
+from massivesearch.ext.pandas.text import (
+    PandasTextSearchEngine,
+    PandasTextSearchEngineArguments,
+)
+from massivesearch.ext.pandas.trigram import PandasTrigramSearchEngine
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    path = tmp_path / "books.csv"
+    pd.DataFrame(
+        {"title": ["Café Society", "STRASSE", "Die Straße", None]},
+    ).to_csv(path, index=False)
+    return path
+
+
+def test_normalize_text() -> None:
+    assert normalize_text("Straße", casefold=False, strip_accents=False) == "straße"
+    assert normalize_text("Straße", casefold=True, strip_accents=False) == "strasse"
+    assert normalize_text("Café", casefold=False, strip_accents=True) == "cafe"
+
+
+def test_normalize_series_matches_normalize_text() -> None:
+    series = pd.Series(["Café Straße", None])
+
+    normalized = normalize_series(series, casefold=True, strip_accents=True)
+
+    assert normalized.dtype == NORMALIZED_DTYPE
+    assert normalized[0] == normalize_text(
+        "Café Straße",
+        casefold=True,
+        strip_accents=True,
+    )
+    assert pd.isna(normalized[1])
+
+
+@pytest.mark.parametrize(
+    ("matching_strategy", "keyword", "expected"),
+    [
+        ("exact", "ΟΔΟΣ", [0]),
+        ("contains", "İstanbul", [1]),
+        ("starts_with", "İst", [1]),
+        ("ends_with", "ΟΣ", [0]),
+    ],
+)
+def test_column_and_keywords_are_normalized_alike(
+    tmp_path: Path,
+    matching_strategy: str,
+    keyword: str,
+    expected: list[int],
+) -> None:
+    path = tmp_path / "streets.csv"
+    pd.DataFrame({"name": ["ΟΔΟΣ", "İstanbul", "Paris"]}).to_csv(path, index=False)
+    engine = PandasTextSearchEngine(
+        file_path=str(path),
+        column_name="name",
+        matching_strategy=matching_strategy,
+    )
+    arguments = PandasTextSearchEngineArguments(keywords=[keyword])
+
+    assert list(engine.search_blocking(arguments).to_index()) == expected
+
+
+@pytest.mark.parametrize(
+    ("engine_type", "options", "expected"),
+    [
+        (PandasTextSearchEngine, {"matching_strategy": "contains"}, [0, 1, 2]),
+        (PandasTextSearchEngine, {"matching_strategy": "starts_with"}, [0, 1]),
+        (PandasTrigramSearchEngine, {}, [0, 1, 2]),
+        (PandasInvertedIndexSearchEngine, {}, [0, 1, 2]),
+    ],
+)
+def test_engines_use_normalization_options(
+    csv_path: Path,
+    engine_type: type,
+    options: dict,
+    expected: list[int],
+) -> None:
+    plain = engine_type(file_path=str(csv_path), column_name="title", **options)
+    folded = engine_type(
+        file_path=str(csv_path),
+        column_name="title",
+        casefold=True,
+        strip_accents=True,
+        **options,
+    )
+    arguments = PandasTextSearchEngineArguments(keywords=["cafe", "strasse"])
+
+    assert list(plain.search_blocking(arguments).to_index()) == [1]
+    assert list(folded.search_blocking(arguments).to_index()) == expected
+
+
+def test_normalized_column_is_computed_once(csv_path: Path) -> None:
+    engine = PandasTextSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        matching_strategy="exact",
+    )
+
+    engine.load_normalized()
+    misses = dataset_cache.misses
+    engine.load_normalized()
+
+    assert dataset_cache.misses == misses
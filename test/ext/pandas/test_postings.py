@@ -0,0 +1,76 @@
+# ruff: noqa: D100, D103, S101
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from massivesearch.ext.pandas.postings import Postings
+
+
+def _postings() -> Postings:
+    row_terms = pd.Series([["a", "b", "a"], ["b"], None, ["c", "a"]])
+    return Postings.build(row_terms, 4)
+
+
+def test_build_dedups_and_sorts_rows() -> None:
+    postings = _postings()
+
+    assert list(postings.terms) == ["a", "b", "c"]
+    assert list(postings.lookup("a")) == [0, 3]
+    assert list(postings.lookup("b")) == [0, 1]
+    assert len(postings.lookup("missing")) == 0
+
+
+def test_intersect() -> None:
+    postings = _postings()
+
+    assert list(postings.intersect(["a", "b"])) == [0]
+    assert list(postings.intersect(["a", "missing"])) == []
+    assert list(postings.intersect([])) == [0, 1, 2, 3]
+
+
+def test_save_and_load_checks_version(tmp_path: Path) -> None:
+    path = str(tmp_path / "index.npz")
+    _postings().save(path, [1, 2, "title"])
+
+    loaded = Postings.load(path, [1, 2, "title"])
+
+    assert loaded is not None
+    assert list(loaded.lookup("c")) == [3]
+    assert Postings.load(path, [1, 3, "title"]) is None
+    assert Postings.load(str(tmp_path / "missing.npz"), [1, 2, "title"]) is None
+
+
+def test_build_counts_term_frequencies() -> None:
+    postings = _postings()
+
+    assert list(postings.term_frequencies("a", postings.lookup("a"))) == [2, 1]
+    assert list(postings.row_lengths) == [3, 1, 0, 2]
+
+
+def test_save_and_load_keeps_frequencies(tmp_path: Path) -> None:
+    path = str(tmp_path / "index.npz")
+    _postings().save(path, "v")
+
+    loaded = Postings.load(path, "v")
+
+    assert loaded is not None
+    assert list(loaded.term_frequencies("a", np.array([3]))) == [1]
+    assert list(loaded.row_lengths) == [3, 1, 0, 2]
+
+
+def test_long_term_does_not_pad_other_terms(tmp_path: Path) -> None:
+    long_term = "x" * 2000
+    row_terms = pd.Series([[f"t{i}"] for i in range(1000)] + [[long_term, "é"]])
+    postings = Postings.build(row_terms, len(row_terms))
+    path = str(tmp_path / "index.npz")
+    postings.save(path, "v")
+
+    loaded = Postings.load(path, "v")
+
+    assert postings.nbytes() < 200_000  # noqa: PLR2004
+    assert loaded is not None
+    assert list(loaded.lookup(long_term)) == [1000]
+    assert list(loaded.lookup("é")) == [1000]
+    assert list(loaded.lookup("t7")) == [7]
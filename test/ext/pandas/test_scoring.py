@@ -0,0 +1,24 @@
+# ruff: noqa: D100, D103, S101
+
+import numpy as np
+
+from massivesearch.ext.pandas.scoring import bm25
+
+
+def test_bm25_favours_frequent_terms_in_short_rows() -> None:
+    scores = bm25(
+        frequencies=np.array([1, 3, 1]),
+        lengths=np.array([10, 10, 40]),
+        average_length=20,
+        document_frequency=3,
+        n_rows=100,
+    )
+
+    assert scores[1] > scores[0] > scores[2] > 0
+
+
+def test_bm25_favours_rare_terms() -> None:
+    def score(document_frequency: int) -> float:
+        return bm25(np.array([1]), np.array([5]), 5, document_frequency, 100)[0]
+
+    assert score(1) > score(50) > score(100) > 0
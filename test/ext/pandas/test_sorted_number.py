@@ -0,0 +1,122 @@
+# ruff: noqa: D100, D103, S101
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from massivesearch.ext.pandas.number import (
+    NumberRange,
+    PandasNumberSearchEngine,
+    PandasNumberSearchEngineArguments,
+)
+from massivesearch.ext.pandas.sorted_number import (
+    PandasSortedNumberSearchEngine,
+    merge_ranges,
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    path = tmp_path / "books.csv"
+    rng = np.random.default_rng(0)
+    prices = rng.integers(0, 50, size=200).astype(float)
+    prices[::7] = np.nan
+    pd.DataFrame({"price": prices}).to_csv(path, index=False)
+    return path
+
+
+def _range(start: float | None, end: float | None) -> NumberRange:
+    return NumberRange(start_number=start, end_number=end)
+
+
+def test_merge_ranges() -> None:
+    ranges = [_range(5, 10), _range(None, 1), _range(8, 20), _range(30, None)]
+
+    assert merge_ranges(ranges) == [(-np.inf, 1), (5, 20), (30, np.inf)]
+
+
+@pytest.mark.parametrize(
+    "ranges",
+    [
+        [],
+        [(10, 20)],
+        [(10, 10)],
+        [(None, 5), (45, None)],
+        [(1, 30), (20, 40), (25, 26)],
+        [(100, 200)],
+    ],
+)
+def test_matches_scan_engine(csv_path: Path, ranges: list) -> None:
+    arguments = PandasNumberSearchEngineArguments(
+        number_ranges=[_range(start, end) for start, end in ranges],
+    )
+    scan = PandasNumberSearchEngine(file_path=str(csv_path), column_name="price")
+    engine = PandasSortedNumberSearchEngine(
+        file_path=str(csv_path),
+        column_name="price",
+    )
+
+    expected = list(scan.search_blocking(arguments).to_index())
+
+    assert list(engine.search_blocking(arguments).to_index()) == expected
+
+
+@pytest.mark.parametrize(
+    "engine_type",
+    [PandasNumberSearchEngine, PandasSortedNumberSearchEngine],
+)
+def test_search_many_matches_single_searches(
+    csv_path: Path,
+    engine_type: type[PandasNumberSearchEngine],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("massivesearch.ext.pandas.number._MASK_BLOCK_ROWS", 64)
+    range_sets = [
+        [(10, 20)],
+        [],
+        [(None, 5), (45, None)],
+        [(1, 30), (20, 40)],
+        [(100, 200)],
+    ]
+    arguments = [
+        PandasNumberSearchEngineArguments(
+            number_ranges=[_range(start, end) for start, end in ranges],
+        )
+        for ranges in range_sets
+    ]
+    engine = engine_type(file_path=str(csv_path), column_name="price")
+    prices = pd.read_csv(csv_path)["price"]
+
+    results = engine.search_many_blocking(arguments)
+
+    expected = [
+        list(
+            prices.index[
+                np.logical_or.reduce(
+                    [
+                        prices.between(
+                            -np.inf if start is None else start,
+                            np.inf if end is None else end,
+                        )
+                        for start, end in ranges
+                    ],
+                )
+            ],
+        )
+        if ranges
+        else list(prices.index)
+        for ranges in range_sets
+    ]
+    assert [list(result.to_index()) for result in results] == expected
+
+
+def test_row_group_pruning_is_rejected(csv_path: Path) -> None:
+    with pytest.raises(ValidationError, match="row_group_pruning"):
+        PandasSortedNumberSearchEngine(
+            file_path=str(csv_path),
+            column_name="price",
+            row_group_pruning=True,
+        )
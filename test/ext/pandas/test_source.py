@@ -0,0 +1,173 @@
+# ruff: noqa: D100, D103, S101
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from massivesearch.ext.pandas import source
+from massivesearch.ext.pandas.number import (
+    NumberRange,
+    PandasNumberSearchEngine,
+    PandasNumberSearchEngineArguments,
+)
+from massivesearch.ext.pandas.source import (
+    infer_file_format,
+    load_dataset,
+    read_parquet_row_groups,
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    path = tmp_path / "books.csv"
+    pd.DataFrame(
+        {"title": ["a", "b", "a"], "price": [1.5, 2.5, 3.5], "author": list("xyz")},
+    ).to_csv(path, index=False)
+    return path
+
+
+def test_load_dataset_projects_columns(csv_path: Path) -> None:
+    data = load_dataset(str(csv_path), ["title"], {"title": "category"})
+
+    assert list(data.columns) == ["title"]
+    assert isinstance(data["title"].dtype, pd.CategoricalDtype)
+
+
+def test_load_dataset_caches_projections_separately(csv_path: Path) -> None:
+    full = load_dataset(str(csv_path))
+    projected = load_dataset(str(csv_path), ["price"])
+
+    assert list(full.columns) == ["title", "price", "author"]
+    assert list(projected.columns) == ["price"]
+    assert load_dataset(str(csv_path), ["price"]) is projected
+
+
+def test_engine_loads_only_its_column(csv_path: Path) -> None:
+    engine = PandasNumberSearchEngine(
+        file_path=str(csv_path),
+        column_name="price",
+        dtype="float32",
+    )
+
+    data = engine.load_df()
+
+    assert list(data.columns) == ["price"]
+    assert data["price"].dtype == "float32"
+
+
+def test_engine_rejects_unknown_dtype(csv_path: Path) -> None:
+    with pytest.raises(ValidationError, match="Unknown dtype 'nope'"):
+        PandasNumberSearchEngine(
+            file_path=str(csv_path),
+            column_name="price",
+            dtype="nope",
+        )
+
+
+def test_infer_file_format() -> None:
+    assert infer_file_format("books.CSV") == "csv"
+    assert infer_file_format("books.parquet") == "parquet"
+    assert infer_file_format("books.feather") == "arrow"
+    assert infer_file_format("books.parquet.gz") == "parquet"
+    assert infer_file_format("books.txt") == "csv"
+    assert infer_file_format("books") == "csv"
+
+
+def test_load_compressed_csv(tmp_path: Path) -> None:
+    path = tmp_path / "books.csv.gz"
+    pd.DataFrame({"title": ["a", "b"], "price": [1.5, 2.5]}).to_csv(path, index=False)
+
+    engine = PandasNumberSearchEngine(file_path=str(path), column_name="price")
+    result = engine.search_blocking(
+        PandasNumberSearchEngineArguments(
+            number_ranges=[NumberRange(start_number=2, end_number=None)],
+        ),
+    )
+
+    assert engine.resolved_file_format() == "csv"
+    assert list(result.to_index()) == [1]
+
+
+def test_arrow_formats_require_pyarrow(tmp_path: Path) -> None:
+    path = tmp_path / "books.parquet"
+    path.touch()
+
+    with (
+        patch.dict(sys.modules, {"pyarrow": None}),
+        pytest.raises(ImportError, match="requires pyarrow"),
+    ):
+        load_dataset(str(path))
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_load_arrow_formats(tmp_path: Path, suffix: str) -> None:
+    pytest.importorskip("pyarrow")
+    path = tmp_path / f"books{suffix}"
+    data = pd.DataFrame({"title": ["a", "b"], "price": [1.5, 2.5]}, index=[7, 9])
+    if suffix == ".parquet":
+        data.to_parquet(path)
+    else:
+        data.reset_index().to_feather(path)
+
+    loaded = load_dataset(str(path), ["price"], {"price": "float32"})
+
+    assert list(loaded.columns) == ["price"]
+    assert list(loaded.index) == [0, 1]
+    assert loaded["price"].dtype == "float32"
+
+
+def test_number_engine_prunes_parquet_row_groups(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "books.parquet"
+    pd.DataFrame({"price": [float(i) for i in range(100)]}).to_parquet(
+        path,
+        row_group_size=10,
+    )
+    engine = PandasNumberSearchEngine(
+        file_path=str(path),
+        column_name="price",
+        row_group_pruning=True,
+    )
+    arguments = PandasNumberSearchEngineArguments(
+        number_ranges=[NumberRange(start_number=15, end_number=22)],
+    )
+
+    with patch(
+        "massivesearch.ext.pandas.number.read_parquet_row_groups",
+        wraps=read_parquet_row_groups,
+    ) as read:
+        result = engine.search_blocking(arguments)
+
+    assert list(result.to_index()) == list(range(15, 23))
+    assert read.call_args.args[2] == [1, 2]
+
+
+def test_parquet_row_groups_are_read_once(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "books.parquet"
+    pd.DataFrame({"price": [float(i) for i in range(30)]}).to_parquet(
+        path,
+        row_group_size=10,
+    )
+    engine = PandasNumberSearchEngine(
+        file_path=str(path),
+        column_name="price",
+        row_group_pruning=True,
+    )
+    arguments = PandasNumberSearchEngineArguments(
+        number_ranges=[NumberRange(start_number=15, end_number=22)],
+    )
+
+    with patch(
+        "massivesearch.ext.pandas.source._read_row_group",
+        wraps=source._read_row_group,  # noqa: SLF001
+    ) as read:
+        first = engine.search_blocking(arguments)
+        second = engine.search_blocking(arguments)
+
+    assert list(first.to_index()) == list(second.to_index()) == list(range(15, 23))
+    assert read.call_count == 2  # noqa: PLR2004
@@ -0,0 +1,114 @@
+# ruff: noqa: D100, D103, S101
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from massivesearch.ext.pandas.text import (
+    PandasTextSearchEngine,
+    PandasTextSearchEngineArguments,
+    SortedStrings,
+)
+
+TITLES = [
+    "The Little Prince",
+    "the lord of the rings",
+    None,
+    "Prince of Persia",
+    "",
+    "Café Société",
+    "Theory of Everything",
+]
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    path = tmp_path / "books.csv"
+    pd.DataFrame({"title": TITLES}).to_csv(path, index=False)
+    return path
+
+
+def _scan(csv_path: Path, strategy: str, keywords: list[str]) -> list[int]:
+    series = pd.read_csv(csv_path)["title"].str.lower()
+    method = series.str.startswith if strategy == "starts_with" else series.str.endswith
+    matches = method(tuple(keyword.lower() for keyword in keywords))
+    return list(series.index[matches.fillna(value=False).astype(bool)])
+
+
+@pytest.mark.parametrize("strategy", ["starts_with", "ends_with"])
+@pytest.mark.parametrize(
+    "keywords",
+    [["the"], ["THE L", "prince"], ["s", "é"], [""], [], ["missing"]],
+)
+def test_affix_strategies_match_scan(
+    csv_path: Path,
+    strategy: str,
+    keywords: list[str],
+) -> None:
+    engine = PandasTextSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        matching_strategy=strategy,
+    )
+    arguments = PandasTextSearchEngineArguments(keywords=keywords)
+
+    result = engine.search_blocking(arguments)
+
+    assert list(result.to_index()) == _scan(csv_path, strategy, keywords)
+
+
+def test_affix_index_is_shared_and_rebuilt_on_change(csv_path: Path) -> None:
+    engine = PandasTextSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        matching_strategy="starts_with",
+    )
+    engine.prepare()
+    affix_index = engine.load_affix_index()
+    assert engine.load_affix_index() is affix_index
+
+    pd.DataFrame({"title": ["Dune", "Dracula"]}).to_csv(csv_path, index=False)
+    arguments = PandasTextSearchEngineArguments(keywords=["dr"])
+
+    assert list(engine.search_blocking(arguments).to_index()) == [1]
+
+
+def test_prefix_positions_with_max_code_point() -> None:
+    top = chr(sys.maxunicode)
+    strings = SortedStrings.from_series(pd.Series(["a", f"a{top}", f"a{top}b", "b"]))
+
+    assert sorted(strings.prefix_positions(f"a{top}")) == [1, 2]
+    assert sorted(strings.prefix_positions("a")) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("strategy", ["exact", "contains", "starts_with"])
+def test_scoring_keeps_matches(csv_path: Path, strategy: str) -> None:
+    arguments = PandasTextSearchEngineArguments(keywords=["prince", "the"])
+    engine = PandasTextSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        matching_strategy=strategy,
+    )
+    scored = engine.model_copy(update={"scoring": True})
+
+    expected = engine.search_blocking(arguments)
+    result = scored.search_blocking(arguments)
+
+    assert list(result.to_index()) == list(expected.to_index())
+    assert (result.to_scores() > 0).all()
+
+
+def test_contains_scoring_counts_occurrences(csv_path: Path) -> None:
+    engine = PandasTextSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        matching_strategy="contains",
+        scoring=True,
+    )
+    arguments = PandasTextSearchEngineArguments(keywords=["the"])
+
+    scores = engine.search_blocking(arguments).to_scores()
+
+    assert scores.idxmax() == 1
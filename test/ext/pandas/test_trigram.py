@@ -0,0 +1,106 @@
+# ruff: noqa: D100, D103, S101
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from massivesearch.ext.pandas.text import (
+    PandasTextSearchEngine,
+    PandasTextSearchEngineArguments,
+)
+from massivesearch.ext.pandas.trigram import PandasTrigramSearchEngine
+
+TITLES = [
+    "The Little Prince",
+    "The Lord of the Rings",
+    None,
+    "Prince of Persia",
+    "",
+    "Café Société",
+    "prince (2nd ed.)",
+]
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    path = tmp_path / "books.csv"
+    pd.DataFrame({"title": TITLES}).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize(
+    "keywords",
+    [
+        ["prince"],
+        ["PRINCE", "rings"],
+        ["e p"],
+        ["of"],
+        ["é"],
+        ["société"],
+        ["nothing"],
+        [""],
+        [],
+        ["ed."],
+    ],
+)
+def test_matches_contains_strategy(csv_path: Path, keywords: list[str]) -> None:
+    arguments = PandasTextSearchEngineArguments(keywords=keywords)
+    trigram = PandasTrigramSearchEngine(file_path=str(csv_path), column_name="title")
+    scan = PandasTextSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        matching_strategy="contains",
+    )
+
+    expected = list(scan.search_blocking(arguments).to_index())
+
+    assert list(trigram.search_blocking(arguments).to_index()) == expected
+
+
+def test_regex_keywords_fall_back_to_scan(csv_path: Path) -> None:
+    arguments = PandasTextSearchEngineArguments(keywords=["lord|persia", "2nd e"])
+    engine = PandasTrigramSearchEngine(file_path=str(csv_path), column_name="title")
+
+    assert list(engine.search_blocking(arguments).to_index()) == [1, 3, 6]
+
+
+def test_index_is_saved_and_reloaded(csv_path: Path, tmp_path: Path) -> None:
+    index_path = tmp_path / "title.npz"
+    engine = PandasTrigramSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        index_path=str(index_path),
+    )
+    engine.prepare()
+
+    reloaded = PandasTrigramSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        index_path=str(index_path),
+    )
+    arguments = PandasTextSearchEngineArguments(keywords=["persia"])
+
+    assert list(reloaded.search_blocking(arguments).to_index()) == [3]
+
+
+def test_scoring_matches_scan(csv_path: Path) -> None:
+    arguments = PandasTextSearchEngineArguments(keywords=["prince", "of"])
+    trigram = PandasTrigramSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        scoring=True,
+    )
+    scan = PandasTextSearchEngine(
+        file_path=str(csv_path),
+        column_name="title",
+        matching_strategy="contains",
+        scoring=True,
+    )
+
+    expected = scan.search_blocking(arguments).to_scores()
+
+    pd.testing.assert_series_equal(
+        trigram.search_blocking(arguments).to_scores(),
+        expected,
+    )
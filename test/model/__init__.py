@@ -0,0 +1 @@
+"""Model Test."""
@@ -0,0 +1,120 @@
+# ruff: noqa: D100, D101, D102, D103, S101
+
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from pydantic import BaseModel
+
+from massivesearch.model.azure_openai import AzureOpenAIClient
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    client_ports: list[int] = []  # noqa: RUF012
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        StubHandler.client_ports.append(self.client_address[1])
+        if request.get("stream"):
+            self._stream()
+            return
+        body = json.dumps(
+            {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {
+                            "role": "assistant",
+                            "content": json.dumps({"answer": "ok"}),
+                        },
+                    },
+                ],
+            },
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self) -> None:
+        content = json.dumps({"answer": "ok"})
+        deltas = [content[:5], content[5:]]
+        chunks = [
+            {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"role": "assistant", "content": delta},
+                        "finish_reason": None if delta else "stop",
+                    },
+                ],
+            }
+            for delta in [*deltas, ""]
+        ]
+        body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks)
+        body = (body + "data: [DONE]\n\n").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def stub_endpoint() -> Iterator[str]:
+    StubHandler.client_ports = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_response_reuses_client_and_connection(stub_endpoint: str) -> None:
+    client = AzureOpenAIClient(endpoint=stub_endpoint, api_key="key", temperature=0)
+    messages = [{"role": "user", "content": "hi"}]
+
+    first = await client.response(messages, Answer)
+    shared_client = client._get_client()  # noqa: SLF001
+    second = await client.response(messages, Answer)
+
+    assert first == second == {"answer": "ok"}
+    assert client._get_client() is shared_client  # noqa: SLF001
+    assert len(StubHandler.client_ports) == 2  # noqa: PLR2004
+    assert len(set(StubHandler.client_ports)) == 1
+
+    await client.aclose()
+    assert client._client is None  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_response_stream_yields_content_deltas(stub_endpoint: str) -> None:
+    client = AzureOpenAIClient(endpoint=stub_endpoint, api_key="key", temperature=0)
+    messages = [{"role": "user", "content": "hi"}]
+
+    chunks = [chunk async for chunk in client.response_stream(messages, Answer)]
+
+    assert chunks == ['{"ans', 'wer": "ok"}']
+    await client.aclose()
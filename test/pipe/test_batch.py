@@ -0,0 +1,93 @@
+# ruff: noqa: D100, D101, D102, D103, D107, S101
+
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from massivesearch.index.base import BaseIndex
+from massivesearch.pipe.batch import SearchBatch
+from massivesearch.pipe.spec_index import MassiveSearchIndex
+from massivesearch.search_engine.base import BaseSearchEngine
+
+
+class Args(BaseModel):
+    name: str
+
+
+class NameEngine(BaseSearchEngine[Args, str]):
+    async def search(self, arguments: Args) -> str:
+        return arguments.name
+
+
+def _index() -> MassiveSearchIndex:
+    return MassiveSearchIndex(
+        name="names",
+        index=BaseIndex(name="names", type="index", description="names", examples=[]),
+        search_engine=NameEngine(),
+        search_engine_arguments_type=Args,
+    )
+
+
+class BlockingSearches:
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.cancelled = False
+
+    async def search(self, index: MassiveSearchIndex, arguments: Args) -> str:
+        return await index.search_engine.search(arguments)
+
+    async def search_many(
+        self,
+        index: MassiveSearchIndex,  # noqa: ARG002
+        arguments: list[Args],
+    ) -> list[str]:
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return [item.name for item in arguments]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_cancelled_with_its_last_consumer() -> None:
+    searches = BlockingSearches()
+    batch = SearchBatch(searches.search, searches.search_many)
+    index = _index()
+    consumers = [
+        asyncio.create_task(batch.add(index, Args(name=name))) for name in "aab"
+    ]
+    batch.start()
+    await searches.started.wait()
+
+    for consumer in consumers[:-1]:
+        consumer.cancel()
+    await asyncio.sleep(0)
+    assert not searches.cancelled
+
+    consumers[-1].cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert searches.cancelled
+
+
+@pytest.mark.asyncio
+async def test_batch_keeps_running_for_remaining_consumer() -> None:
+    searches = BlockingSearches()
+    batch = SearchBatch(searches.search, searches.search_many)
+    index = _index()
+    cancelled = asyncio.create_task(batch.add(index, Args(name="a")))
+    kept = asyncio.create_task(batch.add(index, Args(name="b")))
+    batch.start()
+    await searches.started.wait()
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    searches.release.set()
+
+    assert await kept == "b"
+    assert cancelled.cancelled()
+    assert not searches.cancelled
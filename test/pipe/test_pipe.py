@@ -1,10 +1,12 @@
 # ruff: noqa: D100, D101, D102, ARG002, D103, S101, SLF001, D107, ANN204
 
 import asyncio
+import json
 from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, patch
 
+import pandas as pd
 import pytest
 import yaml
 from pydantic import BaseModel, ConfigDict
@@ -13,13 +15,21 @@ from massivesearch.aggregator.base import (
     BaseAggregator,
     MassiveSearchTasks,
 )
+from massivesearch.ext.pandas.aggregator import PandasAggregator
+from massivesearch.ext.pandas.bool import BoolSearchEngine
+from massivesearch.ext.pandas.text import PandasTextSearchEngine
 from massivesearch.index.base import BaseIndex
+from massivesearch.index.bool import BasicBoolIndex
+from massivesearch.index.text import BasicTextIndex
 from massivesearch.model.base import BaseAIClient
 from massivesearch.pipe.pipe import MassiveSearchPipe
+from massivesearch.pipe.plan_cache import InMemoryPlanCache
 from massivesearch.pipe.spec_index import MassiveSearchIndex
+from massivesearch.pipe.validator import SpecSchemaError
 from massivesearch.search_engine.base import (
     BaseSearchEngine,
 )
+from massivesearch.search_engine.scheduler import SearchScheduler
 
 
 class MockIndex(BaseIndex):
@@ -76,6 +86,25 @@ class MockAIClient(BaseAIClient):
         }
 
 
+class MockStreamingAIClient(MockAIClient):
+    """Streams a plan of two sub-queries, waiting for `release` in between."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    release: asyncio.Event
+    second_query: dict
+
+    async def response_stream(
+        self,
+        messages: list,
+        format_model: type[BaseModel],
+    ) -> Any:  # noqa: ANN401
+        first = {"sub_query": "first", "mock_index": {"param1": "first"}}
+        yield f'{{"queries": [{json.dumps(first)}'
+        await asyncio.wait_for(self.release.wait(), timeout=1)
+        yield f", {json.dumps(self.second_query)}]}}"
+
+
 @pytest.fixture
 def pipe() -> MassiveSearchPipe:
     """Fixture for MassiveSearchPipe instance."""
@@ -136,7 +165,8 @@ def test_pipe_init_default(pipe: MassiveSearchPipe) -> None:
     assert "{index_context}" in pipe.prompt_template
     assert pipe.prompt == ""
     assert pipe.format_model is None
-    assert pipe.serach_query == []
+    assert pipe.executor is None
+    assert pipe.scheduler is None
 
 
 def test_pipe_init_custom_prompt() -> None:
@@ -229,6 +259,27 @@ def test_build_success(registered_pipe: MassiveSearchPipe, valid_spec: dict) ->
         mock_build_format_model.assert_called_once()
 
 
+def test_build_scheduler_from_spec(
+    registered_pipe: MassiveSearchPipe,
+    valid_spec: dict,
+) -> None:
+    valid_spec["scheduler"] = {"window_ms": 1, "max_batch_size": 8}
+
+    registered_pipe.build(valid_spec)
+
+    assert registered_pipe.scheduler == SearchScheduler(window_ms=1, max_batch_size=8)
+
+
+def test_build_invalid_scheduler_spec(
+    registered_pipe: MassiveSearchPipe,
+    valid_spec: dict,
+) -> None:
+    valid_spec["scheduler"] = {"window_ms": -1}
+
+    with pytest.raises(SpecSchemaError, match="Scheduler validation failed"):
+        registered_pipe.build(valid_spec)
+
+
 def test_build_no_spec(pipe: MassiveSearchPipe) -> None:
     with pytest.raises(ValueError, match="No schemas available to build."):
         pipe.build({})
@@ -515,7 +566,29 @@ async def test_build_query_success(built_pipe: MassiveSearchPipe) -> None:
             built_pipe.format_model,
         )
         assert result == mock_response_data["queries"]
-        assert built_pipe.serach_query == mock_response_data["queries"]
+
+
+@pytest.mark.asyncio
+async def test_build_query_plan_cache_hit(built_pipe: MassiveSearchPipe) -> None:
+    built_pipe.plan_cache = InMemoryPlanCache()
+    mock_response_data = {
+        "queries": [
+            {"sub_query": "ai sub query", "mock_index": {"param1": "ai_value"}},
+        ],
+    }
+
+    with patch(
+        "test.pipe.test_pipe.MockAIClient.response",
+        new_callable=AsyncMock,
+        return_value=mock_response_data,
+    ) as mock_ai_response:
+        first = await built_pipe.build_query("User  query")
+        second = await built_pipe.build_query("user query")
+
+    mock_ai_response.assert_awaited_once()
+    assert first == second == mock_response_data["queries"]
+    assert built_pipe.plan_cache.hits == 1
+    assert built_pipe.plan_cache.misses == 1
 
 
 @pytest.mark.asyncio
@@ -620,20 +693,51 @@ async def test_search_success(built_pipe: MassiveSearchPipe) -> None:
         assert isinstance(results[0]["mock_index"], asyncio.Task)
 
 
+@pytest.mark.asyncio
+async def test_search_task_deduplicates_identical_arguments(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    mock_search_queries = [
+        {"sub_query": "sub1", "mock_index": {"param1": "same"}},
+        {"sub_query": "sub2", "mock_index": {"param1": "same"}},
+        {"sub_query": "sub3", "mock_index": {"param1": "other"}},
+    ]
+
+    with (
+        patch.object(
+            built_pipe,
+            "build_query",
+            new_callable=AsyncMock,
+            return_value=mock_search_queries,
+        ),
+        patch.object(
+            built_pipe.indexs[0].search_engine,
+            "search",
+            return_value=MockSearchResultIndex(results=[]),
+        ) as mock_search,
+    ):
+        results = await built_pipe.search_task("query")
+        await asyncio.gather(*(tasks["mock_index"] for tasks in results))
+
+    assert mock_search.call_count == 2  # noqa: PLR2004
+    assert results[0]["mock_index"] is results[1]["mock_index"]
+    assert results[0]["mock_index"] is not results[2]["mock_index"]
+
+
 @pytest.mark.asyncio
 async def test_run_success(built_pipe: MassiveSearchPipe) -> None:
     query = "run query"
-    mock_search_results = [{"mock_index": MockSearchResultIndex(results=[])}]
+    mock_search_queries = [{"sub_query": "sub1", "mock_index": {"param1": "val1"}}]
     mock_agg_result = MockAggregatorResult(result="Final Answer")
 
-    # Mock search_task and aggregator.aggregate
+    # Mock build_query and aggregator.aggregate
     with (
         patch.object(
             built_pipe,
-            "search_task",
+            "build_query",
             new_callable=AsyncMock,
-            return_value=mock_search_results,
-        ) as mock_search_task,
+            return_value=mock_search_queries,
+        ) as mock_build,
         patch.object(
             built_pipe.aggregator,
             "aggregate",
@@ -643,6 +747,516 @@ async def test_run_success(built_pipe: MassiveSearchPipe) -> None:
     ):
         final_result = await built_pipe.run(query)
 
-        mock_search_task.assert_awaited_once_with(query)
-        mock_aggregate.assert_awaited_once_with(mock_search_results)
-        assert final_result == mock_agg_result
+        mock_build.assert_awaited_once_with(query)
+        mock_aggregate.assert_awaited_once()
+        tasks = mock_aggregate.call_args[0][0]
+        assert len(tasks) == 1
+        assert "mock_index" in tasks[0]
+        assert final_result.query == query
+        assert final_result.queries == mock_search_queries
+        assert final_result.result == mock_agg_result
+        assert len(final_result.search_timings) == 1
+        assert set(final_result.timings) == {
+            "build_query",
+            "search_and_aggregate",
+            "total",
+        }
+
+
+@pytest.mark.asyncio
+async def test_run_stream_yields_aggregated_result(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    results = [result async for result in built_pipe.run_stream("stream query")]
+
+    assert len(results) == 1
+    assert results[0].result == "Aggregated"
+
+
+@pytest.mark.asyncio
+async def test_run_stream_cancels_searches_when_closed_early(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    search_tasks: list[MassiveSearchTasks] = []
+
+    async def aggregate_stream(tasks: MassiveSearchTasks) -> Any:  # noqa: ANN401
+        search_tasks.append(tasks)
+        yield "first"
+        await asyncio.sleep(10)
+
+    async def slow_search(
+        arguments: MockSearchEngineArgs,  # noqa: ARG001
+    ) -> MockSearchResultIndex:
+        await asyncio.sleep(10)
+        return MockSearchResultIndex(results=[])
+
+    with (
+        patch.object(built_pipe.aggregator, "aggregate_stream", aggregate_stream),
+        patch.object(built_pipe.indexs[0].search_engine, "search", slow_search),
+    ):
+        stream = built_pipe.run_stream("stream query")
+        assert await anext(stream) == "first"
+        await asyncio.sleep(0)
+        await stream.aclose()
+
+    search_task = search_tasks[0][0]["mock_index"]
+    await asyncio.sleep(0)
+    assert search_task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_stream_plan_starts_searches_before_plan_completes(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    release = asyncio.Event()
+    searched: list[str] = []
+
+    async def search(arguments: MockSearchEngineArgs) -> MockSearchResultIndex:
+        searched.append(arguments.param1)
+        release.set()
+        return MockSearchResultIndex(results=[])
+
+    built_pipe.stream_plan = True
+    built_pipe.plan_cache = InMemoryPlanCache()
+    built_pipe.ai_client = MockStreamingAIClient(
+        release=release,
+        second_query={"sub_query": "second", "mock_index": {"param1": "second"}},
+    )
+    with patch.object(built_pipe.indexs[0].search_engine, "search", search):
+        result = await built_pipe.run("query")
+        cached = await built_pipe.run("query")
+
+    assert [query["sub_query"] for query in result.queries] == ["first", "second"]
+    # The plan only completes once the search of the first sub-query has run.
+    assert searched[0] == "first"
+    assert cached.queries == result.queries
+    assert built_pipe.plan_cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_plan_invalid_query_cancels_started_searches(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    release = asyncio.Event()
+    searches: list[asyncio.Task] = []
+
+    async def search(
+        arguments: MockSearchEngineArgs,  # noqa: ARG001
+    ) -> MockSearchResultIndex:
+        searches.append(asyncio.current_task())
+        release.set()
+        await asyncio.sleep(10)
+        return MockSearchResultIndex(results=[])
+
+    built_pipe.stream_plan = True
+    built_pipe.ai_client = MockStreamingAIClient(
+        release=release,
+        second_query={"sub_query": "second"},
+    )
+    with (
+        patch.object(built_pipe.indexs[0].search_engine, "search", search),
+        pytest.raises(ValueError, match="valid query"),
+    ):
+        await built_pipe.run("query")
+
+    await asyncio.sleep(0)
+    assert len(searches) == 1
+    assert searches[0].cancelled()
+
+
+async def _plan_first_letter(
+    messages: list[dict[str, str]],
+    format_model: type[BaseModel],  # noqa: ARG001
+) -> dict:
+    query = messages[-1]["content"]
+    if query == "fail":
+        msg = "AI client failed"
+        raise RuntimeError(msg)
+    await asyncio.sleep(0.01)
+    return {"queries": [{"sub_query": query, "mock_index": {"param1": query[0]}}]}
+
+
+async def _await_searches(tasks: MassiveSearchTasks) -> list:
+    return [await task for sub_query in tasks for task in sub_query.values()]
+
+
+@pytest.mark.asyncio
+async def test_run_many_shares_searches_across_queries(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    batches: list[list[str]] = []
+
+    async def search_many(arguments: list[MockSearchEngineArgs]) -> list:
+        batches.append([item.param1 for item in arguments])
+        return [f"result {item.param1}" for item in arguments]
+
+    queries = ["apple", "avocado", "fail", "banana", "apple"]
+    with (
+        patch(
+            "test.pipe.test_pipe.MockAIClient.response",
+            new_callable=AsyncMock,
+            side_effect=_plan_first_letter,
+        ) as mock_response,
+        patch.object(built_pipe.indexs[0].search_engine, "search_many", search_many),
+        patch.object(built_pipe.aggregator, "aggregate", _await_searches),
+    ):
+        outcomes = await built_pipe.run_many(queries)
+
+    assert mock_response.await_count == 4  # noqa: PLR2004
+    assert batches == [["a", "b"]]
+    assert isinstance(outcomes[2], ValueError)
+    successes = [outcomes[i] for i in (0, 1, 3, 4)]
+    assert [outcome.query for outcome in successes] == [
+        "apple",
+        "avocado",
+        "banana",
+        "apple",
+    ]
+    assert [outcome.result for outcome in successes] == [
+        ["result a"],
+        ["result a"],
+        ["result b"],
+        ["result a"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_batches_distinct_arguments_of_an_index(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    batches: list[list[str]] = []
+
+    async def search_many(arguments: list[MockSearchEngineArgs]) -> list:
+        batches.append([item.param1 for item in arguments])
+        return [f"result {item.param1}" for item in arguments]
+
+    mock_search_queries = [
+        {"sub_query": "sub1", "mock_index": {"param1": "a"}},
+        {"sub_query": "sub2", "mock_index": {"param1": "b"}},
+        {"sub_query": "sub3", "mock_index": {"param1": "a"}},
+    ]
+    with (
+        patch.object(
+            built_pipe,
+            "build_query",
+            new_callable=AsyncMock,
+            return_value=mock_search_queries,
+        ),
+        patch.object(built_pipe.indexs[0].search_engine, "search_many", search_many),
+        patch.object(built_pipe.aggregator, "aggregate", _await_searches),
+    ):
+        result = await built_pipe.run("query")
+
+    assert batches == [["a", "b"]]
+    assert result.result == ["result a", "result b", "result a"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_batches_searches_of_concurrent_runs(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    batches: list[list[str]] = []
+
+    async def search_many(arguments: list[MockSearchEngineArgs]) -> list:
+        batches.append([item.param1 for item in arguments])
+        return [f"result {item.param1}" for item in arguments]
+
+    built_pipe.scheduler = SearchScheduler(window_ms=5)
+    with (
+        patch(
+            "test.pipe.test_pipe.MockAIClient.response",
+            new_callable=AsyncMock,
+            side_effect=_plan_first_letter,
+        ),
+        patch.object(built_pipe.indexs[0].search_engine, "search_many", search_many),
+        patch.object(built_pipe.aggregator, "aggregate", _await_searches),
+    ):
+        results = await asyncio.gather(
+            *(built_pipe.run(query) for query in ["apple", "banana", "avocado"]),
+        )
+
+    assert batches == [["a", "b"]]
+    assert [result.result for result in results] == [
+        ["result a"],
+        ["result b"],
+        ["result a"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_batches_search_many_of_concurrent_runs(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    batches: list[list[str]] = []
+
+    async def search_many(arguments: list[MockSearchEngineArgs]) -> list:
+        batches.append([item.param1 for item in arguments])
+        return [f"result {item.param1}" for item in arguments]
+
+    async def response(
+        messages: list[dict[str, str]],
+        format_model: type[BaseModel],  # noqa: ARG001
+    ) -> dict:
+        query = messages[-1]["content"]
+        return {
+            "queries": [
+                {"sub_query": letter, "mock_index": {"param1": letter}}
+                for letter in query
+            ],
+        }
+
+    built_pipe.scheduler = SearchScheduler(window_ms=5)
+    with (
+        patch(
+            "test.pipe.test_pipe.MockAIClient.response",
+            new_callable=AsyncMock,
+            side_effect=response,
+        ),
+        patch.object(built_pipe.indexs[0].search_engine, "search_many", search_many),
+        patch.object(built_pipe.aggregator, "aggregate", _await_searches),
+    ):
+        first, second = await asyncio.gather(
+            built_pipe.run("ab"),
+            built_pipe.run("c"),
+        )
+
+    assert [sorted(batch) for batch in batches] == [["a", "b", "c"]]
+    assert first.result == ["result a", "result b"]
+    assert second.result == ["result c"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["inline", "thread"])
+@pytest.mark.parametrize("staged_search", [True, False])
+async def test_run_skips_expensive_search_only_when_staged(
+    tmp_path: Path,
+    mode: str,
+    staged_search: bool,  # noqa: FBT001
+) -> None:
+    path = tmp_path / "books.csv"
+    pd.DataFrame(
+        {"title": ["The Little Prince", "The Lord"], "in_stock": [False, False]},
+    ).to_csv(path, index=False)
+    pandas_pipe = MassiveSearchPipe[pd.DataFrame]()
+    pandas_pipe.register_index_type("text_index", BasicTextIndex)
+    pandas_pipe.register_index_type("bool_index", BasicBoolIndex)
+    pandas_pipe.register_search_engine_type("text_search", PandasTextSearchEngine)
+    pandas_pipe.register_search_engine_type("bool_search", BoolSearchEngine)
+    pandas_pipe.register_aggregator_type("aggregator", PandasAggregator)
+    pandas_pipe.register_ai_client_type("mock_ai", MockAIClient)
+    pandas_pipe.build(
+        {
+            "indexs": [
+                {
+                    "name": "title",
+                    "type": "text_index",
+                    "description": "Book title",
+                    "examples": ["prince"],
+                    "search_engine": {
+                        "type": "text_search",
+                        "file_path": str(path),
+                        "column_name": "title",
+                        "matching_strategy": "contains",
+                    },
+                },
+                {
+                    "name": "in_stock",
+                    "type": "bool_index",
+                    "description": "Whether the book is in stock",
+                    "examples": ["true"],
+                    "search_engine": {
+                        "type": "bool_search",
+                        "file_path": str(path),
+                        "column_name": "in_stock",
+                    },
+                },
+            ],
+            "aggregator": {
+                "type": "aggregator",
+                "file_path": str(path),
+                "staged_search": staged_search,
+            },
+            "ai_client": {"type": "mock_ai"},
+            "executor": {"mode": mode},
+        },
+    )
+    plan = {
+        "queries": [
+            {
+                "sub_query": "princes in stock",
+                "title": {"keywords": ["prince"]},
+                "in_stock": {"select_true": True, "select_false": False},
+            },
+        ],
+    }
+
+    with (
+        patch(
+            "test.pipe.test_pipe.MockAIClient.response",
+            new_callable=AsyncMock,
+            return_value=plan,
+        ),
+        patch.object(
+            PandasTextSearchEngine,
+            "search_blocking",
+            autospec=True,
+            side_effect=PandasTextSearchEngine.search_blocking,
+        ) as text_search,
+    ):
+        result = await pandas_pipe.run("query")
+    pandas_pipe.close()
+
+    assert text_search.called is not staged_search
+    assert result.result.empty
+
+
+@pytest.mark.asyncio
+async def test_run_many_bounds_ai_client_calls(built_pipe: MassiveSearchPipe) -> None:
+    in_flight = 0
+    max_in_flight = 0
+
+    async def response(
+        messages: list[dict[str, str]],
+        format_model: type[BaseModel],
+    ) -> dict:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            return await _plan_first_letter(messages, format_model)
+        finally:
+            in_flight -= 1
+
+    with patch(
+        "test.pipe.test_pipe.MockAIClient.response",
+        new_callable=AsyncMock,
+        side_effect=response,
+    ):
+        outcomes = await built_pipe.run_many([str(i) for i in range(6)], concurrency=2)
+
+    assert max_in_flight == 2  # noqa: PLR2004
+    assert [outcome.query for outcome in outcomes] == [str(i) for i in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_run_many_searches_in_windows_of_concurrency(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    batches: list[list[str]] = []
+
+    async def search_many(arguments: list[MockSearchEngineArgs]) -> list:
+        batches.append([item.param1 for item in arguments])
+        return [f"result {item.param1}" for item in arguments]
+
+    with (
+        patch(
+            "test.pipe.test_pipe.MockAIClient.response",
+            new_callable=AsyncMock,
+            side_effect=_plan_first_letter,
+        ),
+        patch.object(built_pipe.indexs[0].search_engine, "search_many", search_many),
+        patch.object(built_pipe.aggregator, "aggregate", _await_searches),
+    ):
+        outcomes = await built_pipe.run_many([str(i) for i in range(6)], concurrency=2)
+
+    assert batches == [["0", "1"], ["2", "3"], ["4", "5"]]
+    assert [outcome.result for outcome in outcomes] == [
+        [f"result {i}"] for i in range(6)
+    ]
+    assert all(outcome.search_results == [] for outcome in outcomes)
+
+
+@pytest.mark.asyncio
+async def test_run_many_failed_batch_falls_back_to_single_searches(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    async def search_many(
+        arguments: list[MockSearchEngineArgs],  # noqa: ARG001
+    ) -> list:
+        msg = "batch failed"
+        raise RuntimeError(msg)
+
+    async def search(arguments: MockSearchEngineArgs) -> str:
+        if arguments.param1 == "b":
+            msg = "bad arguments"
+            raise RuntimeError(msg)
+        return f"result {arguments.param1}"
+
+    with (
+        patch(
+            "test.pipe.test_pipe.MockAIClient.response",
+            new_callable=AsyncMock,
+            side_effect=_plan_first_letter,
+        ),
+        patch.object(built_pipe.indexs[0].search_engine, "search_many", search_many),
+        patch.object(built_pipe.indexs[0].search_engine, "search", search),
+        patch.object(built_pipe.aggregator, "aggregate", _await_searches),
+    ):
+        apple, banana = await built_pipe.run_many(["apple", "banana"])
+
+    assert apple.result == ["result a"]
+    assert isinstance(banana, RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_run_many_shares_fallback_of_same_arguments(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    searched: list[str] = []
+
+    async def search_many(
+        arguments: list[MockSearchEngineArgs],  # noqa: ARG001
+    ) -> list:
+        msg = "batch failed"
+        raise RuntimeError(msg)
+
+    async def search(arguments: MockSearchEngineArgs) -> str:
+        searched.append(arguments.param1)
+        return f"result {arguments.param1}"
+
+    with (
+        patch(
+            "test.pipe.test_pipe.MockAIClient.response",
+            new_callable=AsyncMock,
+            side_effect=_plan_first_letter,
+        ),
+        patch.object(built_pipe.indexs[0].search_engine, "search_many", search_many),
+        patch.object(built_pipe.indexs[0].search_engine, "search", search),
+        patch.object(built_pipe.aggregator, "aggregate", _await_searches),
+    ):
+        outcomes = await built_pipe.run_many(["apple", "avocado", "banana"])
+
+    assert [outcome.result for outcome in outcomes] == [
+        ["result a"],
+        ["result a"],
+        ["result b"],
+    ]
+    assert sorted(searched) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_run_concurrent_requests_keep_own_queries(
+    built_pipe: MassiveSearchPipe,
+) -> None:
+    async def response(
+        messages: list[dict[str, str]],
+        format_model: type[BaseModel],  # noqa: ARG001
+    ) -> dict:
+        query = messages[-1]["content"]
+        await asyncio.sleep(0.01 if query == "first" else 0)
+        return {
+            "queries": [{"sub_query": query, "mock_index": {"param1": query}}],
+        }
+
+    with patch(
+        "test.pipe.test_pipe.MockAIClient.response",
+        new_callable=AsyncMock,
+        side_effect=response,
+    ):
+        first, second = await asyncio.gather(
+            built_pipe.run("first"),
+            built_pipe.run("second"),
+        )
+
+    assert first.queries[0]["sub_query"] == "first"
+    assert second.queries[0]["sub_query"] == "second"
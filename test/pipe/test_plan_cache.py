@@ -0,0 +1,120 @@
+# ruff: noqa: D100, D103, S101, PLR2004
+
+from itertools import count
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from massivesearch.pipe.plan_cache import (
+    BasePlanCache,
+    InMemoryPlanCache,
+    SemanticPlanCache,
+    SQLitePlanCache,
+    create_plan_cache,
+    normalize_query,
+)
+
+PLAN = {"queries": [{"sub_query": "books", "title": {"keywords": ["prince"]}}]}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def plan_cache(request: pytest.FixtureRequest, tmp_path: Path) -> BasePlanCache:
+    if request.param == "memory":
+        return InMemoryPlanCache(max_size=2, ttl=60)
+    return SQLitePlanCache(path=str(tmp_path / "plans.db"), max_size=2, ttl=60)
+
+
+def test_normalize_query() -> None:
+    assert normalize_query("  Books about\tPRINCES ") == "books about princes"
+
+
+def test_get_set(plan_cache: BasePlanCache) -> None:
+    assert plan_cache.get("Books about princes", "fp") is None
+
+    plan_cache.set("Books about princes", "fp", PLAN)
+
+    assert plan_cache.get("books  about princes", "fp") == PLAN
+    assert plan_cache.get("books about princes", "other-fp") is None
+    assert plan_cache.hits == 1
+    assert plan_cache.misses == 2
+
+
+def test_expired_plan_is_a_miss(plan_cache: BasePlanCache) -> None:
+    plan_cache.set("query", "fp", PLAN)
+
+    with patch("massivesearch.pipe.plan_cache.time.time", return_value=1e12):
+        assert plan_cache.get("query", "fp") is None
+
+
+def test_least_recently_used_plan_is_evicted(plan_cache: BasePlanCache) -> None:
+    with patch("massivesearch.pipe.plan_cache.time.time", side_effect=count(1)):
+        plan_cache.set("first", "fp", PLAN)
+        plan_cache.set("second", "fp", PLAN)
+        plan_cache.get("first", "fp")
+        plan_cache.set("third", "fp", PLAN)
+
+        assert plan_cache.get("second", "fp") is None
+        assert plan_cache.get("first", "fp") == PLAN
+        assert plan_cache.get("third", "fp") == PLAN
+
+
+def test_sqlite_plans_survive_reopen(tmp_path: Path) -> None:
+    path = str(tmp_path / "plans.db")
+    first = SQLitePlanCache(path=path)
+    first.set("query", "fp", PLAN)
+    first.close()
+
+    assert SQLitePlanCache(path=path).get("query", "fp") == PLAN
+
+
+def test_semantic_cache_reuses_plan_of_similar_query() -> None:
+    plan_cache = SemanticPlanCache(threshold=0.7)
+    plan_cache.set("books about princes under $30", "fp", PLAN)
+
+    assert plan_cache.get("princes books under 30 dollars", "fp") == PLAN
+    assert plan_cache.get("cookbooks with vegan recipes", "fp") is None
+    assert plan_cache.get("books about princes under $30", "other-fp") is None
+
+
+def test_semantic_cache_requires_same_numbers() -> None:
+    plan_cache = SemanticPlanCache(threshold=0.7)
+    plan_cache.set("books about princes under $30", "fp", PLAN)
+
+    assert plan_cache.get("books about princes under $20", "fp") is None
+
+
+def test_semantic_cache_reuses_plan_of_paraphrase() -> None:
+    plan_cache = SemanticPlanCache()
+    plan_cache.set("books about princes under $30", "fp", PLAN)
+
+    assert plan_cache.get("prince books, max 30 dollars", "fp") == PLAN
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "books not about princes under $30",
+        "books about princes over $30",
+        "books without princes under $30",
+    ],
+)
+def test_semantic_cache_requires_same_negations_and_comparisons(query: str) -> None:
+    plan_cache = SemanticPlanCache(threshold=0.7)
+    plan_cache.set("books about princes under $30", "fp", PLAN)
+
+    assert plan_cache.get(query, "fp") is None
+
+
+def test_semantic_cache_replaces_oldest_plan_when_full() -> None:
+    plan_cache = SemanticPlanCache(max_size=2)
+    for query in ["first query", "second query", "third query"]:
+        plan_cache.set(query, "fp", {"query": query})
+
+    assert plan_cache.get("first query", "fp") is None
+    assert plan_cache.get("third query", "fp") == {"query": "third query"}
+
+
+def test_create_plan_cache_unknown_type() -> None:
+    with pytest.raises(ValueError, match="Plan cache type 'redis' is unknown"):
+        create_plan_cache({"type": "redis"})
@@ -0,0 +1,39 @@
+# ruff: noqa: D100, D103, S101
+
+import json
+
+import pytest
+
+from massivesearch.pipe.plan_stream import QueryPlanStreamParser
+
+PLAN = {
+    "note": "queries",
+    "nested": {"queries": [{"ignored": True}]},
+    "queries": [
+        {"sub_query": 'say "hi" [1]', "title": {"keywords": ["{", "\\"]}},
+        {"sub_query": "second", "price": {"ranges": [[1, 2], [3, None]]}},
+    ],
+    "after": [{"ignored": True}],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_feed_returns_queries_as_they_complete(chunk_size: int) -> None:
+    text = json.dumps(PLAN)
+    parser = QueryPlanStreamParser()
+
+    completed = [
+        parser.feed(text[start : start + chunk_size])
+        for start in range(0, len(text), chunk_size)
+    ]
+
+    assert [query for queries in completed for query in queries] == PLAN["queries"]
+    assert parser.text == text
+
+
+def test_query_is_returned_before_the_response_ends() -> None:
+    parser = QueryPlanStreamParser()
+
+    assert parser.feed('{"queries": [{"sub_query": "a"}') == [{"sub_query": "a"}]
+    assert parser.feed(', {"sub_query"') == []
+    assert parser.feed(': "b"}]}') == [{"sub_query": "b"}]
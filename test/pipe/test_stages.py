@@ -0,0 +1,95 @@
+# ruff: noqa: D100, D101, D102, D103, S101
+
+import asyncio
+from collections.abc import Awaitable
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from massivesearch.index.base import BaseIndex
+from massivesearch.pipe.spec_index import MassiveSearchIndex
+from massivesearch.pipe.stages import PendingSearch, SearchStages
+from massivesearch.search_engine.base import BaseSearchEngine
+
+
+class Args(BaseModel):
+    rows: list[int]
+
+
+class CostEngine(BaseSearchEngine[Args, list[int]]):
+    cost: float
+
+    def search_cost(self) -> float:
+        return self.cost
+
+    async def search(self, arguments: Args) -> list[int]:
+        return arguments.rows
+
+
+def _index(name: str, cost: float) -> MassiveSearchIndex:
+    return MassiveSearchIndex(
+        name=name,
+        index=BaseIndex(name=name, type="index", description=name, examples=[]),
+        search_engine=CostEngine(cost=cost),
+        search_engine_arguments_type=Args,
+    )
+
+
+def _matches_nothing(results: list[Any]) -> bool:
+    return any(len(result) == 0 for result in results)
+
+
+@pytest.mark.asyncio
+async def test_costly_search_waits_and_is_skipped_when_ruled_out() -> None:
+    cheap, costly = _index("cheap", 0.1), _index("costly", 1.0)
+    searched: list[str] = []
+
+    def search(index: MassiveSearchIndex, arguments: Args) -> Awaitable[list[int]]:
+        searched.append(index.name)
+        return index.search_engine.search(arguments)
+
+    stages = SearchStages(search, _matches_nothing)
+    started: dict[tuple[str, str], PendingSearch] = {}
+    ruled_out = stages.add(
+        [(cheap, Args(rows=[])), (costly, Args(rows=[1]))],
+        started,
+        {},
+    )
+    kept = stages.add(
+        [(cheap, Args(rows=[2])), (costly, Args(rows=[3]))],
+        started,
+        {},
+    )
+    stages.start()
+
+    assert searched == ["cheap", "cheap"]
+    assert await kept["costly"] == [3]
+    await asyncio.sleep(0)
+    assert ruled_out["costly"].cancelled()
+    assert searched == ["cheap", "cheap", "costly"]
+
+
+@pytest.mark.asyncio
+async def test_shared_search_runs_while_a_sub_query_needs_it() -> None:
+    cheap, costly = _index("cheap", 0.1), _index("costly", 1.0)
+
+    def search(index: MassiveSearchIndex, arguments: Args) -> Awaitable[list[int]]:
+        return index.search_engine.search(arguments)
+
+    stages = SearchStages(search, _matches_nothing)
+    started: dict[tuple[str, str], PendingSearch] = {}
+    first = stages.add(
+        [(cheap, Args(rows=[])), (costly, Args(rows=[1]))],
+        started,
+        {},
+    )
+    second = stages.add(
+        [(cheap, Args(rows=[2])), (costly, Args(rows=[1]))],
+        started,
+        {},
+    )
+    stages.start()
+
+    assert first["costly"] is second["costly"]
+    assert await second["costly"] == [1]
@@ -0,0 +1,67 @@
+# ruff: noqa: D100, D101, D102, D103
+
+import pandas as pd
+import pytest
+from pydantic import BaseModel
+
+from massivesearch.ext.pandas.aggregator import PandasAggregator
+from massivesearch.ext.pandas.bitmap import RowBitmap
+from massivesearch.index.base import BaseIndex
+from massivesearch.pipe.spec_index import MassiveSearchIndex
+from massivesearch.pipe.validator import validate_pipe_search_result_index
+from massivesearch.search_engine.base import BaseSearchEngine
+
+
+class Args(BaseModel):
+    rows: list[int]
+
+
+class BitmapSearchEngine(BaseSearchEngine[Args, RowBitmap]):
+    async def search(self, arguments: Args) -> RowBitmap:
+        return RowBitmap.from_positions(pd.RangeIndex(3), arguments.rows)
+
+
+class IndexSearchEngine(BaseSearchEngine[Args, pd.Index]):
+    async def search(self, arguments: Args) -> pd.Index:
+        return pd.Index(arguments.rows)
+
+
+class SeriesSearchEngine(BaseSearchEngine[Args, pd.Series]):
+    async def search(self, arguments: Args) -> pd.Series:
+        return pd.Series(arguments.rows)
+
+
+def _index(name: str, search_engine: BaseSearchEngine) -> MassiveSearchIndex:
+    return MassiveSearchIndex(
+        name=name,
+        index=BaseIndex(name=name, type="index", description=name, examples=[]),
+        search_engine=search_engine,
+        search_engine_arguments_type=Args,
+    )
+
+
+def test_accepts_members_of_aggregator_result_union() -> None:
+    indexs = [
+        _index("bitmap", BitmapSearchEngine()),
+        _index("index", IndexSearchEngine()),
+    ]
+
+    validate_pipe_search_result_index(
+        indexs,
+        PandasAggregator(file_path="books.csv"),
+        pd.DataFrame,
+    )
+
+
+def test_rejects_result_type_outside_aggregator_union() -> None:
+    indexs = [
+        _index("bitmap", BitmapSearchEngine()),
+        _index("series", SeriesSearchEngine()),
+    ]
+
+    with pytest.raises(TypeError, match="search return type of series"):
+        validate_pipe_search_result_index(
+            indexs,
+            PandasAggregator(file_path="books.csv"),
+            pd.DataFrame,
+        )
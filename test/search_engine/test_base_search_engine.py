@@ -199,3 +199,18 @@ def test_format_field_header() -> None:
         )
         == "  field4: Desc 4 (examples: True)"
     )
+
+
+class EchoSearchEngine(BaseSearchEngine[SimpleArgs, str]):
+    """Search engine returning the query."""
+
+    async def search(self, arguments: SimpleArgs) -> str:
+        return arguments.query
+
+
+@pytest.mark.asyncio
+async def test_search_many_returns_one_result_per_arguments():
+    engine = EchoSearchEngine()
+    arguments = [SimpleArgs(query="b"), SimpleArgs(query="a"), SimpleArgs(query="b")]
+
+    assert await engine.search_many(arguments) == ["b", "a", "b"]
@@ -0,0 +1,86 @@
+# ruff: noqa: D100, D101, D102, D103, S101, PLR2004
+
+import asyncio
+from collections.abc import Hashable
+
+import pandas as pd
+import pytest
+from pydantic import BaseModel, PrivateAttr
+
+from massivesearch.search_engine.base import BaseSearchEngine
+from massivesearch.search_engine.cache import SearchResultCache, result_nbytes
+
+
+class RangeArgs(BaseModel):
+    stop: int
+
+
+class CountingSearchEngine(BaseSearchEngine[RangeArgs, pd.Index]):
+    version: int = 0
+    _calls: int = PrivateAttr(default=0)
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    def data_version(self) -> Hashable:
+        return self.version
+
+    async def search(self, arguments: RangeArgs) -> pd.Index:
+        self._calls += 1
+        await asyncio.sleep(0)
+        return pd.Index(range(arguments.stop))
+
+
+@pytest.mark.asyncio
+async def test_search_is_cached_by_arguments() -> None:
+    cache = SearchResultCache()
+    engine = CountingSearchEngine()
+
+    first = await cache.search(engine, RangeArgs(stop=3))
+    second = await cache.search(engine, RangeArgs(stop=3))
+    other = await cache.search(engine, RangeArgs(stop=4))
+
+    assert first is second
+    assert len(other) == 4
+    assert engine.calls == 2
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_data_version_change_invalidates_results() -> None:
+    cache = SearchResultCache()
+    engine = CountingSearchEngine()
+
+    await cache.search(engine, RangeArgs(stop=3))
+    engine.version = 1
+    await cache.search(engine, RangeArgs(stop=3))
+
+    assert engine.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_search() -> None:
+    cache = SearchResultCache()
+    engine = CountingSearchEngine()
+
+    results = await asyncio.gather(
+        *(cache.search(engine, RangeArgs(stop=3)) for _ in range(5)),
+    )
+
+    assert engine.calls == 1
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_results_are_evicted_over_max_bytes() -> None:
+    engine = CountingSearchEngine()
+    cache = SearchResultCache(max_bytes=result_nbytes(pd.Index(range(100))))
+
+    await cache.search(engine, RangeArgs(stop=100))
+    await cache.search(engine, RangeArgs(stop=50))
+    await cache.search(engine, RangeArgs(stop=100))
+
+    assert engine.calls == 3
+    assert cache.total_bytes <= cache.max_bytes
@@ -0,0 +1,65 @@
+# ruff: noqa: D100, D101, D102, D103, S101, PLR2004
+
+import asyncio
+import os
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from massivesearch.search_engine.base import BaseSearchEngine
+from massivesearch.search_engine.executor import SearchExecutor
+
+
+class SleepArgs(BaseModel):
+    seconds: float
+
+
+class SleepSearchEngine(BaseSearchEngine[SleepArgs, int]):
+    async def search(self, arguments: SleepArgs) -> int:
+        return await self.run_blocking(self.search_blocking, arguments)
+
+    def search_blocking(self, arguments: SleepArgs) -> int:
+        time.sleep(arguments.seconds)
+        return os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_without_executor_runs_inline() -> None:
+    engine = SleepSearchEngine()
+
+    assert await engine.search(SleepArgs(seconds=0)) == os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_thread_executor_runs_searches_concurrently() -> None:
+    executor = SearchExecutor(mode="thread", max_workers=4)
+    engine = SleepSearchEngine()
+    engine.bind_executor(executor)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(engine.search(SleepArgs(seconds=0.2)) for _ in range(4)))
+    elapsed = time.perf_counter() - start
+    executor.shutdown()
+
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_process_executor_runs_in_worker_process() -> None:
+    executor = SearchExecutor(mode="process", max_workers=1)
+    engine = SleepSearchEngine()
+    engine.bind_executor(executor)
+
+    pid = await engine.search(SleepArgs(seconds=0))
+    executor.shutdown()
+
+    assert pid != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_process_executor_requires_bound_method() -> None:
+    executor = SearchExecutor(mode="process")
+
+    with pytest.raises(TypeError, match="bound to a search engine"):
+        await executor.run(lambda arguments: arguments, SleepArgs(seconds=0))
@@ -0,0 +1,117 @@
+# ruff: noqa: D100, D101, D102, D103, S101
+
+import asyncio
+
+import pytest
+from pydantic import BaseModel, PrivateAttr
+
+from massivesearch.search_engine.base import BaseSearchEngine
+from massivesearch.search_engine.scheduler import SearchScheduler
+
+
+class NameArgs(BaseModel):
+    name: str
+
+
+class BatchingSearchEngine(BaseSearchEngine[NameArgs, str]):
+    _batches: list[list[str]] = PrivateAttr(default_factory=list)
+
+    @property
+    def batches(self) -> list[list[str]]:
+        return self._batches
+
+    async def search(self, arguments: NameArgs) -> str:
+        if arguments.name == "bad":
+            msg = "bad arguments"
+            raise RuntimeError(msg)
+        await asyncio.sleep(0)
+        return f"result {arguments.name}"
+
+    async def search_many(self, arguments: list[NameArgs]) -> list[str]:
+        self._batches.append([item.name for item in arguments])
+        if any(item.name == "bad" for item in arguments):
+            msg = "batch failed"
+            raise RuntimeError(msg)
+        return [f"result {item.name}" for item in arguments]
+
+
+class ShortBatchSearchEngine(BatchingSearchEngine):
+    async def search_many(self, arguments: list[NameArgs]) -> list[str]:  # noqa: ARG002
+        return ["only one"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_share_one_batch() -> None:
+    scheduler = SearchScheduler(window_ms=5)
+    engine = BatchingSearchEngine()
+
+    results = await asyncio.gather(
+        *(scheduler.search(engine, NameArgs(name=name)) for name in "abab"),
+    )
+
+    assert results == ["result a", "result b", "result a", "result b"]
+    assert engine.batches == [["a", "b"]]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_runs_before_the_window_ends() -> None:
+    scheduler = SearchScheduler(window_ms=10_000, max_batch_size=2)
+    engine = BatchingSearchEngine()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            *(scheduler.search(engine, NameArgs(name=name)) for name in "ab"),
+        ),
+        timeout=1,
+    )
+
+    assert results == ["result a", "result b"]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_single_searches() -> None:
+    scheduler = SearchScheduler(window_ms=0)
+    engine = BatchingSearchEngine()
+
+    good, bad = await asyncio.gather(
+        scheduler.search(engine, NameArgs(name="good")),
+        scheduler.search(engine, NameArgs(name="bad")),
+        return_exceptions=True,
+    )
+
+    assert good == "result good"
+    assert isinstance(bad, RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_wrong_number_of_results_fails_every_search() -> None:
+    scheduler = SearchScheduler(window_ms=0)
+    engine = ShortBatchSearchEngine()
+
+    results = await asyncio.gather(
+        scheduler.search(engine, NameArgs(name="a")),
+        scheduler.search(engine, NameArgs(name="b")),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert "returned 1 results for 2 searches" in str(results[0])
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_shared_search() -> None:
+    scheduler = SearchScheduler(window_ms=5)
+    engine = BatchingSearchEngine()
+
+    cancelled = asyncio.create_task(scheduler.search(engine, NameArgs(name="a")))
+    kept = asyncio.create_task(scheduler.search(engine, NameArgs(name="a")))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await kept == "result a"
+    assert cancelled.cancelled()
+
+
+def test_invalid_scheduler_config() -> None:
+    with pytest.raises(ValueError, match="max_batch_size"):
+        SearchScheduler(max_batch_size=0)